@@ -0,0 +1,216 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Runs the measures of test.py on many networks in parallel, and can be
+stopped and started again without repeating the work already done.
+
+Every (network, measure, seed) is a job. The jobs are run on a pool of
+processes, the biggest networks first so the last jobs to finish are short.
+The results of a job are written to
+
+    <results folder>/<network file>/<name>_<measure>_seed<seed>.results
+
+where <network file> is the path of the network relative to the data folder,
+extension included, so the same network in several formats gets different
+jobs, and <name> its file name without extension. The results are written
+through a temporary file, and then the job is added to the manifest
+(manifest.json in the results folder), also written atomically. A new run
+skips the jobs in the manifest, so an interrupted sweep only loses the jobs
+that were running.
+
+    python batchRunner.py "randomNetworks/*.gml" fractalDimension 1 2 3
+
+The measures are run inside the processes of the pool, so they must not
+start pools of their own.
+"""
+
+import glob
+import json
+import os
+import random
+import sys
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+import graphStore
+import test
+from config import apconfig
+
+
+def _network_name(filename):
+    return os.path.basename(filename).rsplit(".", 1)[0]
+
+
+def _data_folder():
+    return apconfig.getBaseFolder() + apconfig.getDataFolder()
+
+
+def network_key(network):
+    """
+    Returns the path of a network file relative to the data folder, with its
+    extension, i.e. "realNetworks/Email network/email.gml". The files of a
+    network in several formats get different keys.
+    """
+    return os.path.relpath(os.path.abspath(network), os.path.abspath(_data_folder()))
+
+
+def job_key(network, measure, seed):
+    return "{}/{}/{}".format(network_key(network), measure, seed)
+
+
+def results_file(network, measure, seed):
+    """
+    Returns the results file of a job, in a folder named after the key of the
+    network, i.e. results/realNetworks/Email network/email.gml/.
+    """
+    return os.path.join(apconfig.get_results_folder_path(), network_key(network),
+                        "{}_{}_seed{}.results".format(_network_name(network),
+                                                      measure, seed))
+
+
+def manifest_file():
+    return os.path.join(apconfig.get_results_folder_path(), "manifest.json")
+
+
+def read_manifest():
+    """
+    Returns the dictionary {job key: description} of the jobs finished, which
+    is empty if there is no manifest yet.
+    """
+    if not os.path.exists(manifest_file()):
+        return {}
+
+    with open(manifest_file()) as file:
+        return json.load(file)
+
+
+def write_manifest(manifest):
+    graphStore.write_atomically(manifest_file(), lambda file: file.write(
+        json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8")))
+
+
+def networks(patterns):
+    """
+    Returns the files matching some glob patterns, relative to the data
+    folder (i.e. "randomNetworks/*.gml") or absolute.
+    """
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(os.path.join(_data_folder(), pattern)))
+
+    return sorted(files)
+
+
+def jobs(files, measures, seeds=(0,)):
+    """
+    Returns the list of jobs (network, measure, seed), the largest files first.
+    """
+    for measure in measures:
+        if measure not in test.methods:
+            raise ValueError("Unknown measure {}, use one of {}".format(
+                measure, sorted(test.methods.keys())))
+
+    files = sorted(files, key=os.path.getsize, reverse=True)
+
+    return [(network, measure, seed)
+            for network in files for measure in measures for seed in seeds]
+
+
+def run_job(job):
+    """
+    Runs a measure on a network and writes its result. The measures that
+    write files of their own (i.e. with debug=True) do it in the folder of the
+    network, as in test.py.
+
+    Returns
+    -----------
+    A tuple (job, seconds, error), where error is None if the job finished
+    """
+    network, measure, seed = job
+    filename = results_file(network, measure, seed)
+    folder = os.path.dirname(filename)
+    os.makedirs(folder, exist_ok=True)
+    os.chdir(folder)
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+    start = time.time()
+    try:
+        load = test.graph_loaders.get(measure, graphStore.load_networkit)
+        result = test.methods[measure](load(network))
+    except Exception as error:
+        return job, time.time() - start, repr(error)
+
+    graphStore.write_atomically(filename, lambda file: file.write(
+        "{}\n".format(result).encode("utf-8")))
+
+    return job, time.time() - start, None
+
+
+def run(patterns, measures, seeds=(0,), workers=None):
+    """
+    Runs the jobs of the networks matching some glob patterns that are not in
+    the manifest yet.
+
+    Parameters
+    -----------
+    patterns: Glob patterns of the network files (see networks)
+    measures: Names of measures in the methods dictionary of test.py
+    seeds: The seeds of the random generators, one job per seed
+    workers: Number of processes. All the available cores are used by default
+
+    Returns
+    -----------
+    The list of jobs that failed, with their errors
+    """
+    manifest = read_manifest()
+    all_jobs = jobs(networks(patterns), measures, seeds)
+    pending = [job for job in all_jobs if job_key(*job) not in manifest]
+    print("{} jobs, {} already finished".format(
+        len(all_jobs), len(all_jobs) - len(pending)))
+
+    failed = []
+    pool = mp.Pool(workers)
+    try:
+        for job, seconds, error in pool.imap_unordered(run_job, pending):
+            if error is not None:
+                print("Failed:", job_key(*job), error)
+                failed.append((job, error))
+                continue
+
+            network, measure, seed = job
+            manifest[job_key(*job)] = {
+                "network": network,
+                "measure": measure,
+                "seed": seed,
+                "results": results_file(*job),
+                "seconds": seconds,
+                "finished": time.strftime("%d-%m-%Y_%H%M%S")
+            }
+            write_manifest(manifest)
+            print("Finished:", job_key(*job), "{:.1f}s".format(seconds))
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return failed
+
+
+def main(args):
+    """
+    args: A glob pattern, a measure and optionally the seeds
+    """
+    pattern, measure = args[:2]
+    seeds = [int(seed) for seed in args[2:]] or [0]
+
+    failed = run([pattern], [measure], seeds)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
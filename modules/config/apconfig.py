@@ -60,3 +60,14 @@ def get_random_results_folder_path():
     fullpath += config.get("results", "randomNetworks")
 
     return fullpath
+
+
+def get_cache_folder_path():
+    fullpath = config.get("project", "baseFolder")
+    fullpath += config.get("cache", "baseFolder")
+
+    return fullpath
+
+
+def cache_enabled():
+    return config.getboolean("cache", "enabled")
@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+
+import math
+
+import numpy as np
+
+
+class RunningBoxCounts(object):
+    """
+    Running mean and covariance of the number of boxes Nb(lb) found by a
+    randomized box covering, for the box lengths lb = 1, 2, ..., L.
+
+    Only the sums of the counts and of their outer products are kept, so two
+    accumulators (i.e. from different processes) can be merged and the memory
+    used does not depend on the number of coverings added.
+    """
+
+    def __init__(self, num_box_lengths):
+        self.count = 0
+        self.total = np.zeros(num_box_lengths)
+        self.products = np.zeros((num_box_lengths, num_box_lengths))
+
+    def add(self, boxes):
+        """
+        Add the result of one covering, or a matrix with one covering per row.
+        """
+        boxes = np.atleast_2d(np.asarray(boxes, dtype=float))
+        self.count += len(boxes)
+        self.total += boxes.sum(axis=0)
+        self.products += boxes.T.dot(boxes)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.products += other.products
+
+    def mean(self):
+        return self.total / self.count
+
+    def covariance(self):
+        """
+        Sample covariance matrix of the box counts.
+        """
+        if self.count < 2:
+            return np.zeros_like(self.products)
+
+        mean = self.mean()
+        scatter = self.products - self.count * np.outer(mean, mean)
+        return scatter / (self.count - 1)
+
+    def standard_error(self):
+        """
+        Standard error of the mean number of boxes for every box length.
+        """
+        variance = np.clip(np.diag(self.covariance()), 0, None)
+        return np.sqrt(variance / max(self.count, 1))
+
+    def dimension_standard_error(self):
+        """
+        Standard error of the fractal dimension fitted to the mean counts.
+        The slope of the least squares line is a weighted sum of log(Nb), so
+        its variance follows from the covariance of the counts (delta method).
+        """
+        num_box_lengths = len(self.total)
+        if self.count < 2 or num_box_lengths < 2:
+            return 0.0
+
+        log_box_length = np.log(np.arange(1, num_box_lengths+1))
+        centered = log_box_length - log_box_length.mean()
+        weights = centered / centered.dot(centered)
+
+        gradient = weights / self.mean()
+        variance = gradient.dot(self.covariance()).dot(gradient) / self.count
+
+        return math.sqrt(max(variance, 0.0))
+
+    def converged(self, tolerance, box_tolerance=None, z=1.96):
+        """
+        Returns True when the half-width of the confidence interval of the
+        dimension is smaller than tolerance and, if box_tolerance is given,
+        the half-width of the interval of every Nb(lb) is smaller than
+        box_tolerance times its mean.
+
+        Parameters
+        ------------
+        tolerance:     Maximum half-width for the fractal dimension
+        box_tolerance: Maximum relative half-width for every Nb(lb)
+        z:             Normal quantile of the interval, 1.96 for 95%
+        """
+        if self.count < 2:
+            return False
+
+        if z * self.dimension_standard_error() > tolerance:
+            return False
+
+        if box_tolerance is not None:
+            half_width = z * self.standard_error()
+            if np.any(half_width > box_tolerance * self.mean()):
+                return False
+
+        return True
@@ -13,69 +13,143 @@
 
 
 import numpy as np
-import networkx as nx
 import random
-from copy import deepcopy
-import os, sys
-import time
-import fractalModel as fm
 
+from .boundedBFS import BoundedBFS, distance_matrix, index_graph
+from .boxes import box_subgraphs
 
-def CBB(G,lb): #This is the compact box burning algorithm.
+
+def CBB(G,lb,subgraphs=True): #This is the compact box burning algorithm.
 	"""
 	It returns a dictionary with {box_id:subgraph_generated_by_the_nodes_in_this_box}
 	The box_id is the center of the box.
 	The subgraphs may be disconnected.
-	"""	
-	uncovered_nodes=G.nodes()
-	uncovered_nodes = set(uncovered_nodes)
-	covered_nodes = set([])
-	boxes_subgraphs = {}
-	adj = G.adj
+	subgraphs: If False, a numpy array with the box id (0, 1, ...) of every
+	node, in the order of G.nodes(), is returned instead of the dictionary.
+	The uncovered nodes are kept in a list where a node is removed swapping
+	it with the last one, and the candidates of a box in a list whose first
+	entries are the ones already checked, so every random pick takes O(1).
+	"""
+	nodes, neighbors = index_graph(G)
+	n = len(nodes)
+	bfs = BoundedBFS(neighbors)
+	distance = bfs.distance
+	labels = np.empty(n, dtype=int)
+	centers = []
+	covered = bytearray(n)
+	uncovered_nodes = list(range(n))
+	position = list(range(n)) # position of each node in uncovered_nodes
 	while uncovered_nodes:
-		center = random.choice(list(uncovered_nodes))
-		nodes_visited = {center:0}
-		search_queue = [center]
-		d = 1
-		while len(search_queue) > 0 and d <= lb-1:
-			next_depth = []
-			extend = next_depth.extend
-			for n in search_queue:
-				l = [ i for i in iter(adj[n].keys()) if i not in nodes_visited ]
-				extend(l)
-				for j in l: 
-					nodes_visited[j] = d
-			search_queue = next_depth
-			d += 1
-		new_covered_nodes = set(nodes_visited.keys())
-		new_covered_nodes = new_covered_nodes.difference(covered_nodes)
-		nodes_checked_as_centers = set([center])
-		while len(nodes_checked_as_centers) < len(new_covered_nodes):
-			secondary_center = random.choice(list(new_covered_nodes.difference(nodes_checked_as_centers)))
-			nodes_checked_as_centers.add(secondary_center)
-			nodes_visited = {secondary_center:0}
-			search_queue = [secondary_center]
-			d = 1
-			while len(search_queue) > 0 and d <= lb-1:
-				next_depth = []
-				extend = next_depth.extend
-				for n in search_queue:
-					l = [ i for i in iter(adj[n].keys()) if i not in nodes_visited ] # faster than has_key? yep
-					extend(l)
-					for j in l:
-						nodes_visited[j] = d
-				search_queue = next_depth
-				d += 1
-			nodes_covered_by_secondary = set(nodes_visited.keys())
-			new_covered_nodes = new_covered_nodes.intersection(nodes_covered_by_secondary)
-		boxes_subgraphs[center] = nx.subgraph(G,list(new_covered_nodes))
-		uncovered_nodes = uncovered_nodes.difference(new_covered_nodes)
-		covered_nodes = covered_nodes.union(new_covered_nodes)
-	return boxes_subgraphs
+		center = random.choice(uncovered_nodes)
+		size = bfs.run(center, lb-1)
+		candidates = [center] + [i for i in bfs.queue[1:size] if not covered[i]]
+		checked = 1
+		while checked < len(candidates):
+			i = random.randrange(checked, len(candidates))
+			secondary_center = candidates[i]
+			candidates[i] = candidates[checked]
+			candidates[checked] = secondary_center
+			checked += 1
+			bfs.run(secondary_center, lb-1)
+			# The nodes already checked are close to secondary_center too
+			candidates[checked:] = [i for i in candidates[checked:] if distance[i] >= 0]
+		for node in candidates:
+			covered[node] = 1
+			labels[node] = len(centers)
+			last = uncovered_nodes.pop()
+			if last != node:
+				uncovered_nodes[position[node]] = last
+				position[last] = position[node]
+		centers.append(center)
+	if not subgraphs:
+		return labels
+	return box_subgraphs(G, nodes, centers, labels)
+
+
+def _random_true(mask, random_state):
+	"""
+	Returns, for every row of a boolean matrix, the column of one of its True
+	entries chosen at random. Every row must have at least one.
+	"""
+	counts = mask.sum(axis=1)
+	k = (random_state.random_sample(len(mask)) * counts).astype(int)
+	return np.argmax(mask.cumsum(axis=1) > k[:, np.newaxis], axis=1)
+
+
+def cbb_trials(distances,box_lengths,trials=100,random_state=None):
+	"""
+	Runs CBB trials times for every box length at the same time, one row of
+	boolean matrices per (trial, box length). Each step opens a box, checks
+	one candidate or closes a box in every row, and the candidates are
+	filtered with the rows of the distance matrix. The memory used grows
+	with trials * len(box_lengths) * number of nodes.
+	It returns a matrix with the number of boxes of each trial (rows) and box
+	length (columns).
+	distances: Matrix of hop distances, with a value larger than any box
+	length for the nodes not connected (see boundedBFS.distance_matrix)
+	random_state: A numpy RandomState. The global numpy generator is used
+	when it is None
+	"""
+	if random_state is None:
+		random_state = np.random
+	n = len(distances)
+	box_lengths = np.asarray(box_lengths)
+	limit = np.tile(box_lengths, trials)[:, np.newaxis]
+	rows_count = len(limit)
+	covered = np.zeros((rows_count, n), dtype=bool)
+	candidates = np.zeros((rows_count, n), dtype=bool)
+	unchecked = np.zeros((rows_count, n), dtype=bool)
+	open_box = np.zeros(rows_count, dtype=bool)
+	remaining = np.zeros(rows_count, dtype=int) + n
+	boxes = np.zeros(rows_count, dtype=int)
+	active = np.flatnonzero(remaining > 0)
+	while active.size:
+		# Close the boxes without candidates left to check
+		rows = active[open_box[active] & ~unchecked[active].any(axis=1)]
+		if rows.size:
+			covered[rows] |= candidates[rows]
+			remaining[rows] -= candidates[rows].sum(axis=1)
+			candidates[rows] = False
+			open_box[rows] = False
+			active = active[remaining[active] > 0]
+		# Open a box around a random uncovered node
+		rows = active[~open_box[active]]
+		if rows.size:
+			center = _random_true(~covered[rows], random_state)
+			candidates[rows] = (distances[center] < limit[rows]) & ~covered[rows]
+			unchecked[rows] = candidates[rows]
+			unchecked[rows, center] = False
+			open_box[rows] = True
+			boxes[rows] += 1
+		# Check a random candidate of every open box
+		rows = active[unchecked[active].any(axis=1)]
+		if rows.size:
+			secondary_center = _random_true(unchecked[rows], random_state)
+			unchecked[rows, secondary_center] = False
+			close = distances[secondary_center] < limit[rows]
+			candidates[rows] &= close
+			unchecked[rows] &= close
+	return boxes.reshape(trials, len(box_lengths))
+
+
+def cbb_number_of_boxes(G,box_lengths=None,trials=100,random_state=None):
+	"""
+	Returns the box lengths and the average number of boxes found by CBB for
+	each one over a number of trials (see cbb_trials). By default all the
+	box lengths from 1 to the diameter + 1 are used.
+	"""
+	nodes, neighbors = index_graph(G)
+	distances = distance_matrix(neighbors)
+	if box_lengths is None:
+		finite = distances[distances < np.iinfo(distances.dtype).max]
+		diameter = int(finite.max()) if finite.size else 0
+		box_lengths = np.arange(1, diameter+2)
+	boxes = cbb_trials(distances, box_lengths, trials, random_state)
+	return np.asarray(box_lengths), boxes.mean(axis=0)
+
 
-""""
 if __name__ == '__main__':
+	from . import fractalModel as fm
 	g=fm.fractal_model(3,2,2,0)
 	boxes_subgraphs = CBB(g,2)
 	print(boxes_subgraphs)
-""""
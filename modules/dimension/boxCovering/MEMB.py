@@ -12,175 +12,273 @@
 #network renormalization.
 
 
-import numpy as np
-import networkx as nx
 import random
-from copy import deepcopy
-import os, sys
-import time
-import fractal_model as fm
 
-def MEMB(G,rb,cycle=0):
+import numpy as np
+
+from .boundedBFS import BoundedBFS, index_graph
+from .boxes import box_labels, box_subgraphs
+from .multiSourceBFS import MultiSourceBFS, csr_arrays
+
+
+class _ExcludedMassQueue(object):
 	"""
-	It returns a dictionary with {box_id:subgraph_generated_by_the_nodes_in_this_box}
-	The box_id is the center of the box.
-	cycle: Ignore this parameter. Use the default cycle=0.
+	Bucket priority queue of the nodes that may become centers, indexed by
+	their excluded mass. The masses only decrease, so the pointer to the
+	largest non empty bucket only moves down. A node is pushed again every
+	time its mass changes, and the entries left behind in the buckets of its
+	older masses are skipped when they are drawn.
+	"""
+
+	def __init__(self, masses):
+		self.masses = masses
+		self.buckets = [[] for i in range(max(masses) + 1)]
+		for node, mass in enumerate(masses):
+			self.buckets[mass].append(node)
+		self.top = len(self.buckets) - 1
+
+	def pop_random_maximum(self, is_center, random_state):
+		"""
+		Removes and returns a random node (drawn with random_state) among
+		those with the largest mass that are not centers yet. The entries of the top bucket left
+		by older masses are dropped first, and a node is at most once in the
+		bucket of its current mass, so every one of them has the same chance.
+		"""
+		masses = self.masses
+		while 1:
+			while not self.buckets[self.top]:
+				self.top -= 1
+			top = self.top
+			bucket = [node for node in self.buckets[top]
+				if masses[node] == top and not is_center[node]]
+			self.buckets[top] = bucket
+			if bucket:
+				i = random_state.randrange(len(bucket))
+				node = bucket[i]
+				bucket[i] = bucket[-1]
+				bucket.pop()
+				return node
+
+	def decrease(self, nodes, amounts):
+		"""
+		Subtracts the amounts from the masses of the nodes.
+		"""
+		masses = self.masses
+		buckets = self.buckets
+		for node, amount in zip(nodes, amounts):
+			mass = masses[node] - amount
+			masses[node] = mass
+			buckets[mass].append(node)
+
+
+def _excluded_masses(multi_source, radii):
+	"""
+	Returns {radius: [number of nodes at distance at most radius of each
+	node]} for all the radii given, with a single search per node up to the
+	largest one. The searches are run from 64 nodes at once (see
+	multiSourceBFS.py).
+	"""
+	if max(radii) == 1:
+		# The ball of radius 1 of a node is the node and its neighbors
+		return {1: (np.diff(multi_source.offsets) + 1).tolist()}
+
+	n = multi_source.num_nodes
+	masses = dict((radius, np.zeros(n, dtype=int)) for radius in radii)
+	largest = max(radii)
+	for start, rows in multi_source.blocks(np.arange(n), largest):
+		for radius in radii:
+			masses[radius][start:start+len(rows)] = (rows <= radius).sum(axis=1)
+	return dict((radius, mass.tolist()) for radius, mass in masses.items())
+
+
+def _cover(bfs, multi_source, queues, covered, ball_size):
+	"""
+	Subtracts from the excluded masses of every radius the nodes just
+	covered within that distance. Only the nodes within that distance of a
+	node covered lose mass, so the searches start from the nodes covered:
+	64 at once when together they reach about as many nodes as the graph
+	has (ball_size is the size of the ball of the last center), and one by
+	one otherwise. With radius 1 the neighbors of the nodes covered are read
+	from the adjacency arrays instead.
+	"""
+	n = multi_source.num_nodes
+	largest = max(queues)
+	if largest == 1:
+		# The nodes covered and their neighbors, once for every node covered
+		# they are next to
+		offsets, targets = multi_source.offsets, multi_source.targets
+		reached = [targets[offsets[node]:offsets[node+1]] for node in covered]
+		reached = np.concatenate(reached + [covered])
+		changed, amounts = np.unique(reached, return_counts=True)
+		queues[1].decrease(changed.tolist(), amounts.tolist())
+		return
+
+	decrease = dict((radius, np.zeros(n, dtype=int)) for radius in queues)
+	if len(covered) * ball_size >= n:
+		for start, rows in multi_source.blocks(covered, largest):
+			for radius in queues:
+				decrease[radius] += (rows <= radius).sum(axis=0)
+	else:
+		for node in covered:
+			size = bfs.run(node, largest)
+			reached = np.array(bfs.queue[:size])
+			distances = np.array([bfs.distance[w] for w in reached])
+			for radius in queues:
+				decrease[radius][reached[distances <= radius]] += 1
+
+	for radius, queue in queues.items():
+		changed = np.flatnonzero(decrease[radius])
+		queue.decrease(changed.tolist(), decrease[radius][changed].tolist())
+
+
+def _box_of_node(multi_source, centers, central_distance, random_state):
+	"""
+	Returns the center of the box of every node: every node joins the box of
+	a random neighbor closer to a center. The neighbors are drawn for all the
+	nodes at once, as the neighbor with the largest random key among those
+	one step closer. The keys come from a numpy generator seeded from
+	random_state, so seeding random_state alone reproduces a covering.
 	"""
-	adj = G.adj
-	number_of_nodes = G.number_of_nodes()
-	covered_nodes = set()
-	center_nodes = set()
-	non_center_nodes = G.nodes()
-	center_node_found = 0
-	boxes={} #this will be "box_id:[nodes in box]"
-	central_distance_of_node = {} #"node:central_distance"
-	node_box_id = {} #"node:box_id"
-	nodes_sorted_by_central_distance={} #Dict with {central_distance:[nodes]}
-	excluded_mass_of_non_centers_rb = {} #This contains [(node:excluded_mass)] for rb
-	excluded_mass_of_non_centers_rb2 = {} #This contains [(node:excluded_mass)] for rb+1
-	rb2 = rb + 1
-	for node in non_center_nodes:
-		#if node in [5000,10000,20000,30000]: print "node", node
-		level=0                  # the current level
-		nextlevel={node:1}       # list of nodes to check at next level
-		paths_rb=None
-		paths_rb2={node:[node]} # paths dictionary  (paths to key from source)
-		while nextlevel:
-			paths_rb = deepcopy(paths_rb2)
-			thislevel=nextlevel
-			nextlevel={}
-			for v in thislevel:
-				for w in G.neighbors(v):
-					if not w in paths_rb2:
-						paths_rb2[w]=paths_rb2[v]+[w]
-						nextlevel[w]=1
-			level=level+1
-			if (rb2 <= level):  break
-		excluded_mass_of_node = len(paths_rb2)
-		try:
-			excluded_mass_of_non_centers_rb2[excluded_mass_of_node].append(node)
-		except KeyError:
-			excluded_mass_of_non_centers_rb2[excluded_mass_of_node] = [node]
-		excluded_mass_of_node = len(paths_rb)
-		try:
-			excluded_mass_of_non_centers_rb[excluded_mass_of_node].append(node)
-		except KeyError:
-			excluded_mass_of_non_centers_rb[excluded_mass_of_node] = [node]
-	maximum_excluded_mass = 0
-	nodes_with_maximum_excluded_mass=[]
-	new_covered_nodes = {}
-	center_node_and_mass = []
+	n = multi_source.num_nodes
+	offsets, targets = multi_source.offsets, multi_source.targets
+	distance = np.asarray(central_distance)
+	sources = np.repeat(np.arange(n), np.diff(offsets))
+
+	keys = np.random.RandomState(random_state.getrandbits(32)).random_sample(
+		len(targets))
+	keys[distance[targets] != distance[sources] - 1] = -1.0
+	order = np.lexsort((keys, sources))
+	parent = np.empty(n, dtype=int)
+	connected = multi_source.connected
+	parent[connected] = targets[order[offsets[connected + 1] - 1]]
+
+	box_of_node = np.empty(n, dtype=int)
+	box_of_node[centers] = centers
+	nodes = np.argsort(distance, kind="mergesort")
+	bounds = np.searchsorted(distance[nodes], np.arange(distance.max() + 2))
+	for d in range(1, len(bounds) - 1):
+		level = nodes[bounds[d]:bounds[d+1]]
+		box_of_node[level] = box_of_node[parent[level]]
+
+	return box_of_node
+
+
+def _memb(bfs,multi_source,rb,cycle,masses,random_state):
+	"""
+	Runs MEMB over the positions of the nodes given by index_graph and
+	returns a tuple (centers, box_of_node), where box_of_node[i] is the
+	center of the box of node i. masses holds the excluded masses of every
+	node for rb, and for rb+1 if cycle > 0 (see _excluded_masses). They are
+	kept up to date as the nodes are covered (see _cover), so the center
+	chosen at every step is a random node among those with the largest
+	excluded mass, as in the original algorithm. All the random choices are
+	drawn from random_state.
+	"""
+	n = multi_source.num_nodes
+	if n == 0:
+		return [], []
+	queues = {rb: _ExcludedMassQueue(list(masses[rb]))}
+	if cycle > 0:
+		queues[rb+1] = _ExcludedMassQueue(list(masses[rb+1]))
+
+	covered = bytearray(n)
+	is_center = bytearray(n)
+	central_distance = [-1] * n
+	number_of_covered_nodes = 0
+	centers = []
 	cycle_index = 0
-	while len(covered_nodes) < number_of_nodes:
-		#print len(covered_nodes),number_of_nodes
+	while number_of_covered_nodes < n:
 		cycle_index += 1
 		if cycle_index == cycle:
-			rb2 = rb+1
+			radius = rb+1
 			cycle_index = 0
 		else:
-			rb2 = rb
-		while 1:
-			if rb2 == rb+1:
-				#t1=time.time()
-				while 1:
-					maximum_key = max(excluded_mass_of_non_centers_rb2.keys())
-					node = random.choice(excluded_mass_of_non_centers_rb2[maximum_key])
-					if node in center_nodes:
-						excluded_mass_of_non_centers_rb2[maximum_key].remove(node)
-						if not excluded_mass_of_non_centers_rb2[maximum_key]: del excluded_mass_of_non_centers_rb2[maximum_key]
-					else:
-						break	
-				nodes_visited = {}
-				bfs = single_source_shortest_path(G,node,cutoff=rb2)
-				for i in bfs:
-					nodes_visited[i] = len(bfs[i])-1
-				excluded_mass_of_node = len(set(nodes_visited.keys()).difference(covered_nodes))
-				if excluded_mass_of_node == maximum_key:
-					center_node_and_mass = (node,maximum_key)
-					excluded_mass_of_non_centers_rb2[maximum_key].remove(node)
-					if not excluded_mass_of_non_centers_rb2[maximum_key]: del excluded_mass_of_non_centers_rb2[maximum_key]
-					new_covered_nodes = nodes_visited
-					break
-				else:
-					excluded_mass_of_non_centers_rb2[maximum_key].remove(node)
-					if not excluded_mass_of_non_centers_rb2[maximum_key]: del excluded_mass_of_non_centers_rb2[maximum_key]
-					try:
-						excluded_mass_of_non_centers_rb2[excluded_mass_of_node].append(node)
-					except KeyError:
-						excluded_mass_of_non_centers_rb2[excluded_mass_of_node] = [node]
-				#print "time", time.time()-t1
-			else:
-				#t1=time.time()
-				while 1:
-					maximum_key = max(excluded_mass_of_non_centers_rb.keys())
-					node = random.choice(excluded_mass_of_non_centers_rb[maximum_key])
-					if node in center_nodes:
-						excluded_mass_of_non_centers_rb[maximum_key].remove(node)
-						if not excluded_mass_of_non_centers_rb[maximum_key]: del excluded_mass_of_non_centers_rb[maximum_key]
-					else:
-						break	
-				nodes_visited = {}
-				bfs = single_source_shortest_path(G,node,cutoff=rb)
-				for i in bfs:
-					nodes_visited[i] = len(bfs[i])-1
-				excluded_mass_of_node = len(set(nodes_visited.keys()).difference(covered_nodes))
-				if excluded_mass_of_node == maximum_key:
-					center_node_and_mass = (node,maximum_key)
-					excluded_mass_of_non_centers_rb[maximum_key].remove(node)
-					if not excluded_mass_of_non_centers_rb[maximum_key]: del excluded_mass_of_non_centers_rb[maximum_key]
-					new_covered_nodes = nodes_visited
-					break
-				else:
-					excluded_mass_of_non_centers_rb[maximum_key].remove(node)
-					if not excluded_mass_of_non_centers_rb[maximum_key]: del excluded_mass_of_non_centers_rb[maximum_key]
-					try:
-						excluded_mass_of_non_centers_rb[excluded_mass_of_node].append(node)
-					except KeyError:
-						excluded_mass_of_non_centers_rb[excluded_mass_of_node] = [node]
-				#print "time", time.time()-t1
-					
-		center_node_found = center_node_and_mass[0]
-		boxes[center_node_found] = [center_node_found]
-		node_box_id[center_node_found] = center_node_found
-		non_center_nodes.remove(center_node_found)
-		center_nodes.add(center_node_found)
-		
-		covered_nodes = covered_nodes.union(set(new_covered_nodes.keys()))
-		#print len(covered_nodes)
-		for i in new_covered_nodes:
-			
-			try:
-				if central_distance_of_node[i] > new_covered_nodes[i]:
-					nodes_sorted_by_central_distance[central_distance_of_node[i]].remove(i)
-					if not nodes_sorted_by_central_distance[central_distance_of_node[i]]:
-						del nodes_sorted_by_central_distance[central_distance_of_node[i]]
-					try:
-						nodes_sorted_by_central_distance[new_covered_nodes[i]].append(i)
-					except KeyError:
-						nodes_sorted_by_central_distance[new_covered_nodes[i]] = [i]
-					central_distance_of_node[i] = new_covered_nodes[i]
-			except KeyError:
-				central_distance_of_node[i] = new_covered_nodes[i]
-				try:
-					nodes_sorted_by_central_distance[new_covered_nodes[i]].append(i)
-				except:
-					nodes_sorted_by_central_distance[new_covered_nodes[i]] = [i]
-
-	max_distance = max(nodes_sorted_by_central_distance.keys())
-	for i in range(1,max_distance+1):
-		for j in nodes_sorted_by_central_distance[i]:
-			targets = list(set(iter(adj[j].keys())).intersection(set(nodes_sorted_by_central_distance[i-1])))
-			node_box_id[j] = node_box_id[random.choice(targets)]
-			boxes[node_box_id[j]].append(j)
-	boxes_subgraphs={}
-	for i in boxes:
-		boxes_subgraphs[i] = subgraph(G,boxes[i])
-	
-	return boxes_subgraphs
-
-""""
+			radius = rb
+		center = queues[radius].pop_random_maximum(is_center, random_state)
+		is_center[center] = 1
+		centers.append(center)
+		newly_covered = []
+		size = bfs.run(center, radius)
+		for i in range(size):
+			node = bfs.queue[i]
+			d = bfs.distance[node]
+			if not covered[node]:
+				covered[node] = 1
+				newly_covered.append(node)
+				central_distance[node] = d
+			elif d < central_distance[node]:
+				central_distance[node] = d
+		number_of_covered_nodes += len(newly_covered)
+		if number_of_covered_nodes < n:
+			_cover(bfs, multi_source, queues, newly_covered, size)
+
+	return centers, _box_of_node(multi_source, centers, central_distance,
+		random_state)
+
+
+def MEMB(G,rb,cycle=0,subgraphs=True,random_state=None):
+	"""
+	It returns a dictionary with {box_id:subgraph_generated_by_the_nodes_in_this_box}
+	The box_id is the center of the box.
+	cycle: Ignore this parameter. Use the default cycle=0.
+	subgraphs: If False, a numpy array with the box id (0, 1, ...) of every
+	node, in the order of G.nodes(), is returned instead of the dictionary.
+	random_state: A random.Random instance. The random module is used when it
+	is None.
+	"""
+	if random_state is None:
+		random_state = random
+	nodes, neighbors = index_graph(G)
+	bfs = BoundedBFS(neighbors)
+	multi_source = MultiSourceBFS(*csr_arrays(neighbors))
+	radii = [rb, rb+1] if cycle > 0 else [rb]
+	masses = _excluded_masses(multi_source, radii) if nodes else {}
+	centers, box_of_node = _memb(bfs, multi_source, rb, cycle, masses,
+		random_state)
+	labels = box_labels(centers, box_of_node)
+
+	if not subgraphs:
+		return labels
+	return box_subgraphs(G, nodes, centers, labels)
+
+
+def memb_sweep(G,radii,cycle=0,subgraphs=False,random_state=None):
+	"""
+	Runs MEMB for several radii. The excluded masses of all the radii are
+	taken from a single search per node up to the largest radius, instead of
+	building the tables again for each one.
+	It returns a list with the number of boxes Nb(rb) found for every radius
+	in radii, or if subgraphs is True, a list with the dictionaries
+	{box_id:subgraph_generated_by_the_nodes_in_this_box} returned by MEMB.
+	random_state: A random.Random instance. The random module is used when it
+	is None.
+	"""
+	if random_state is None:
+		random_state = random
+	nodes, neighbors = index_graph(G)
+	bfs = BoundedBFS(neighbors)
+	multi_source = MultiSourceBFS(*csr_arrays(neighbors))
+	radii = list(radii)
+	tables = set(radii)
+	if cycle > 0:
+		tables.update(rb+1 for rb in radii)
+	masses = _excluded_masses(multi_source, tables) if nodes and radii else {}
+
+	results = []
+	for rb in radii:
+		centers, box_of_node = _memb(bfs, multi_source, rb, cycle, masses,
+			random_state)
+		if subgraphs:
+			labels = box_labels(centers, box_of_node)
+			results.append(box_subgraphs(G, nodes, centers, labels))
+		else:
+			results.append(len(centers))
+
+	return results
+
+
 if __name__ == '__main__':
-	g= fm.fractal_model(3,2,2,0)
+	from . import fractalModel as fm
+	g = fm.fractal_model(3,2,2,0)
 	boxes_subgraphs = MEMB(g,2)
-	print boxes_subgraphs
-"""
+	print(boxes_subgraphs)
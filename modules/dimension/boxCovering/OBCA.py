@@ -2,81 +2,202 @@
 # Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
 # Tested in python-3.4.3
 
-import networkx as nx
-import operator
 import sys
 
-
-def obca(g):
-    diameter = nx.diameter(g)
-    lb_max = diameter + 1
+import networkx as nx
+import numpy as np
+
+from . import distanceMatrix
+from .boundedBFS import BoundedBFS, distance_matrix, index_graph
+
+
+def compact_box(bfs, distances, center, lb):
+    """
+    Returns the positions of the nodes in the box of center: the nodes at
+    distance less than lb of it, in BFS order, removing every node at
+    distance lb or more of a node kept before it.
+
+    Two nodes can only be lb apart if their distances to the center add up to
+    lb or more, so each layer of the BFS is only compared with the farthest
+    layers and most of the distances between the nodes of the box are not
+    read from the matrix.
+
+    Parameters
+    -----------
+    bfs: A BoundedBFS of the graph
+    distances: The matrix of distances between the nodes
+    center: Position of the center of the box
+    lb: The box length
+    """
+    size = bfs.run(center, lb-1)
+    box = np.array(bfs.queue[:size])
+    # layers[r] is the position of the first node at distance r or more
+    layers = np.searchsorted(distances[center, box], np.arange(lb + 1))
+
+    keep = np.ones(size, dtype=bool)
+    for d in range(1, lb):
+        begin, end, first = layers[d], layers[d+1], layers[lb-d]
+        if begin == end or first == size:
+            continue
+
+        rows = distances.take(box[begin:end], axis=0)
+        far = rows.take(box[first:], axis=1) >= lb
+        for i in np.flatnonzero(far.any(axis=1)):
+            index = begin + i
+            if keep[index]:
+                start = max(index + 1, first)
+                keep[start:] &= ~far[i, start-first:]
+
+    return box[keep]
+
+
+def remove_redundant_boxes(boxes, covered_frequency):
+    """
+    Remove, in order, the boxes whose nodes are all covered by other boxes.
+    A box can only become redundant if all its nodes were covered at least
+    twice before removing any box, so those are found first in a single
+    vectorized pass and only they are checked one by one.
+
+    Parameters
+    -----------
+    boxes: A list of arrays with the positions of the nodes of every box
+    covered_frequency: Array with the number of boxes covering every node.
+                       It is updated
+
+    Returns
+    -----------
+    The list of boxes kept
+    """
+    if not boxes:
+        return boxes
+
+    sizes = np.array([len(box) for box in boxes])
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    minimum = np.minimum.reduceat(covered_frequency[np.concatenate(boxes)],
+                                  starts)
+
+    redundant = set()
+    for b in np.flatnonzero(minimum >= 2):
+        if covered_frequency[boxes[b]].min() >= 2:
+            covered_frequency[boxes[b]] -= 1
+            redundant.add(b)
+
+    return [box for b, box in enumerate(boxes) if b not in redundant]
+
+
+def covering(bfs, distances, order, lb):
+    """
+    Returns the boxes (arrays of node positions) found for a box length.
+
+    Parameters
+    -----------
+    bfs: A BoundedBFS of the graph
+    distances: The matrix of distances between the nodes
+    order: The positions of the nodes, in the order they are taken as centers
+    lb: The box length
+    """
+    covered_frequency = np.zeros(len(order), dtype=int)
+    boxes = list()
+
+    for center in order:
+        if covered_frequency[center] > 0:
+            continue
+
+        box = compact_box(bfs, distances, center, lb)
+        covered_frequency[box] += 1
+        boxes.append(box)
+
+    return remove_redundant_boxes(boxes, covered_frequency)
+
+
+def _prepare(g, distances, diameter):
+    """
+    Returns the nodes of g, a BoundedBFS, the distance matrix, the diameter
+    and the order of the centers (from the smallest to the largest degree).
+
+    When the diameter is not given it is computed and the matrix is narrowed
+    (see distanceMatrix.narrow_distances), which copies it. A caller that
+    covers the same graph for several box lengths does it once and passes
+    both.
+    """
+    nodes, neighbors = index_graph(g)
+    bfs = BoundedBFS(neighbors)
+
+    if distances is None:
+        distances = distance_matrix(neighbors)
+    if diameter is None:
+        diameter = distanceMatrix.diameter(distances)
+        distances = distanceMatrix.narrow_distances(distances, diameter)
 
     # Rank the nodes according to their degree
-    results = nx.degree_centrality(g)
-    nodes = next(zip(*sorted(results.items(), key=operator.itemgetter(1))))
+    order = sorted(range(len(nodes)), key=lambda i: len(neighbors[i]))
+
+    return nodes, bfs, distances, diameter, order
+
+
+def obca(g, distances=None, diameter=None):
+    """
+    Returns a dictionary {lb: list of boxes}, where every box is a list of
+    nodes, for every box length lb from 1 to the diameter + 1.
+
+    The nodes are taken as centers from the smallest to the largest degree,
+    skipping the ones already covered. The distances between the nodes of a
+    box are taken from the matrix of distances, computed once for all the
+    box lengths, and the number of boxes covering every node is kept in a
+    numpy array indexed by the position of the node.
+
+    Parameters
+    -----------
+    g: A connected networkx graph or a CSRGraph
+    distances: The matrix of distances between the nodes of g, in the order
+               of g.nodes(). It is computed if it is not given. The pairs of
+               nodes not connected hold the largest value of its dtype
+    diameter: The largest finite distance of the matrix. The matrix is used
+              as it is when it is given
+    """
+    nodes, bfs, distances, diameter, order = _prepare(g, distances, diameter)
+    lb_max = diameter + 1
     results = dict()
 
-    results[1] = [[node] for node in g.nodes()]
+    results[1] = [[node] for node in nodes]
     for lb in range(2, lb_max):
-        covered_frequency = [0] * len(g.nodes())
-        boxes = list()
-
-        for i in range(0, len(nodes)):
-            node = nodes[i]
-
-            if covered_frequency[i] > 0:
-                continue
-
-            box = list(nx.single_source_shortest_path_length(g, node, lb-1).keys())
-
-            # Verify that all paths within the box have the length less then lb
-            index = 0
-            while True:
-                node = box[index]
-                j = index+1
-
-                while j < len(box):
-                    neighbor = box[j]
+        boxes = covering(bfs, distances, order, lb)
+        results[lb] = [[nodes[i] for i in box] for box in boxes]
 
-                    if nx.shortest_path_length(g, node, neighbor) >= lb:
-                        box.remove(neighbor)
-
-                    j += 1
-
-                index += 1
-                if index >= len(box):
-                    break
-
-            for node in box:
-                node_index = nodes.index(node)
-                covered_frequency[node_index] += 1
+    temp = list()
+    temp.append(nodes)
+    results[lb_max] = temp
 
-            boxes.append(box)
+    return results
 
-        for box in boxes:
-            redundant_box = True
 
-            for node in box:
-                node_index = nodes.index(node)
-                if covered_frequency[node_index] == 1:
-                    redundant_box = False
-                    break
+def obca_labels(g, lb, distances=None, diameter=None):
+    """
+    Returns a numpy array with the box id (0, 1, ...) of every node, in the
+    order of g.nodes(), for a single box length. The boxes of OBCA may
+    overlap: a node covered by several boxes gets the id of the first one.
+    Every box keeps at least one node, since the redundant ones are removed.
 
-            if redundant_box:
-                for node in box:
-                    node_index = nodes.index(node)
-                    covered_frequency[node_index] -= 1
-                boxes.remove(box)
+    Parameters
+    -----------
+    g: A networkx graph or a CSRGraph
+    lb: The box length
+    distances: The matrix of distances between the nodes of g (see obca)
+    diameter: The largest finite distance of the matrix (see obca)
+    """
+    nodes, bfs, distances, diameter, order = _prepare(g, distances, diameter)
+    labels = np.zeros(len(nodes), dtype=int)
 
-        # print("lb: {}, boxes: {}, cf: {}".format(lb, boxes, covered_frequency))
-        results[lb] = boxes
+    if lb == 1:
+        return np.arange(len(nodes))
+    if lb > diameter:
+        return labels
 
-    temp = list()
-    temp.append(g.nodes())
-    results[lb_max] = temp
+    boxes = covering(bfs, distances, order, lb)
+    for box_id in range(len(boxes) - 1, -1, -1):
+        labels[boxes[box_id]] = box_id
 
-    # print(results)
-    return results
+    return labels
 
 
 def number_of_boxes_dict(g):
@@ -112,7 +233,9 @@ def test():
 
 
 if __name__ == "__main__":
+    import graphStore
+
     infile = sys.argv[1]
-    network = nx.read_gml(infile)
+    network = graphStore.load_networkx(infile)
 
     print(number_of_boxes(network))
@@ -0,0 +1,260 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Benchmark of the box covering algorithms over networks of the data folder.
+
+Every (network, method) is measured in a new process, so its peak resident
+memory is its own: the wall time of covering the network for every box
+length (including the distance matrix when the method needs one), the peak
+RSS, the number of breadth first searches run (see BoundedBFS and
+MultiSourceBFS), the number of boxes found for every box length and the
+fractal dimension fitted to them. The random generators are seeded, so the
+number of boxes of a run can be compared with the one of another.
+
+The results are written to a JSON file, and they can be compared with the
+ones of an earlier run (the baseline). Any change in the number of boxes or
+of searches, or a time or a memory above the baseline by more than the
+tolerance, is a regression (from the modules folder):
+
+    python -m dimension.boxCovering.benchmark results.json "realNetworks/*/*.gml" "models/koch/*.gml"
+    python -m dimension.boxCovering.benchmark new.json "realNetworks/*/*.gml" --baseline results.json
+
+Besides the methods of covering.py, the original greedy coloring of
+greedyColoring.py is measured, as the reference the other ones improve on.
+The Cython greedy coloring is compiled with pyximport when it is available,
+and recorded as skipped when it cannot be built. cythonGreedyColoring.pyx
+does not compile as it is (chooseColor2 is written in C++ and greedy_coloring
+returns a buffer type), so until it is fixed it is always skipped.
+"""
+
+import glob
+import json
+import os
+import random
+import resource
+import sys
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+import graphStore
+from config import apconfig
+from dimension.fractalDimension import fit_dimension
+from dimension.boxCovering import covering, greedyColoring
+from dimension.boxCovering.boundedBFS import BoundedBFS
+from dimension.boxCovering.multiSourceBFS import MultiSourceBFS
+
+# Relative increase of the time or the memory over the baseline allowed
+TOLERANCE = 0.25
+
+# Absolute increase allowed on top of the tolerance, so the noise of the
+# measures of the small networks is not taken as a regression
+SLACK = {"seconds": 0.1, "peak_rss_kb": 10 * 1024}
+
+# Seed of the random generators of every measure
+SEED = 622527
+
+
+def _cover_method(method):
+    def box_counts(filename, graph, box_lengths):
+        return [covering.cover_number_of_boxes(graph, method, lb=lb)
+                for lb in box_lengths]
+
+    return box_counts
+
+
+def _box_lengths_counts(counts, box_lengths):
+    """
+    Returns the numbers of boxes of the box lengths given, out of the ones of
+    the box lengths 1..diameter+1. A larger box length needs one box.
+    """
+    return [int(counts[lb - 1]) if lb <= len(counts) else 1
+            for lb in box_lengths]
+
+
+def _original_greedy(filename, graph, box_lengths):
+    """
+    Number of boxes found by the original greedy coloring of greedyColoring.py,
+    which colors every box length up to the diameter.
+    """
+    counts = greedyColoring.number_of_boxes(graphStore.load_networkit(filename))
+
+    return _box_lengths_counts(counts, box_lengths)
+
+
+def _cython_greedy(filename, graph, box_lengths):
+    """
+    Number of boxes found by cythonGreedyColoring, compiled by pyximport.
+    """
+    import pyximport
+    pyximport.install(setup_args={"include_dirs": np.get_include()})
+    from dimension.boxCovering import cythonGreedyColoring
+
+    counts = cythonGreedyColoring.number_of_boxes(
+        graphStore.load_networkit(filename))
+
+    return _box_lengths_counts(counts, box_lengths)
+
+
+methods = dict((method, _cover_method(method)) for method in covering.methods)
+methods["original_greedy"] = _original_greedy
+methods["cython_greedy"] = _cython_greedy
+
+# Methods recorded as skipped when they fail, instead of stopping the run
+optional_methods = set(["cython_greedy"])
+
+
+def networks(patterns):
+    """
+    Returns the files matching some glob patterns, relative to the data
+    folder (i.e. "models/koch/*.gml") or absolute.
+    """
+    data_folder = apconfig.getBaseFolder() + apconfig.getDataFolder()
+
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(os.path.join(data_folder, pattern)))
+
+    return sorted(files)
+
+
+def measure(job):
+    """
+    Covers a network with a method for every box length. It runs in a process
+    of its own (see run).
+
+    Returns
+    -----------
+    A tuple (job, dictionary with the measures), or (job, {"skipped": error})
+    if an optional method failed
+    """
+    filename, method, box_lengths = job
+    graph = graphStore.load(filename)
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+    searches = BoundedBFS.total_searches + MultiSourceBFS.total_searches
+    start = time.time()
+    try:
+        boxes = methods[method](filename, graph, box_lengths)
+    except Exception as error:
+        if method not in optional_methods:
+            raise
+        return job, {"skipped": repr(error)}
+    seconds = time.time() - start
+
+    return job, {
+        "seconds": seconds,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "searches": (BoundedBFS.total_searches + MultiSourceBFS.total_searches -
+                     searches),
+        "boxes": boxes,
+        "dimension": fit_dimension(boxes, box_lengths)
+    }
+
+
+def run(files, method_names=None, box_lengths=range(1, 7)):
+    """
+    Measures every method on every network, one after another so the times
+    are not disturbed.
+
+    Returns
+    -----------
+    A dictionary {network: {"nodes", "edges", "methods": {method: measures}}}
+    """
+    if method_names is None:
+        method_names = sorted(methods.keys())
+    box_lengths = list(box_lengths)
+
+    results = {}
+    for filename in files:
+        graph = graphStore.load(filename)
+        results[os.path.relpath(filename, apconfig.getBaseFolder())] = {
+            "nodes": graph.number_of_nodes(),
+            "edges": graph.number_of_edges(),
+            "box_lengths": box_lengths,
+            "methods": {}
+        }
+
+    jobs = [(filename, method, box_lengths)
+            for filename in files for method in method_names]
+
+    # A new process for every job, which starts with a fresh peak RSS
+    pool = mp.get_context("spawn").Pool(1, maxtasksperchild=1)
+    try:
+        for (filename, method, _), measures in pool.imap(measure, jobs):
+            network = os.path.relpath(filename, apconfig.getBaseFolder())
+            results[network]["methods"][method] = measures
+            print(network, method, measures.get("seconds", "skipped"))
+    finally:
+        pool.close()
+        pool.join()
+
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Returns a list with a description of every regression of the results
+    with respect to the baseline. Only the networks and methods measured in
+    both are compared.
+    """
+    regressions = []
+    for network, result in sorted(results.items()):
+        if network not in baseline:
+            continue
+
+        for method, new in sorted(result["methods"].items()):
+            old = baseline[network]["methods"].get(method)
+            if old is None or "skipped" in old or "skipped" in new:
+                continue
+
+            name = "{} {}".format(network, method)
+            if new["boxes"] != old["boxes"]:
+                regressions.append("{}: boxes {} instead of {}".format(
+                    name, new["boxes"], old["boxes"]))
+            if new["searches"] > old["searches"]:
+                regressions.append("{}: {} searches instead of {}".format(
+                    name, new["searches"], old["searches"]))
+            for key, slack in sorted(SLACK.items()):
+                if new[key] > old[key] * (1 + tolerance) + slack:
+                    regressions.append("{}: {} {:.2f} instead of {:.2f}".format(
+                        name, key, new[key], old[key]))
+
+    return regressions
+
+
+def main(args):
+    """
+    args: The results file, glob patterns of networks and optionally
+          --baseline <file> and --methods <method,method,...>
+    """
+    baseline_file = None
+    method_names = None
+    if "--baseline" in args:
+        i = args.index("--baseline")
+        baseline_file = args[i + 1]
+        args = args[:i] + args[i + 2:]
+    if "--methods" in args:
+        i = args.index("--methods")
+        method_names = args[i + 1].split(",")
+        args = args[:i] + args[i + 2:]
+
+    results_file, patterns = args[0], args[1:]
+    results = run(networks(patterns), method_names)
+    graphStore.write_atomically(results_file, lambda file: file.write(
+        json.dumps(results, indent=1, sort_keys=True).encode("utf-8")))
+
+    if baseline_file is not None:
+        with open(baseline_file) as file:
+            regressions = compare(results, json.load(file))
+        if regressions:
+            print("\n".join(["REGRESSIONS:"] + regressions))
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
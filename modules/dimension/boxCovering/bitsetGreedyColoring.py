@@ -0,0 +1,235 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+
+import networkit as nk
+import numpy as np
+
+from . import distanceMatrix
+from .csrGraph import CSRGraph
+from .multiSourceBFS import RowBlocks
+
+
+def pick_colors(d, other_colors, box_lengths, num_colors, rnd):
+    """
+    Choose the colors of one node for all the box lengths at once, given the
+    distances d to other nodes and the colors of those nodes (one row per
+    node, one column per box length). For every box length the colors of the
+    other nodes are split in two masks:
+
+        near: colors of other nodes at distance <  lb
+        far:  colors of other nodes at distance >= lb
+
+    The node takes a random color from near & ~far, or a new color when that
+    mask is empty. This is the same rule used by choose_color, but evaluated
+    with NumPy comparisons over all the box lengths instead of Python sets.
+
+    Parameters
+    -----------
+    d:            Distances from the node to the other nodes
+    other_colors: Matrix with the colors of the other nodes
+    box_lengths:  Array with the box length of each column
+    num_colors:   Array with the number of colors used in each column. It is
+                  updated when a new color is created
+    rnd:          A numpy RandomState (or the numpy.random module)
+
+    Returns
+    -----------
+    An array with the color chosen for each box length
+    """
+    columns = np.arange(len(box_lengths))
+    width = num_colors.max()
+
+    # Position of each (box length, color) pair in the flattened masks
+    flat = (other_colors + columns * width).ravel()
+    is_far = d[:, np.newaxis] >= box_lengths[np.newaxis, :]
+
+    used = np.bincount(flat, minlength=len(columns) * width)
+    far = np.bincount(flat, weights=is_far.ravel(),
+                      minlength=len(columns) * width)
+
+    # near & ~far
+    allowed = ((used > 0) & (far == 0)).reshape(len(columns), width)
+    keys = rnd.random_sample(allowed.shape)
+    keys[~allowed] = -1.0
+    choice = keys.argmax(axis=1)
+
+    new_color = ~allowed[columns, choice]
+    choice[new_color] = num_colors[new_color]
+    num_colors[new_color] += 1
+
+    return choice
+
+
+def color_nodes(distances, order, diameter, random_state=None):
+    """
+    Assign a color to every node for each box length lb in [2, diameter].
+    The nodes are visited in the order received and each one gets its colors
+    for all the box lengths at once from pick_colors, compared against the
+    nodes already colored.
+
+    Parameters
+    -----------
+    distances: A function that receives a node position and returns the
+               distances from that node to all the nodes (by position)
+    order:     The order in which the node positions are colored
+    diameter:  Diameter of the graph
+    random_state: A numpy RandomState used to pick the colors. The global
+               numpy generator is used when it is None
+
+    Returns
+    -----------
+    A matrix c with num_nodes+1 rows and diameter+2 columns where c[i, lb] is
+    the color of the node at position i for the box length lb. The last row
+    is filled with -1, like the matrix built by greedy_coloring.
+    """
+    num_nodes = len(order)
+    c = np.empty((num_nodes+1, diameter+2), dtype=int)
+    c.fill(-1)
+
+    if diameter < 2 or num_nodes == 0:
+        return c
+
+    c[order, 2:diameter+1] = color_columns(distances, order,
+                                           np.arange(2, diameter+1),
+                                           random_state)
+
+    return c
+
+
+def color_columns(distances, order, box_lengths, random_state=None,
+                  first_colors=None):
+    """
+    Greedy coloring of the nodes for the given box lengths only.
+
+    first_colors: Optionally, a matrix with the colors of the first nodes of
+                  the order, which are kept. The coloring goes on from the
+                  next node as if it had chosen them
+
+    Returns
+    -----------
+    A matrix with one row per node, in the order received, and one column
+    per box length.
+    """
+    rnd = np.random if random_state is None else random_state
+    num_nodes = len(order)
+    colors = np.empty((num_nodes, len(box_lengths)), dtype=int)
+    # Number of colors used so far for each box length
+    num_colors = np.ones(len(box_lengths), dtype=int)
+
+    if num_nodes == 0:
+        return colors
+
+    start = 0 if first_colors is None else len(first_colors)
+    if start == 0:
+        colors[0, :] = 0
+        start = 1
+    else:
+        colors[:start, :] = first_colors
+        # The colors are created in order, so the first nodes use them all
+        num_colors = colors[:start, :].max(axis=0) + 1
+
+    for index in range(start, num_nodes):
+        d = distances(order[index])[order[:index]]
+        colors[index, :] = pick_colors(d, colors[:index, :], box_lengths,
+                                       num_colors, rnd)
+
+    return colors
+
+
+def greedy_coloring(g, diameter=None, distances=None, random_state=None):
+    """
+    Compute the minimal set of boxes to cover a graph given a box length.
+    This method uses the box values between [2, network_diameter] and fills
+    every column of the color matrix with one BFS per node. Without a
+    distance matrix, the BFSs of the next 64 nodes to color are run together
+    (see multiSourceBFS.RowBlocks).
+
+    Parameters
+    -------------------
+    g:          Networkit graph
+    diameter:   Diameter of the graph. It is calculated when not given
+    distances:  All-pairs distance matrix of g (see distanceMatrix). When
+                given, no BFS is run and only a new node order is drawn
+    random_state: A numpy RandomState. The global numpy generator is used
+                when it is None
+
+    Returns
+    -------------------
+    A matrix c where c[i, lb] is the color of the i-th node in g.nodes() for
+    the box length lb.
+
+    References:
+    Chaoming Song, Lazaros K Gallos, Shlomo Havlin, and Hernán A Makse.
+    How to calculate the fractal dimension of a complex network: the box cov-
+    ering algorithm. Journal of Statistical Mechanics: Theory and Experiment,
+    2007(03):P03006, 2007.
+    http://iopscience.iop.org/1742-5468/2007/03/P03006/
+    """
+    if diameter is None:
+        if distances is not None:
+            diameter = distanceMatrix.diameter(distances)
+        else:
+            diameter = int(nk.distance.Diameter.exactDiameter(g))
+
+    rnd = np.random if random_state is None else random_state
+
+    if distances is not None:
+        order = rnd.permutation(len(distances))
+        return color_nodes(distances.__getitem__, order, diameter, rnd)
+
+    graph = CSRGraph.from_networkit(g)
+    order = rnd.permutation(graph.number_of_nodes())
+    rows = RowBlocks(graph.offsets, graph.targets, order)
+
+    return color_nodes(rows, order, diameter, rnd)
+
+
+def count_boxes(c, num_nodes, diameter):
+    """
+    This method counts the boxes found in a color matrix for every box length
+    between 1 and diameter+1.
+    """
+    boxes = []
+    for lb in range(1, diameter+2):
+        if lb == 1:
+            # Each node is in a different box
+            boxes.append(num_nodes)
+        elif lb == diameter + 1:
+            # Every node is in the same box
+            boxes.append(1)
+        else:
+            boxes.append(len(np.unique(c[:, lb])) - 1)
+
+    return boxes
+
+
+def number_of_boxes(g, diameter=None, distances=None, random_state=None):
+    """
+    This method computes the boxes required to cover a graph with all the
+    possible box sizes.
+    If the optional parameters are not passed they are calculated.
+
+    Parameters
+    -------------------
+    g:          Networkit graph
+    diameter:   Diameter of the graph
+    distances:  All-pairs distance matrix of g. Pass the same matrix on
+                every call to avoid running the BFSs again
+    random_state: A numpy RandomState used by the coloring
+
+    Returns
+    ------------------
+    This method returns a list specifying the number of boxes found for
+    every box length
+
+    """
+    if diameter is None:
+        if distances is not None:
+            diameter = distanceMatrix.diameter(distances)
+        else:
+            diameter = int(nk.distance.Diameter.exactDiameter(g))
+
+    c = greedy_coloring(g, diameter, distances, random_state)
+
+    return count_boxes(c, len(c) - 1, diameter)
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Breadth first search limited to a maximum distance, shared by the box
+covering algorithms (MEMB, CBB and the random covering).
+
+The nodes are mapped to positions 0..n-1 and the distances are written in
+integer arrays allocated once per graph. Each search only resets the entries
+it touched in the previous one, so the extra memory used does not depend on
+the number of searches and no paths or dictionaries are built.
+"""
+
+from .csrGraph import CSRGraph
+from .multiSourceBFS import UNREACHABLE, csr_arrays, distance_rows
+
+
+def index_graph(G):
+    """
+    Returns the list of nodes of G and, for each position in that list, the
+    list of positions of its neighbors. Self loops are ignored.
+
+    Parameters
+    -----------
+    G: A networkx graph or a CSRGraph, whose lists are built only once
+
+    Returns
+    -----------
+    A tuple (nodes, neighbors)
+    """
+    if isinstance(G, CSRGraph):
+        return list(G.nodes), G.neighbor_lists()
+
+    nodes = list(G.nodes())
+    index = dict((node, i) for i, node in enumerate(nodes))
+
+    neighbors = [[index[w] for w in G.neighbors(node) if w != node]
+                 for node in nodes]
+
+    return nodes, neighbors
+
+
+def distance_matrix(neighbors):
+    """
+    Returns the matrix of hop distances between all the nodes, searching
+    from blocks of 64 nodes at once (see multiSourceBFS.py). The pairs of
+    nodes not connected get UNREACHABLE, so they are never closer than any
+    box length.
+
+    Parameters
+    -----------
+    neighbors: The neighbors of every node, as returned by index_graph
+    """
+    offsets, targets = csr_arrays(neighbors)
+
+    return distance_rows(offsets, targets)
+
+
+class BoundedBFS(object):
+    """
+    Breadth first search from a source up to a maximum distance.
+
+    After run(source, cutoff) returns k, queue[:k] holds the nodes at distance
+    at most cutoff of the source in BFS order (so by increasing distance) and
+    distance[u] holds the distance of each one of them. The other entries of
+    distance are -1.
+
+    The search stops as soon as the whole component of the source has been
+    reached, which saves most of the work in dense networks with a small
+    diameter.
+    """
+
+    # Number of searches run by all the instances (see benchmark.py)
+    total_searches = 0
+
+    def __init__(self, neighbors):
+        """
+        Parameters
+        -----------
+        neighbors: The neighbors of every node, as returned by index_graph
+        """
+        n = len(neighbors)
+        self.neighbors = neighbors
+        self.distance = [-1] * n
+        self.queue = [0] * n
+        self.size = 0
+
+        # Size of the component of each node
+        self.component_size = [0] * n
+        for source in range(n):
+            if self.component_size[source] == 0:
+                size = self.run(source, n)
+                for i in range(size):
+                    self.component_size[self.queue[i]] = size
+
+    def run(self, source, cutoff, excluded=None):
+        """
+        Returns the number of nodes at distance at most cutoff of source.
+        If excluded is given (a bytearray or list with one flag per node),
+        the search does not go through the nodes flagged, as if they had
+        been removed from the graph.
+        """
+        neighbors = self.neighbors
+        distance = self.distance
+        queue = self.queue
+
+        BoundedBFS.total_searches += 1
+        for i in range(self.size):
+            distance[queue[i]] = -1
+
+        distance[source] = 0
+        queue[0] = source
+        size = 1
+        head = 0
+        # Before the component sizes are known the search is not cut short
+        component_size = self.component_size[source] or len(queue)
+        while head < size < component_size:
+            v = queue[head]
+            head += 1
+            d = distance[v]
+            if d >= cutoff:
+                # The rest of the queue is at distance cutoff too
+                break
+            if excluded is None:
+                for w in neighbors[v]:
+                    if distance[w] < 0:
+                        distance[w] = d + 1
+                        queue[size] = w
+                        size += 1
+            else:
+                for w in neighbors[v]:
+                    if distance[w] < 0 and not excluded[w]:
+                        distance[w] = d + 1
+                        queue[size] = w
+                        size += 1
+
+        self.size = size
+        return size
+
+    def ball_sizes(self, source, cutoff):
+        """
+        Returns a list with the number of nodes at distance at most r of
+        source, for r = 0, 1, ..., cutoff.
+        """
+        size = self.run(source, cutoff)
+
+        sizes = [0] * (cutoff + 1)
+        for i in range(size):
+            sizes[self.distance[self.queue[i]]] += 1
+        for r in range(1, cutoff + 1):
+            sizes[r] += sizes[r - 1]
+
+        return sizes
@@ -0,0 +1,57 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Results of the box covering algorithms (MEMB, CBB and the random covering).
+
+The algorithms label every node with the id of its box, numbered from 0 in
+the order the boxes were found, in a numpy array. Only the labels are needed
+to count the boxes, so the subgraph of each box is built just when it is
+asked for.
+"""
+
+import numpy as np
+
+
+def box_labels(centers, box_of_node):
+    """
+    Returns a numpy array with the box id of every node, given the center of
+    the box of every node (as positions in the list of nodes).
+
+    Parameters
+    -----------
+    centers: The positions of the centers, in the order they were chosen
+    box_of_node: The position of the center of the box of every node
+    """
+    box_id = np.empty(len(box_of_node), dtype=int)
+    box_id[centers] = np.arange(len(centers))
+
+    return box_id[np.asarray(box_of_node, dtype=int)]
+
+
+def number_of_boxes(labels):
+    return int(labels.max()) + 1 if len(labels) else 0
+
+
+def box_subgraphs(G, nodes, centers, labels):
+    """
+    Returns a dictionary {box_id:subgraph_generated_by_the_nodes_in_this_box}
+    where the box_id is the center of the box, as the algorithms did before
+    the labels.
+
+    Parameters
+    -----------
+    G: The networkx graph covered
+    nodes: The list of nodes of G the labels refer to
+    centers: The positions of the centers, ordered by box id
+    labels: The box id of every node
+    """
+    order = np.argsort(labels, kind="mergesort")
+    bounds = np.searchsorted(labels[order], np.arange(len(centers) + 1))
+
+    boxes_subgraphs = {}
+    for box, center in enumerate(centers):
+        members = order[bounds[box]:bounds[box + 1]]
+        boxes_subgraphs[nodes[center]] = G.subgraph([nodes[i] for i in members])
+
+    return boxes_subgraphs
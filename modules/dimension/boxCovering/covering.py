@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Common entry point to the box covering algorithms.
+
+All of them run on a CSRGraph (see csrGraph.py), built once from the network,
+and return the box id of every node in a numpy array (see boxes.py):
+
+    graph = CSRGraph.from_gml("dolphins.gml")
+    labels = cover(graph, method="memb", lb=3)
+    number_of_boxes(labels)
+
+The distance matrix needed by the greedy coloring and OBCA is computed the
+first time one of them covers a graph and kept while the graph exists,
+together with its diameter, in the narrowest dtype that holds them (see
+distanceMatrix.narrow_distances).
+"""
+
+import weakref
+
+import numpy as np
+
+from .bitsetGreedyColoring import color_columns
+from .boxes import number_of_boxes
+from .csrGraph import as_csr_graph
+from .distanceMatrix import diameter, narrow_distances
+from .multiSourceBFS import distance_rows
+from .CBB import CBB
+from .MEMB import MEMB
+from .OBCA import obca_labels
+from .randomCovering import random_box_covering
+
+# CSRGraph -> (distance matrix, diameter)
+_distances = weakref.WeakKeyDictionary()
+
+
+def _distances_and_diameter(graph):
+    if graph not in _distances:
+        distances = distance_rows(graph.offsets, graph.targets)
+        graph_diameter = diameter(distances)
+        _distances[graph] = (narrow_distances(distances, graph_diameter),
+                             graph_diameter)
+
+    return _distances[graph]
+
+
+def distances_of(graph):
+    """
+    Returns the distance matrix of a CSRGraph, computing it only once. The
+    pairs of nodes not connected hold the largest value of its dtype.
+    """
+    return _distances_and_diameter(graph)[0]
+
+
+def diameter_of(graph):
+    """
+    Returns the largest finite distance of a CSRGraph (see distances_of).
+    """
+    return _distances_and_diameter(graph)[1]
+
+
+def _greedy(graph, lb, rb):
+    order = np.random.permutation(graph.number_of_nodes())
+    # A larger box length gives the same boxes, and it could pass the value
+    # of the pairs of nodes not connected in a narrow matrix
+    lb = min(lb, diameter_of(graph) + 1)
+    colors = color_columns(distances_of(graph).__getitem__, order,
+                           np.array([lb]))
+
+    labels = np.empty(len(order), dtype=int)
+    labels[order] = colors[:, 0]
+
+    return labels
+
+
+def _obca(graph, lb, rb):
+    return obca_labels(graph, lb, distances_of(graph), diameter_of(graph))
+
+
+def _cbb(graph, lb, rb):
+    return CBB(graph, lb, subgraphs=False)
+
+
+def _memb(graph, lb, rb):
+    return MEMB(graph, rb, subgraphs=False)
+
+
+def _random(graph, lb, rb):
+    return random_box_covering(graph, rb, subgraphs=False)
+
+
+methods = {
+    "memb": _memb,
+    "cbb": _cbb,
+    "greedy": _greedy,
+    "obca": _obca,
+    "random": _random
+}
+
+
+def cover(graph, method="memb", lb=None, rb=None):
+    """
+    Covers a graph with boxes and returns a numpy array with the box id (0,
+    1, ...) of every node, in the order of graph.nodes.
+
+    CBB, the greedy coloring and OBCA find boxes whose nodes are less than lb
+    apart. MEMB and the random covering grow boxes of radius rb around their
+    centers; when only lb is given they use rb = (lb - 1) // 2, the largest
+    radius whose boxes are less than lb wide. The boxes of OBCA may overlap,
+    so its nodes get the id of the first box covering them.
+
+    Parameters
+    -----------
+    graph: A CSRGraph. A networkx or networkit graph is converted on every
+           call, so build the CSRGraph once to cover a network several times
+    method: One of the names in the methods dictionary
+    lb: The box length
+    rb: The box radius, only used by MEMB and the random covering
+    """
+    if method not in methods:
+        raise ValueError("Unknown box covering method {}, use one of {}".format(
+            method, sorted(methods.keys())))
+    if lb is None and rb is None:
+        raise ValueError("Either lb or rb must be given")
+
+    if lb is None:
+        lb = 2 * rb + 1
+    if rb is None:
+        rb = (lb - 1) // 2
+
+    return methods[method](as_csr_graph(graph), lb, rb)
+
+
+def cover_number_of_boxes(graph, method="memb", lb=None, rb=None):
+    """
+    Returns the number of boxes found by cover.
+    """
+    return number_of_boxes(cover(graph, method, lb, rb))
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Compact representation of an undirected graph shared by all the box covering
+algorithms.
+
+The nodes are mapped to positions 0..n-1 and the neighbors of the node at
+position i are targets[offsets[i]:offsets[i+1]] (compressed sparse rows). The
+graph is built once from a GML file, a networkx graph or a networkit graph,
+and it is never modified, so anything derived from it (the lists used by the
+BFS, the distance matrix) can be computed once and reused.
+"""
+
+import networkx as nx
+import numpy as np
+
+
+def _read_only(values):
+    array = np.ascontiguousarray(values, dtype=np.int32)
+    array.setflags(write=False)
+    return array
+
+
+class CSRGraph(object):
+    """
+    Immutable undirected graph stored in two int32 arrays, offsets (n + 1
+    entries) and targets (two entries per edge). Self loops are not stored.
+
+    nodes holds the identifier of the node at every position, as given by
+    the graph it was built from. When it is a range (the nodes are 0..n-1,
+    as in the graphs of the cache of graphStore) it is kept as it is, so the
+    identifiers are not stored one by one.
+    """
+
+    def __init__(self, nodes, offsets, targets, name=""):
+        """
+        Parameters
+        -----------
+        nodes: The identifiers of the nodes, by position, or a range
+        offsets: Start of the neighbors of every node in targets, plus the
+                 length of targets at the end
+        targets: The positions of the neighbors of every node
+        name: Name of the network
+        """
+        self.nodes = nodes if isinstance(nodes, range) else tuple(nodes)
+        self.offsets = _read_only(offsets)
+        self.targets = _read_only(targets)
+        self.name = name
+        self._neighbor_lists = None
+        self._index = None
+
+    @classmethod
+    def from_adjacency(cls, nodes, adjacency, name=""):
+        """
+        Builds the graph from the list of nodes and, for every one of them,
+        an iterable with its neighbors (by identifier). The order of the
+        neighbors is kept.
+        """
+        index = dict((node, i) for i, node in enumerate(nodes))
+
+        targets = []
+        offsets = [0]
+        for i, node in enumerate(nodes):
+            targets.extend(index[w] for w in adjacency[i] if w != node)
+            offsets.append(len(targets))
+
+        return cls(nodes, offsets, targets, name)
+
+    @classmethod
+    def from_edges(cls, nodes, sources, targets, name=""):
+        """
+        Builds the graph from the list of nodes and two arrays with the
+        positions of the endpoints of every edge. Self loops and repeated
+        edges are dropped, and the neighbors of every node are sorted.
+        """
+        n = len(nodes)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        edges = sources != targets
+        sources, targets = sources[edges], targets[edges]
+        # Both directions of every edge as source * n + target, sorted, so
+        # the repeated ones are next to each other
+        edges = np.concatenate((sources * n + targets, targets * n + sources))
+        edges.sort()
+        if len(edges):
+            edges = edges[np.concatenate(([True], edges[1:] != edges[:-1]))]
+
+        degrees = np.bincount(edges // n, minlength=n)
+        offsets = np.concatenate(([0], np.cumsum(degrees)))
+
+        return cls(nodes, offsets, edges % n, name)
+
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Builds the graph from a networkx graph. Directed graphs are taken as
+        undirected.
+        """
+        if G.is_directed():
+            G = G.to_undirected()
+
+        nodes = list(G.nodes())
+        return cls.from_adjacency(nodes, [G.neighbors(node) for node in nodes],
+                                  G.name)
+
+    @classmethod
+    def from_networkit(cls, g):
+        """
+        Builds the graph from a networkit graph. Directed graphs are taken as
+        undirected.
+        """
+        if g.isDirected():
+            g = g.toUndirected()
+
+        nodes = list(g.nodes())
+        return cls.from_adjacency(nodes, [g.neighbors(node) for node in nodes],
+                                  g.getName())
+
+    @classmethod
+    def from_gml(cls, filename):
+        """
+        Reads a GML file (see networkReader.py). The nodes keep the ids of
+        the file.
+        """
+        from .networkReader import read_gml
+
+        return read_gml(filename)
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return len(self.targets) // 2
+
+    def degrees(self):
+        """
+        Returns an array with the degree of the node at every position.
+        """
+        return np.diff(self.offsets)
+
+    def neighbors(self, position):
+        """
+        Returns the positions of the neighbors of the node at a position.
+        """
+        return self.targets[self.offsets[position]:self.offsets[position+1]]
+
+    def neighbor_lists(self):
+        """
+        Returns, for every position, a list with the positions of its
+        neighbors. The lists are built the first time and must not be
+        modified, since every call returns the same ones.
+        """
+        if self._neighbor_lists is None:
+            targets = self.targets.tolist()
+            offsets = self.offsets.tolist()
+            self._neighbor_lists = [targets[offsets[i]:offsets[i+1]]
+                                    for i in range(len(self.nodes))]
+
+        return self._neighbor_lists
+
+    def index(self):
+        """
+        Returns a dictionary {node: position}.
+        """
+        if self._index is None:
+            self._index = dict((node, i) for i, node in enumerate(self.nodes))
+
+        return self._index
+
+    def subgraph(self, nodes):
+        """
+        Returns the CSRGraph induced by some nodes (given by identifier), in
+        the order received.
+        """
+        positions = np.asarray([self.index()[node] for node in nodes],
+                               dtype=np.int64)
+        new_position = np.empty(len(self.nodes), dtype=np.int64)
+        new_position.fill(-1)
+        new_position[positions] = np.arange(len(positions))
+
+        starts = self.offsets[positions].astype(np.int64)
+        lengths = self.offsets[positions + 1] - starts
+        # Position in targets of every neighbor of the nodes kept
+        edges = (np.repeat(starts - np.cumsum(lengths) + lengths, lengths) +
+                 np.arange(lengths.sum()))
+        targets = new_position[self.targets[edges]]
+        sources = np.repeat(np.arange(len(positions)), lengths)
+
+        inside = targets >= 0
+        degrees = np.bincount(sources[inside], minlength=len(positions))
+        offsets = np.concatenate(([0], np.cumsum(degrees)))
+
+        return CSRGraph(nodes, offsets, targets[inside], self.name)
+
+    def to_networkx(self):
+        G = nx.Graph(name=self.name)
+        G.add_nodes_from(self.nodes)
+        sources = np.repeat(np.arange(len(self.nodes)), self.degrees())
+        G.add_edges_from((self.nodes[u], self.nodes[v])
+                         for u, v in zip(sources.tolist(), self.targets.tolist())
+                         if u < v)
+
+        return G
+
+
+def as_csr_graph(g):
+    """
+    Returns g if it is a CSRGraph, or a CSRGraph built from it if it is a
+    networkx or networkit graph.
+    """
+    if isinstance(g, CSRGraph):
+        return g
+    if isinstance(g, nx.Graph):
+        return CSRGraph.from_networkx(g)
+
+    return CSRGraph.from_networkit(g)
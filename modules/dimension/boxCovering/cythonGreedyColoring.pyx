@@ -164,7 +164,7 @@ cdef box_covering(g, distances=None, num_nodes=None, diameter=None):
     return boxes
 
 
-cdef number_of_boxes(g, int diameter=None):
+def number_of_boxes(g, diameter=None):
     """
     This method computes the boxes required to cover a graph with all the
     possible box sizes.
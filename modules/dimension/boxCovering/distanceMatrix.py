@@ -0,0 +1,242 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from .csrGraph import CSRGraph
+from .multiSourceBFS import MultiSourceBFS, UNREACHABLE
+
+# Matrices bigger than this (in bytes) are stored in a memory-mapped file
+MEMMAP_THRESHOLD = 256 * 1024 * 1024
+
+# Maximum number of graphs whose distances are kept in memory
+CACHE_SIZE = 4
+
+# id(graph) -> (fingerprint, distances, filename)
+_cache = OrderedDict()
+
+
+def unreachable(distances):
+    """
+    Returns the value used in a distance matrix for pairs of nodes that are
+    not connected. It is the largest value of the matrix dtype.
+    """
+    return np.iinfo(distances.dtype).max
+
+
+def graph_fingerprint(g):
+    """
+    This method returns a value that changes when nodes or edges are added to
+    or removed from the graph. It is used to drop the cached distances of a
+    graph that has been modified.
+
+    Parameters
+    -----------
+    g: A networkit graph
+    """
+    edges = tuple(sorted((min(u, v), max(u, v)) for u, v in g.edges()))
+    return g.numberOfNodes(), g.numberOfEdges(), hash(edges)
+
+
+def _allocate(filename, dtype, num_nodes):
+    if filename is None:
+        return np.empty((num_nodes, num_nodes), dtype=dtype)
+
+    return np.memmap(filename, dtype=dtype, mode="w+",
+                     shape=(num_nodes, num_nodes))
+
+
+def _distances_dtype(first_row, num_nodes):
+    """
+    Choose the smallest unsigned type able to store all the distances. The
+    eccentricity e of any node bounds the diameter of its component by 2e,
+    so one BFS is enough when the graph is connected.
+    """
+    finite = first_row[first_row < num_nodes]
+    if num_nodes > 0 and len(finite) == num_nodes:
+        bound = 2 * int(finite.max())
+    else:
+        bound = num_nodes - 1
+
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if bound < np.iinfo(dtype).max:
+            return dtype
+
+
+def all_pairs_shortest_path_length(g, filename=None):
+    """
+    This method creates a matrix containing all the shortest paths distances
+    between each pair of nodes in the network. Row and column i correspond to
+    the i-th node of g.nodes(). The pairs of nodes that are not connected
+    get the value returned by unreachable(distances). The rows are computed
+    in blocks of 64 (see multiSourceBFS.py).
+
+    Parameters
+    ------------
+    g:        A networkit graph
+    filename: When given, the matrix is memory-mapped on this file
+
+    Returns
+    ------------
+    a matrix containing all the shortest paths distances.
+    """
+    graph = CSRGraph.from_networkit(g)
+    n = graph.number_of_nodes()
+    bfs = MultiSourceBFS(graph.offsets, graph.targets)
+
+    distances = None
+    if n == 0:
+        distances = _allocate(filename, np.uint8, n)
+
+    for start, rows in bfs.blocks(np.arange(n)):
+        if distances is None:
+            distances = _allocate(filename, _distances_dtype(rows[0], n), n)
+            sentinel = unreachable(distances)
+
+        distances[start:start+len(rows), :] = np.where(rows == UNREACHABLE,
+                                                       sentinel, rows)
+
+    if filename is not None:
+        distances.flush()
+
+    return distances
+
+
+def diameter(distances):
+    """
+    Returns the largest finite distance of a distance matrix, that is, the
+    largest diameter among the connected components of the graph.
+    """
+    if distances.size == 0:
+        return 0
+
+    sentinel = unreachable(distances)
+    return int(max(row[row != sentinel].max() for row in distances))
+
+
+def narrow_distances(distances, diameter):
+    """
+    Returns the distance matrix in the smallest unsigned dtype able to store
+    its diameter and the value of the pairs not connected (see unreachable),
+    converting it only when that dtype is narrower. Smaller entries are
+    faster to read.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if diameter < np.iinfo(dtype).max:
+            break
+
+    if np.dtype(dtype).itemsize >= distances.dtype.itemsize:
+        return distances
+
+    # The finite distances are kept and the unreachable value of the matrix
+    # becomes the one of the new dtype
+    narrowed = np.empty(distances.shape, dtype=dtype)
+    np.minimum(distances, np.iinfo(dtype).max, out=narrowed, casting="unsafe")
+
+    return narrowed
+
+
+def distance_matrix(g):
+    """
+    Returns the all-pairs distance matrix of g computing it only the first
+    time this method is called for the graph. If the graph has changed since
+    then, the old matrix is dropped and the distances are computed again.
+
+    Big matrices (see MEMMAP_THRESHOLD) are stored in a temporary file and
+    memory-mapped.
+
+    Parameters
+    ------------
+    g: A networkit graph
+    """
+    key = id(g)
+    fingerprint = graph_fingerprint(g)
+
+    if key in _cache:
+        if _cache[key][0] == fingerprint:
+            _cache.move_to_end(key)
+            return _cache[key][1]
+        drop(g)
+
+    filename = None
+    n = g.numberOfNodes()
+    # Every distance takes at least one byte
+    if n * n > MEMMAP_THRESHOLD:
+        handle, filename = tempfile.mkstemp(suffix=".distances")
+        os.close(handle)
+
+    distances = all_pairs_shortest_path_length(g, filename)
+    _cache[key] = (fingerprint, distances, filename)
+
+    while len(_cache) > CACHE_SIZE:
+        _remove(next(iter(_cache)))
+
+    return distances
+
+
+def cached_filename(g):
+    """
+    Returns the file where the cached distances of g are memory-mapped, or
+    None if they are kept in memory or not cached at all.
+    """
+    entry = _cache.get(id(g))
+    return entry[2] if entry is not None else None
+
+
+def dump(distances):
+    """
+    Writes a distance matrix to a temporary file that other processes can
+    memory-map with load(). The caller is responsible for removing it.
+
+    Returns
+    ------------
+    A tuple (filename, dtype, shape) to be passed to load()
+    """
+    handle, filename = tempfile.mkstemp(suffix=".distances")
+    os.close(handle)
+
+    shared = np.memmap(filename, dtype=distances.dtype, mode="w+",
+                       shape=distances.shape)
+    shared[:] = distances
+    shared.flush()
+    del shared
+
+    return filename, distances.dtype.str, distances.shape
+
+
+def load(filename, dtype, shape):
+    """
+    Memory-maps (read only) a distance matrix written by dump() or cached by
+    distance_matrix().
+    """
+    return np.memmap(filename, dtype=np.dtype(dtype), mode="r",
+                     shape=tuple(shape))
+
+
+def _remove(key):
+    fingerprint, distances, filename = _cache.pop(key)
+    del distances
+
+    if filename is not None and os.path.exists(filename):
+        os.remove(filename)
+
+
+def drop(g):
+    """
+    Removes the cached distances of g.
+    """
+    if id(g) in _cache:
+        _remove(id(g))
+
+
+def clear():
+    """
+    Removes all the cached distance matrices.
+    """
+    while _cache:
+        _remove(next(iter(_cache)))
@@ -16,10 +16,70 @@ import numpy as np
 import networkx as nx
 import random
 from copy import deepcopy
-import os, sys
 import time
 
-def fractal_model(generation,m,x,e):
+from .csrGraph import CSRGraph
+
+
+def fractal_model_edges(generation,m,x,e,random_state=None):
+	"""
+	Returns the number of nodes and the arrays (sources, targets) with the
+	edges of the fractal model (see fractal_model).
+	Every generation is built at once: the link i of the previous generation
+	gets the offsprings node_index + 2*m*i + (0..m-1) around its first end and
+	the next m around the second one, and the coins of all the links are
+	drawn together.
+	random_state: A numpy RandomState. The global numpy generator is used by
+	default.
+	"""
+	if random_state is None:
+		random_state = np.random
+	if m < 1 or x > m:
+		raise ValueError("There must be at least one offspring and at most m connections between them")
+	# Columns of the offsprings joined always, and when the hubs are disconnected
+	repulsive = np.arange(m - max(x-1, 0), m)
+	replacement = m - max(x, 1)
+
+	sources = np.array([0], dtype=np.int64) #This is the seed for the network (generation 0)
+	targets = np.array([1], dtype=np.int64)
+	node_index = 2
+	for n in range(1,generation+1):
+		links = len(sources)
+		new_nodes_a = node_index + 2*m*np.arange(links, dtype=np.int64)[:,None] + np.arange(m)
+		new_nodes_b = new_nodes_a + m
+		node_index += 2*m*links
+		disconnected = random_state.random_sample(links) > e
+		sources = np.concatenate((
+			np.repeat(sources, m), np.repeat(targets, m),
+			new_nodes_a[:,repulsive].ravel(), new_nodes_a[disconnected,replacement],
+			sources[~disconnected]))
+		targets = np.concatenate((
+			new_nodes_a.ravel(), new_nodes_b.ravel(),
+			new_nodes_b[:,repulsive].ravel(), new_nodes_b[disconnected,replacement],
+			targets[~disconnected]))
+	return node_index, sources, targets
+
+
+def fractal_model_csr(generation,m,x,e,random_state=None):
+	"""
+	Returns the fractal model (see fractal_model) as a CSRGraph.
+	"""
+	num_nodes, sources, targets = fractal_model_edges(generation,m,x,e,random_state)
+	return CSRGraph.from_edges(range(num_nodes), sources, targets,
+		"fractal_model_g{}_m{}_x{}_e{}".format(generation,m,x,e))
+
+
+def save_fractal_model(filename,generation,m,x,e,random_state=None):
+	"""
+	Writes the edges of the fractal model (see fractal_model) to a .npy file
+	as an int32 matrix with one row per edge, which can be read with
+	networkReader.read_network.
+	"""
+	num_nodes, sources, targets = fractal_model_edges(generation,m,x,e,random_state)
+	np.save(filename, np.column_stack((sources, targets)).astype(np.int32))
+
+
+def fractal_model(generation,m,x,e,random_state=None):
 	"""
 	Returns the fractal model introduced by 
 	Song, Havlin, Makse in Nature Physics 2, 275.
@@ -30,27 +90,13 @@ def fractal_model(generation,m,x,e):
 	1-e = probability that x offsprings connect.
 	If e=1 we are in MODE 1 (pure small-world).
 	If e=0 we are in MODE 2 (pure fractal).
+	The graph is a networkx graph built from fractal_model_edges; use
+	fractal_model_csr for the deep generations.
 	"""
+	num_nodes, sources, targets = fractal_model_edges(generation,m,x,e,random_state)
 	G=nx.Graph()
-	G.add_edge(0,1) #This is the seed for the network (generation 0)
-	node_index = 2
-	for n in range(1,generation+1):
-		all_links = G.edges()
-		while all_links:
-			link = all_links.pop()
-			new_nodes_a = range(node_index,node_index + m)
-			#random.shuffle(new_nodes_a)
-			node_index += m
-			new_nodes_b = range(node_index,node_index + m)
-			#random.shuffle(new_nodes_b)
-			node_index += m
-			G.add_edges_from([(link[0],node) for node in new_nodes_a])
-			G.add_edges_from([(link[1],node) for node in new_nodes_b])
-			repulsive_links = list(zip(new_nodes_a,new_nodes_b))
-			G.add_edges_from([repulsive_links.pop() for i in range(x-1)])
-			if random.random() > e:
-				G.remove_edge(*link)
-				G.add_edge(*repulsive_links.pop())
+	G.add_nodes_from(range(num_nodes))
+	G.add_edges_from(zip(sources.tolist(), targets.tolist()))
 	return G
 
 """"
@@ -0,0 +1,150 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Koch networks (Zhang et al., Koch networks and their applications), written
+to disk as they are generated.
+
+The network starts with a triangle, and at every step each existing
+triangle gets m new triangles hanging from each of its three vertices (the
+"Koch network" notebook does it node by node, with the same result). The
+triangles form a tree: a triangle born at step s has 3m children at every
+step after s, and its descendants at step t are (3m+1)^(t-s) - 1 triangles
+with two new nodes each. So the ids of the nodes of every subtree are known
+in advance, and the subtrees are generated one after another, the small ones
+with numpy a step at a time. The memory used depends on CHUNK_TRIANGLES and
+not on t.
+
+The network is small-world: its diameter is 2t + 1 while the number of nodes
+grows as (3m+1)^t, so it has no finite box dimension to compare the box
+counts with. ln(3m+1) / ln(3), the dimension of the Koch curve when m = 1,
+belongs to the curve and not to this network.
+
+    write_koch_network("koch_network_m2_t10.npy", 2, 10)
+    graph = networkReader.read_network("koch_network_m2_t10.npy")
+"""
+
+import sys
+
+import numpy as np
+
+from .csrGraph import CSRGraph
+
+# Largest number of triangles of a subtree generated at once
+CHUNK_TRIANGLES = 1 << 18
+
+
+def number_of_triangles(m, t):
+    return (3 * m + 1) ** t
+
+
+def number_of_nodes(m, t):
+    """
+    Returns the number of nodes of the Koch network, 2 (3m+1)^t + 1.
+    """
+    return 2 * number_of_triangles(m, t) + 1
+
+
+def number_of_edges(m, t):
+    """
+    Returns the number of edges of the Koch network, 3 (3m+1)^t.
+    """
+    return 3 * number_of_triangles(m, t)
+
+
+def _triangle_edges(vertex, first, second):
+    return np.column_stack((np.concatenate((vertex, vertex, first)),
+                            np.concatenate((first, second, second))))
+
+
+def _small_subtree(m, t, triangle, born, next_id):
+    """
+    Returns the edges of the descendants of a triangle, computed a step at a
+    time over the array of all the triangles of the subtree.
+    """
+    triangles = np.array([triangle], dtype=np.int64)
+    edges = []
+    for step in range(born + 1, t + 1):
+        vertex = np.repeat(triangles.ravel(), m)
+        first = next_id + 2 * np.arange(len(vertex), dtype=np.int64)
+        second = first + 1
+        next_id += 2 * len(vertex)
+
+        edges.append(_triangle_edges(vertex, first, second))
+        triangles = np.concatenate((triangles,
+                                    np.column_stack((vertex, first, second))))
+
+    if not edges:
+        return np.empty((0, 2), dtype=np.int64)
+
+    return np.concatenate(edges)
+
+
+def _subtree(m, t, triangle, born, next_id):
+    """
+    Yields arrays with the edges of the descendants of a triangle born at a
+    step, whose new nodes get the ids from next_id on.
+    """
+    if number_of_triangles(m, t - born) <= CHUNK_TRIANGLES:
+        yield _small_subtree(m, t, triangle, born, next_id)
+        return
+
+    for step in range(born + 1, t + 1):
+        for vertex in triangle:
+            for group in range(m):
+                child = (vertex, next_id, next_id + 1)
+                yield _triangle_edges(np.array([vertex]), np.array([next_id]),
+                                      np.array([next_id + 1]))
+                for edges in _subtree(m, t, child, step, next_id + 2):
+                    yield edges
+
+                next_id += 2 * number_of_triangles(m, t - step)
+
+
+def koch_edges(m, t):
+    """
+    Yields int64 arrays with one row per edge of the Koch network, nodes
+    0..number_of_nodes(m, t) - 1. The first one is the initial triangle.
+    """
+    yield _triangle_edges(np.array([0]), np.array([1]), np.array([2]))
+    for edges in _subtree(m, t, (0, 1, 2), 0, 3):
+        yield edges
+
+
+def koch_network(m, t):
+    """
+    Returns the Koch network as a CSRGraph.
+    """
+    edges = np.concatenate(list(koch_edges(m, t)))
+    return CSRGraph.from_edges(range(number_of_nodes(m, t)), edges[:, 0],
+                               edges[:, 1], "koch_network_m{}_t{}".format(m, t))
+
+
+def write_koch_network(filename, m, t):
+    """
+    Writes the edges of the Koch network as they are generated. A .npy file
+    gets a matrix with one row per edge (see networkReader.read_edge_array),
+    whose shape is known before the edges, and any other file a text edge
+    list.
+    """
+    with open(filename, "wb") as file:
+        if not filename.endswith(".npy"):
+            for edges in koch_edges(m, t):
+                np.savetxt(file, edges, fmt="%d")
+            return
+
+        dtype = np.dtype(np.int32 if number_of_nodes(m, t) <= np.iinfo(np.int32).max
+                         else np.int64)
+        np.lib.format.write_array_header_1_0(file, {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (number_of_edges(m, t), 2)
+        })
+        for edges in koch_edges(m, t):
+            file.write(edges.astype(dtype).tobytes())
+
+
+if __name__ == "__main__":
+    m, t = int(sys.argv[1]), int(sys.argv[2])
+    write_koch_network(sys.argv[3], m, t)
+    print("Nodes:", number_of_nodes(m, t), "edges:", number_of_edges(m, t))
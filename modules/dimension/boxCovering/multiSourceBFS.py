@@ -0,0 +1,187 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Breadth first search from many sources at once.
+
+Up to 64 sources are searched together: every node keeps a uint64 whose bit
+b is set when the node has been reached from the b-th source. One sweep over
+the edges of the graph (a gather of the frontier masks of the neighbors and
+an OR per node) advances the 64 searches by one level, so the number of
+Python operations depends on the number of levels and not on the number of
+nodes or sources.
+
+The graph is given in compressed sparse rows: the neighbors of node i are
+targets[offsets[i]:offsets[i+1]] (see csrGraph.py).
+"""
+
+import itertools
+
+import numpy as np
+
+# Number of sources searched together, one bit of a uint64 each
+BLOCK_SIZE = 64
+
+# Distance given to the nodes not reached (not connected or beyond the cutoff)
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+def csr_arrays(neighbors):
+    """
+    Returns the arrays (offsets, targets) of a graph given the neighbors of
+    every node (lists or sets of positions).
+    """
+    degrees = [len(adjacent) for adjacent in neighbors]
+    offsets = np.zeros(len(neighbors) + 1, dtype=np.int32)
+    np.cumsum(degrees, out=offsets[1:])
+
+    targets = np.fromiter(itertools.chain.from_iterable(neighbors),
+                          dtype=np.int32, count=int(offsets[-1]))
+
+    return offsets, targets
+
+
+class MultiSourceBFS(object):
+    """
+    Distances from blocks of up to BLOCK_SIZE sources, computed together.
+    """
+
+    # Number of searches (one per source) run by all the instances
+    total_searches = 0
+
+    def __init__(self, offsets, targets):
+        """
+        Parameters
+        -----------
+        offsets: Start of the neighbors of every node in targets, plus the
+                 length of targets at the end
+        targets: The neighbors of every node
+        """
+        self.offsets = np.asarray(offsets)
+        self.targets = np.asarray(targets)
+        self.num_nodes = len(self.offsets) - 1
+
+        # reduceat needs the start of the non empty rows only
+        self.connected = np.flatnonzero(np.diff(self.offsets) > 0)
+        self.starts = self.offsets[self.connected]
+        # Counter of searches, one per source
+        self.searches = 0
+
+    def run(self, sources, cutoff=None, out=None):
+        """
+        Returns a matrix with one row per source (at most BLOCK_SIZE of
+        them) and one column per node with the distance from the source to
+        the node, or UNREACHABLE if it is farther than cutoff or not
+        connected.
+
+        Parameters
+        -----------
+        sources: The positions of the sources
+        cutoff: Maximum distance searched. The whole component by default
+        out: An int32 matrix of the right shape to write the distances in
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        k = len(sources)
+        if k > BLOCK_SIZE:
+            raise ValueError("At most {} sources can be searched at once".format(
+                BLOCK_SIZE))
+
+        n = self.num_nodes
+        if out is None:
+            out = np.empty((k, n), dtype=np.int32)
+        self.searches += k
+        MultiSourceBFS.total_searches += k
+
+        # Distances by node, so that the nodes reached at each level are rows
+        distances = np.empty((n, k), dtype=np.int32)
+        distances.fill(UNREACHABLE)
+        distances[sources, np.arange(k)] = 0
+
+        bits = np.left_shift(np.uint64(1), np.arange(k, dtype=np.uint64))
+        visited = np.zeros(n, dtype=np.uint64)
+        np.bitwise_or.at(visited, sources, bits)
+        frontier = visited.copy()
+        reached = np.zeros(n, dtype=np.uint64)
+
+        depth = 0
+        while len(self.starts) and (cutoff is None or depth < cutoff):
+            reached[self.connected] = np.bitwise_or.reduceat(
+                frontier[self.targets], self.starts)
+            reached &= ~visited
+
+            nodes = np.flatnonzero(reached)
+            if not len(nodes):
+                break
+
+            depth += 1
+            masks = reached[nodes]
+            visited[nodes] |= masks
+            frontier.fill(0)
+            frontier[nodes] = masks
+
+            # Bit b of every mask, with the least significant byte first
+            flags = np.unpackbits(masks.astype("<u8").view(np.uint8).reshape(-1, 8),
+                                  axis=1, bitorder="little")[:, :k]
+            distances[nodes] = np.where(flags, depth, distances[nodes])
+
+        out[:] = distances.T
+
+        return out
+
+    def blocks(self, sources, cutoff=None):
+        """
+        Yields (start, rows) for the consecutive blocks of BLOCK_SIZE sources,
+        where rows are the distances from sources[start:start+BLOCK_SIZE].
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        for start in range(0, len(sources), BLOCK_SIZE):
+            yield start, self.run(sources[start:start+BLOCK_SIZE], cutoff)
+
+
+def distance_rows(offsets, targets, sources=None, cutoff=None, out=None):
+    """
+    Returns the matrix of distances from every source (all the nodes by
+    default) to every node, computed in blocks of BLOCK_SIZE sources.
+
+    Parameters
+    -----------
+    offsets, targets: The graph, in compressed sparse rows
+    sources: The positions of the sources
+    cutoff: Maximum distance searched
+    out: An int32 matrix (or memory map) to write the distances in
+    """
+    bfs = MultiSourceBFS(offsets, targets)
+    if sources is None:
+        sources = np.arange(bfs.num_nodes)
+
+    if out is None:
+        out = np.empty((len(sources), bfs.num_nodes), dtype=np.int32)
+    for start in range(0, len(sources), BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, len(sources))
+        bfs.run(sources[start:stop], cutoff, out[start:stop])
+
+    return out
+
+
+class RowBlocks(object):
+    """
+    Distance rows of the nodes requested one after another in a known order.
+    When a row is not in the current block, the rows of the next BLOCK_SIZE
+    nodes of the order are computed together.
+    """
+
+    def __init__(self, offsets, targets, order, cutoff=None):
+        self.bfs = MultiSourceBFS(offsets, targets)
+        self.order = np.asarray(order, dtype=np.int64)
+        self.position = dict((node, i) for i, node in enumerate(self.order.tolist()))
+        self.cutoff = cutoff
+        self.start = 0
+        self.rows = np.empty((0, self.bfs.num_nodes), dtype=np.int32)
+
+    def __call__(self, node):
+        i = self.position[node]
+        if not self.start <= i < self.start + len(self.rows):
+            self.start = i
+            self.rows = self.bfs.run(self.order[i:i+BLOCK_SIZE], self.cutoff)
+
+        return self.rows[i - self.start]
@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Readers of the network files in data/ (GML, GraphML, edge lists such as
+the .dat files and binary edge arrays) that build a CSRGraph directly.
+
+The files are read in a single pass, a block of lines at a time. The labels
+of the nodes are mapped to positions 0..n-1 in the order they appear and the
+endpoints of the edges are appended to int32 arrays, so no graph of Python
+objects is built: the memory used is a few bytes per edge plus one entry per
+node label.
+
+    graph = read_network(real_networks_folder + "Power grid/power.gml")
+
+The graphs are undirected: the direction of the edges, self loops and
+repeated edges are dropped.
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+from array import array
+
+import numpy as np
+
+from .csrGraph import CSRGraph
+
+# Size in bytes of the blocks of lines read at once
+BLOCK_SIZE = 1 << 20
+
+# Words, quoted strings and brackets of a GML file
+_GML_TOKEN = re.compile(r'"[^"]*"|\[|\]|[^\s\[\]]+')
+
+
+def _network_name(filename):
+    return os.path.basename(filename).split(".", 1)[0]
+
+
+def _label(token):
+    """
+    Returns the integer value of a node label if it has one, or the label
+    without quotes.
+    """
+    try:
+        return int(token)
+    except ValueError:
+        return token.strip('"')
+
+
+class EdgeArrays(object):
+    """
+    Nodes and edges read so far. The nodes get consecutive positions the
+    first time their label is seen, in a node declaration or in an edge.
+    """
+
+    def __init__(self):
+        self.positions = {}
+        self.nodes = []
+        self.sources = array("i")
+        self.targets = array("i")
+
+    def node(self, label):
+        position = self.positions.get(label)
+        if position is None:
+            position = len(self.nodes)
+            self.positions[label] = position
+            self.nodes.append(label)
+
+        return position
+
+    def edge(self, source, target):
+        self.sources.append(self.node(source))
+        self.targets.append(self.node(target))
+
+    def graph(self, name=""):
+        return CSRGraph.from_edges(self.nodes,
+                                   np.frombuffer(self.sources, dtype=np.int32),
+                                   np.frombuffer(self.targets, dtype=np.int32),
+                                   name)
+
+
+def _blocks_of_lines(filename):
+    with open(filename) as file:
+        while True:
+            lines = file.readlines(BLOCK_SIZE)
+            if not lines:
+                break
+            yield lines
+
+
+def read_gml(filename):
+    """
+    Returns the CSRGraph of a GML file. The nodes are identified by their id
+    and the edges by their source and target keys; the other keys and the
+    nested lists (graphics, ...) are skipped.
+    """
+    edges = EdgeArrays()
+
+    # The lists opened, as (key of the list, values read in it). Only the
+    # values of the node and edge lists are kept
+    opened = []
+    key = None
+    for lines in _blocks_of_lines(filename):
+        for token in _GML_TOKEN.findall("".join(lines)):
+            if token == "[":
+                opened.append((key, {} if key in ("node", "edge") else None))
+                key = None
+            elif token == "]":
+                block, values = opened.pop()
+                if block == "node" and "id" in values:
+                    edges.node(_label(values["id"]))
+                elif block == "edge":
+                    edges.edge(_label(values["source"]),
+                               _label(values["target"]))
+                key = None
+            elif key is None:
+                key = token
+            else:
+                if opened and opened[-1][1] is not None:
+                    opened[-1][1][key] = token
+                key = None
+
+    return edges.graph(_network_name(filename))
+
+
+def read_graphml(filename):
+    """
+    Returns the CSRGraph of a GraphML file, with the id of the nodes as
+    labels. The file is parsed incrementally and every element is dropped
+    once it has been read.
+    """
+    edges = EdgeArrays()
+
+    graph = None
+    for event, element in ElementTree.iterparse(filename, events=("start", "end")):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if event == "start":
+            if tag == "graph":
+                graph = element
+            continue
+
+        if tag == "node":
+            edges.node(_label(element.get("id")))
+        elif tag == "edge":
+            edges.edge(_label(element.get("source")),
+                       _label(element.get("target")))
+        else:
+            continue
+
+        element.clear()
+        graph.clear()
+
+    return edges.graph(_network_name(filename))
+
+
+def read_edge_list(filename, comments="#%"):
+    """
+    Returns the CSRGraph of a file with one edge per line, given by two
+    integer labels separated by spaces. Any other column (i.e. a weight) is
+    ignored. The numbers of every block of lines are parsed by numpy, and
+    only the blocks whose lines do not all have the same number of columns
+    are split line by line.
+    """
+    labels = []
+    for lines in _blocks_of_lines(filename):
+        lines = [line for line in lines
+                 if line.strip() and line.lstrip()[0] not in comments]
+        if not lines:
+            continue
+
+        columns = len(lines[0].split())
+        try:
+            numbers = np.fromstring("".join(lines), dtype=np.int64, sep=" ")
+        except ValueError:
+            # A column that is not an integer (i.e. a float weight)
+            numbers = np.empty(0, dtype=np.int64)
+        if len(numbers) != columns * len(lines):
+            columns = 2
+            numbers = np.array([line.split(None, 2)[:2] for line in lines],
+                               dtype=np.int64)
+        if columns < 2:
+            raise ValueError("Every line of {} must have two labels".format(
+                filename))
+        labels.append(numbers.reshape(-1, columns)[:, :2])
+
+    if not labels:
+        return CSRGraph([], [0], [], _network_name(filename))
+
+    labels = np.concatenate(labels)
+    # Positions in the order the labels appear
+    nodes, first, inverse = np.unique(labels, return_index=True,
+                                      return_inverse=True)
+    order = np.argsort(first, kind="mergesort")
+    position = np.empty(len(nodes), dtype=np.int64)
+    position[order] = np.arange(len(nodes))
+    endpoints = position[inverse.reshape(labels.shape)]
+
+    return CSRGraph.from_edges(nodes[order].tolist(), endpoints[:, 0],
+                               endpoints[:, 1], _network_name(filename))
+
+
+def read_edge_array(filename):
+    """
+    Returns the CSRGraph of a .npy file with an integer matrix of one row
+    per edge (i.e. written by fractalModel.save_fractal_model). The labels of
+    the nodes are 0..n-1, where n - 1 is the largest one in the file.
+    """
+    edges = np.load(filename, mmap_mode="r")
+    num_nodes = int(edges.max()) + 1 if len(edges) else 0
+
+    return CSRGraph.from_edges(range(num_nodes), edges[:, 0], edges[:, 1],
+                               _network_name(filename))
+
+
+readers = {
+    ".gml": read_gml,
+    ".graphml": read_graphml,
+    ".dat": read_edge_list,
+    ".npy": read_edge_array
+}
+
+
+def read_network(filename):
+    """
+    Returns the CSRGraph of a file, chosen by its extension among the
+    readers dictionary.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in readers:
+        raise ValueError("Unknown network format {}, use one of {}".format(
+            extension, sorted(readers.keys())))
+
+    return readers[extension](filename)
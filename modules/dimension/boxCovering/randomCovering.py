@@ -13,46 +13,48 @@
 
 
 import numpy as np
-import networkx as nx
 import random
-from copy import deepcopy
-import os, sys
-import time
-import fractal_model as fm
 
-def random_box_covering(G,rb):
+from .boundedBFS import BoundedBFS, index_graph
+from .boxes import box_subgraphs
+
+def random_box_covering(G,rb,subgraphs=True):
 	"""
 	It returns a dictionary with {box_id:subgraph_generated_by_the_nodes_in_this_box}
 	The box_id is the center of the box.
+	subgraphs: If False, a numpy array with the box id (0, 1, ...) of every
+	node, in the order of G.nodes(), is returned instead of the dictionary.
+	Each box grows from a random unburned center through the unburned nodes
+	only, as if the burned ones had been removed from the graph, but the
+	graph is not copied: the burned nodes are flagged in a bytearray.
 	"""
-	H = deepcopy(G)
-	burned_nodes = []
-	unburned_nodes = G.nodes()
-	boxes_subgraphs = {}
-	adj = H.adj
+	nodes, neighbors = index_graph(G)
+	n = len(nodes)
+	bfs = BoundedBFS(neighbors)
+	labels = np.empty(n, dtype=int)
+	centers = []
+	burned = bytearray(n)
+	unburned_nodes = list(range(n))
+	position = list(range(n)) # position of each node in unburned_nodes
 	while unburned_nodes:
-		center_node = random.choice(unburned_nodes) 
-		nodes_visited = [center_node]
-		search_queue = [center_node]
-		d = 1
-		while search_queue and d <= rb:
-			next_depth = []
-			extend = next_depth.extend
-			for n in search_queue:
-				l = [ i for i in iter(adj[n].keys()) if i not in nodes_visited]
-				extend(l)
-				nodes_visited.extend(l)
-			search_queue = next_depth
-			d += 1
-		new_burned_nodes = nodes_visited#.keys()
-		H.delete_nodes_from(new_burned_nodes)
-		boxes_subgraphs[center_node] = subgraph(G,new_burned_nodes)
-		unburned_nodes = list(set(unburned_nodes)-set(new_burned_nodes))
-	return boxes_subgraphs
+		center_node = random.choice(unburned_nodes)
+		size = bfs.run(center_node, rb, burned)
+		for i in range(size):
+			node = bfs.queue[i]
+			burned[node] = 1
+			labels[node] = len(centers)
+			last = unburned_nodes.pop()
+			if last != node:
+				unburned_nodes[position[node]] = last
+				position[last] = position[node]
+		centers.append(center_node)
+	if not subgraphs:
+		return labels
+	return box_subgraphs(G, nodes, centers, labels)
+
 
-""""
 if __name__ == '__main__':
+	from . import fractalModel as fm
 	g=fm.fractal_model(3,2,2,0)
-	boxes_subgraphs = MEMB(g,2)
-	print boxes_subgraphs
-"""
+	boxes_subgraphs = random_box_covering(g,2)
+	print(boxes_subgraphs)
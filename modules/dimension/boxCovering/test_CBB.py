@@ -0,0 +1,121 @@
+"""
+Checks that CBB gives, in its labels-only mode, the boxes of the subgraphs
+it returns, that they are less than lb wide, and that CBB and the batched
+trials of cbb_trials find as many boxes as the original implementation.
+
+    python -m pytest dimension/boxCovering/test_CBB.py
+"""
+
+import random
+
+import networkx as nx
+import numpy as np
+
+from .CBB import CBB, cbb_number_of_boxes, cbb_trials
+from .boundedBFS import distance_matrix, index_graph
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.barabasi_albert_graph(150, 2, seed=1),
+        # Disconnected
+        nx.gnp_random_graph(150, 0.015, seed=3)
+    ]
+
+
+def original_CBB(G, lb):
+    uncovered_nodes = set(G.nodes())
+    covered_nodes = set([])
+    boxes = {}
+    adj = G.adj
+    while uncovered_nodes:
+        center = random.choice(list(uncovered_nodes))
+        nodes_visited = {center: 0}
+        search_queue = [center]
+        d = 1
+        while len(search_queue) > 0 and d <= lb-1:
+            next_depth = []
+            extend = next_depth.extend
+            for n in search_queue:
+                l = [i for i in iter(adj[n].keys()) if i not in nodes_visited]
+                extend(l)
+                for j in l:
+                    nodes_visited[j] = d
+            search_queue = next_depth
+            d += 1
+        new_covered_nodes = set(nodes_visited.keys())
+        new_covered_nodes = new_covered_nodes.difference(covered_nodes)
+        nodes_checked_as_centers = set([center])
+        while len(nodes_checked_as_centers) < len(new_covered_nodes):
+            secondary_center = random.choice(list(
+                new_covered_nodes.difference(nodes_checked_as_centers)))
+            nodes_checked_as_centers.add(secondary_center)
+            nodes_visited = {secondary_center: 0}
+            search_queue = [secondary_center]
+            d = 1
+            while len(search_queue) > 0 and d <= lb-1:
+                next_depth = []
+                extend = next_depth.extend
+                for n in search_queue:
+                    l = [i for i in iter(adj[n].keys())
+                         if i not in nodes_visited]
+                    extend(l)
+                    for j in l:
+                        nodes_visited[j] = d
+                search_queue = next_depth
+                d += 1
+            nodes_covered_by_secondary = set(nodes_visited.keys())
+            new_covered_nodes = new_covered_nodes.intersection(
+                nodes_covered_by_secondary)
+        boxes[center] = new_covered_nodes
+        uncovered_nodes = uncovered_nodes.difference(new_covered_nodes)
+        covered_nodes = covered_nodes.union(new_covered_nodes)
+    return boxes
+
+
+def assert_same_mean(new, original):
+    error = np.sqrt((np.var(new) + np.var(original)) / len(new))
+    assert abs(np.mean(new) - np.mean(original)) < 4 * error + 1e-9
+
+
+def test_labels_are_the_boxes_of_the_subgraphs():
+    for g in graphs():
+        lengths = dict(nx.all_pairs_shortest_path_length(g))
+        nodes, neighbors = index_graph(g)
+        for lb in (1, 2, 3, 4):
+            random.seed(6)
+            boxes = CBB(g, lb)
+            random.seed(6)
+            labels = CBB(g, lb, subgraphs=False)
+            assert len(set(labels.tolist())) == len(boxes)
+
+            for box_id, (center, box) in enumerate(boxes.items()):
+                assert (set(nodes[i] for i in np.flatnonzero(labels == box_id))
+                        == set(box.nodes()))
+                assert center in box
+                assert all(lengths[u].get(v, lb) < lb
+                           for u in box.nodes() for v in box.nodes())
+
+
+def test_same_number_of_boxes_as_original():
+    g = nx.barabasi_albert_graph(80, 2, seed=1)
+    nodes, neighbors = index_graph(g)
+    box_lengths = [1, 2, 3, 4]
+    trials = cbb_trials(distance_matrix(neighbors), box_lengths, 200,
+                        np.random.RandomState(7))
+
+    random.seed(7)
+    for column, lb in enumerate(box_lengths):
+        original = [len(original_CBB(g, lb)) for i in range(200)]
+        assert_same_mean([len(CBB(g, lb)) for i in range(200)], original)
+        assert_same_mean(trials[:, column], original)
+
+
+def test_cbb_number_of_boxes():
+    g = nx.karate_club_graph()
+    box_lengths, boxes = cbb_number_of_boxes(
+        g, trials=20, random_state=np.random.RandomState(8))
+    assert box_lengths.tolist() == list(range(1, nx.diameter(g) + 2))
+    assert boxes[0] == g.number_of_nodes()
+    assert boxes[-1] == 1
@@ -0,0 +1,112 @@
+"""
+Checks that MEMB keeps the excluded masses of the original algorithm (the
+number of uncovered nodes within the radius of every node) while it covers
+the graph, that its boxes are valid, and that memb_sweep finds the same
+boxes as running MEMB for every radius.
+
+    python -m pytest dimension/boxCovering/test_MEMB.py
+"""
+
+import random
+
+import networkx as nx
+
+from . import MEMB
+from .boundedBFS import BoundedBFS, index_graph
+from .multiSourceBFS import MultiSourceBFS, csr_arrays
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.barabasi_albert_graph(200, 2, seed=1),
+        nx.watts_strogatz_graph(200, 6, 0.1, seed=2),
+        # Disconnected
+        nx.gnp_random_graph(150, 0.015, seed=3)
+    ]
+
+
+def excluded_masses(lengths, nodes, covered, radius):
+    return [sum(1 for w, d in lengths[node].items()
+                if d <= radius and not covered[w]) for node in nodes]
+
+
+def test_excluded_masses_stay_exact():
+    rnd = random.Random(4)
+    for g in graphs():
+        nodes, neighbors = index_graph(g)
+        index = dict((node, i) for i, node in enumerate(nodes))
+        lengths = dict((index[u], dict((index[v], d) for v, d in row.items()))
+                       for u, row in nx.all_pairs_shortest_path_length(g))
+        bfs = BoundedBFS(neighbors)
+        multi_source = MultiSourceBFS(*csr_arrays(neighbors))
+        positions = list(range(len(nodes)))
+
+        for radii in ([1], [2], [1, 2], [2, 3]):
+            masses = MEMB._excluded_masses(multi_source, radii)
+            queues = dict((radius, MEMB._ExcludedMassQueue(list(mass)))
+                          for radius, mass in masses.items())
+            covered = [False] * len(nodes)
+            is_center = bytearray(len(nodes))
+
+            while not all(covered):
+                for radius, queue in queues.items():
+                    assert queue.masses == excluded_masses(
+                        lengths, positions, covered, radius)
+
+                radius = rnd.choice(radii)
+                center = queues[radius].pop_random_maximum(is_center, rnd)
+                largest = max(mass for node, mass
+                              in enumerate(queues[radius].masses)
+                              if not is_center[node])
+                assert queues[radius].masses[center] == largest
+                is_center[center] = 1
+
+                size = bfs.run(center, radius)
+                newly_covered = [node for node in bfs.queue[:size]
+                                 if not covered[node]]
+                for node in newly_covered:
+                    covered[node] = True
+                MEMB._cover(bfs, multi_source, queues, newly_covered, size)
+
+
+def test_boxes_are_within_the_radius():
+    for g in graphs():
+        lengths = dict(nx.all_pairs_shortest_path_length(g))
+        for rb in (1, 2, 3):
+            for cycle in (0, 2):
+                boxes = MEMB.MEMB(g, rb, cycle, random_state=random.Random(5))
+                assert sorted(node for box in boxes.values()
+                              for node in box.nodes()) == sorted(g.nodes())
+                for center, box in boxes.items():
+                    assert center in box
+                    radius = rb + 1 if cycle else rb
+                    assert all(lengths[center][node] <= radius
+                               for node in box.nodes())
+
+                labels = MEMB.MEMB(g, rb, cycle, subgraphs=False,
+                                   random_state=random.Random(5))
+                assert len(set(labels.tolist())) == len(boxes)
+
+
+def test_same_random_state_same_covering():
+    g = nx.barabasi_albert_graph(200, 2, seed=1)
+    first = MEMB.MEMB(g, 2, subgraphs=False, random_state=random.Random(6))
+    second = MEMB.MEMB(g, 2, subgraphs=False, random_state=random.Random(6))
+    assert first.tolist() == second.tolist()
+
+
+def test_sweep_matches_memb_per_radius():
+    radii = [1, 2, 3]
+    for g in graphs():
+        for cycle in (0, 2):
+            sweep = MEMB.memb_sweep(g, radii, cycle,
+                                    random_state=random.Random(7))
+            rnd = random.Random(7)
+            expected = [len(MEMB.MEMB(g, rb, cycle, random_state=rnd))
+                        for rb in radii]
+            assert sweep == expected
+
+            boxes = MEMB.memb_sweep(g, radii, cycle, subgraphs=True,
+                                    random_state=random.Random(7))
+            assert [len(b) for b in boxes] == expected
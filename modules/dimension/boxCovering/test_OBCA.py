@@ -0,0 +1,114 @@
+"""
+Checks OBCA against the original implementation over networkx, with the
+fix of its loops (they skipped the element after every removal), and that
+the distance matrix gives the same boxes whatever its dtype.
+
+    python -m pytest dimension/boxCovering/test_OBCA.py
+"""
+
+import operator
+
+import networkx as nx
+import numpy as np
+
+from . import covering, distanceMatrix
+from .OBCA import obca, obca_labels
+from .csrGraph import CSRGraph
+from .multiSourceBFS import distance_rows
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.les_miserables_graph(),
+        nx.barabasi_albert_graph(100, 2, seed=1),
+        nx.watts_strogatz_graph(100, 4, 0.1, seed=2)
+    ]
+
+
+def original_obca(g):
+    diameter = nx.diameter(g)
+    lb_max = diameter + 1
+
+    # Rank the nodes according to their degree
+    results = nx.degree_centrality(g)
+    nodes = next(zip(*sorted(results.items(), key=operator.itemgetter(1))))
+    results = dict()
+
+    results[1] = [[node] for node in g.nodes()]
+    for lb in range(2, lb_max):
+        covered_frequency = [0] * len(g.nodes())
+        boxes = list()
+
+        for i in range(0, len(nodes)):
+            node = nodes[i]
+
+            if covered_frequency[i] > 0:
+                continue
+
+            box = list(nx.single_source_shortest_path_length(g, node, lb-1).keys())
+
+            # Verify that all paths within the box have the length less then lb
+            index = 0
+            while index < len(box):
+                node = box[index]
+                box = box[:index+1] + [
+                    neighbor for neighbor in box[index+1:]
+                    if nx.shortest_path_length(g, node, neighbor) < lb]
+                index += 1
+
+            for node in box:
+                node_index = nodes.index(node)
+                covered_frequency[node_index] += 1
+
+            boxes.append(box)
+
+        kept = list()
+        for box in boxes:
+            redundant_box = True
+
+            for node in box:
+                node_index = nodes.index(node)
+                if covered_frequency[node_index] == 1:
+                    redundant_box = False
+                    break
+
+            if redundant_box:
+                for node in box:
+                    node_index = nodes.index(node)
+                    covered_frequency[node_index] -= 1
+            else:
+                kept.append(box)
+
+        results[lb] = kept
+
+    temp = list()
+    temp.append(list(g.nodes()))
+    results[lb_max] = temp
+
+    return results
+
+
+def test_same_boxes_as_original():
+    for g in graphs():
+        assert obca(g) == original_obca(g)
+
+
+def test_distances_of_any_dtype():
+    g = nx.barabasi_albert_graph(100, 2, seed=1)
+    # Disconnected
+    g.add_edge(100, 101)
+    graph = CSRGraph.from_networkx(g)
+    distances = distance_rows(graph.offsets, graph.targets)
+    diameter = distanceMatrix.diameter(distances)
+
+    for lb in range(1, diameter + 3):
+        expected = obca_labels(graph, lb).tolist()
+        assert obca_labels(graph, lb, distances).tolist() == expected
+        for dtype in (np.uint8, np.uint16):
+            narrow = np.where(distances == distances.max(),
+                              np.iinfo(dtype).max, distances).astype(dtype)
+            assert obca_labels(graph, lb, narrow).tolist() == expected
+            assert obca_labels(graph, lb, narrow, diameter).tolist() == expected
+
+        assert covering.cover(graph, "obca", lb=lb).tolist() == expected
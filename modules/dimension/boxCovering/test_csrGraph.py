@@ -0,0 +1,91 @@
+"""
+Checks that CSRGraph keeps the graphs it is built from (networkx graphs or
+edge arrays), that the induced subgraphs are the ones of networkx, and that
+every method of cover() puts in the same box only nodes less than lb apart.
+
+    python -m pytest dimension/boxCovering/test_csrGraph.py
+"""
+
+import networkx as nx
+import numpy as np
+
+from .covering import cover, methods
+from .csrGraph import CSRGraph
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.les_miserables_graph(),
+        nx.barabasi_albert_graph(100, 2, seed=1),
+        # Disconnected
+        nx.gnp_random_graph(100, 0.02, seed=2)
+    ]
+
+
+def edge_set(G):
+    return set(frozenset(edge) for edge in G.edges())
+
+
+def test_networkx_round_trip():
+    for g in graphs():
+        graph = CSRGraph.from_networkx(g)
+        assert list(graph.nodes) == list(g.nodes())
+        assert graph.number_of_nodes() == g.number_of_nodes()
+        assert graph.number_of_edges() == g.number_of_edges()
+        assert graph.degrees().tolist() == [g.degree(node) for node in g.nodes()]
+        for i, node in enumerate(graph.nodes):
+            assert ([graph.nodes[j] for j in graph.neighbors(i)] ==
+                    list(g.neighbors(node)))
+
+        h = graph.to_networkx()
+        assert list(h.nodes()) == list(g.nodes())
+        assert edge_set(h) == edge_set(g)
+
+
+def test_edges_drop_loops_and_repeated_edges():
+    for g in graphs():
+        index = dict((node, i) for i, node in enumerate(g.nodes()))
+        edges = [(index[u], index[v]) for u, v in g.edges()]
+        # Repeated in both directions, and self loops
+        edges = edges + [(v, u) for u, v in edges] + [(0, 0), (3, 3)]
+        sources, targets = zip(*edges)
+
+        graph = CSRGraph.from_edges(list(g.nodes()), sources, targets)
+        assert graph.number_of_edges() == g.number_of_edges()
+        assert edge_set(graph.to_networkx()) == edge_set(g)
+        for i in range(graph.number_of_nodes()):
+            neighbors = graph.neighbors(i).tolist()
+            assert neighbors == sorted(neighbors)
+
+    graph = CSRGraph.from_edges(range(5), [], [])
+    assert graph.number_of_edges() == 0
+    assert isinstance(graph.nodes, range)
+
+
+def test_subgraph():
+    rnd = np.random.RandomState(3)
+    for g in graphs():
+        graph = CSRGraph.from_networkx(g)
+        nodes = list(g.nodes())
+        for size in (1, len(nodes) // 3, len(nodes)):
+            kept = [nodes[i] for i in rnd.permutation(len(nodes))[:size]]
+            h = graph.subgraph(kept).to_networkx()
+            assert list(h.nodes()) == kept
+            assert edge_set(h) == edge_set(g.subgraph(kept))
+
+
+def test_cover_methods():
+    for g in graphs():
+        graph = CSRGraph.from_networkx(g)
+        lengths = dict(nx.all_pairs_shortest_path_length(g))
+        for method in methods:
+            for lb in (2, 3, 5):
+                labels = cover(graph, method, lb=lb)
+                assert len(labels) == graph.number_of_nodes()
+                assert (sorted(set(labels.tolist())) ==
+                        list(range(labels.max() + 1)))
+                for i, u in enumerate(graph.nodes):
+                    for j, v in enumerate(graph.nodes):
+                        if labels[i] == labels[j]:
+                            assert lengths[u].get(v, lb) < lb
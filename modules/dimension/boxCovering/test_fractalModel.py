@@ -0,0 +1,67 @@
+"""
+Checks the fractal model built a generation at a time against the original
+one, built link by link: with e = 0 or e = 1 (no coins) they are the same
+network, and otherwise they have the same number of nodes and edges.
+
+    python -m pytest dimension/boxCovering/test_fractalModel.py
+"""
+
+import random
+
+import networkx as nx
+import numpy as np
+
+from .fractalModel import fractal_model, fractal_model_csr
+
+
+def original_fractal_model(generation, m, x, e):
+    G = nx.Graph()
+    G.add_edge(0, 1)
+    node_index = 2
+    for n in range(1, generation+1):
+        all_links = list(G.edges())
+        while all_links:
+            link = all_links.pop()
+            new_nodes_a = range(node_index, node_index + m)
+            node_index += m
+            new_nodes_b = range(node_index, node_index + m)
+            node_index += m
+            G.add_edges_from([(link[0], node) for node in new_nodes_a])
+            G.add_edges_from([(link[1], node) for node in new_nodes_b])
+            repulsive_links = list(zip(new_nodes_a, new_nodes_b))
+            G.add_edges_from([repulsive_links.pop() for i in range(x-1)])
+            if random.random() > e:
+                G.remove_edge(*link)
+                G.add_edge(*repulsive_links.pop())
+    return G
+
+
+def test_same_network_without_coins():
+    for generation, m, x in ((1, 2, 2), (3, 2, 1), (2, 3, 2), (2, 3, 3),
+                             (3, 2, 0)):
+        for e in (0, 1):
+            g = fractal_model(generation, m, x, e, np.random.RandomState(1))
+            assert nx.is_isomorphic(g, original_fractal_model(generation, m,
+                                                              x, e))
+
+
+def test_same_size_with_coins():
+    random.seed(2)
+    for generation, m, x, e in ((4, 2, 2, 0.5), (3, 3, 1, 0.2)):
+        g = fractal_model(generation, m, x, e, np.random.RandomState(2))
+        original = original_fractal_model(generation, m, x, e)
+        assert g.number_of_nodes() == original.number_of_nodes()
+        assert g.number_of_edges() == original.number_of_edges()
+
+        graph = fractal_model_csr(generation, m, x, e, np.random.RandomState(2))
+        assert (set(frozenset(edge) for edge in graph.to_networkx().edges())
+                == set(frozenset(edge) for edge in g.edges()))
+
+
+def test_invalid_parameters():
+    for m, x in ((0, 0), (2, 3)):
+        try:
+            fractal_model(2, m, x, 0)
+            assert False
+        except ValueError:
+            pass
@@ -0,0 +1,73 @@
+"""
+Checks the Koch networks generated by subtrees against growing them a step
+at a time over the list of all the triangles, whether the subtrees are
+generated at once or split in chunks, and after writing them to disk.
+
+    python -m pytest dimension/boxCovering/test_kochNetwork.py
+"""
+
+import networkx as nx
+import numpy as np
+
+from . import kochNetwork
+from .networkReader import read_network
+
+
+def grown_koch_network(m, t):
+    g = nx.Graph([(0, 1), (1, 2), (0, 2)])
+    triangles = [(0, 1, 2)]
+    for step in range(t):
+        new_triangles = []
+        for triangle in triangles:
+            for vertex in triangle:
+                for i in range(m):
+                    first = g.number_of_nodes()
+                    second = first + 1
+                    g.add_edges_from([(vertex, first), (vertex, second),
+                                      (first, second)])
+                    new_triangles.append((vertex, first, second))
+        triangles.extend(new_triangles)
+
+    return g
+
+
+def edge_set(G):
+    return set(frozenset(edge) for edge in G.edges())
+
+
+def test_same_network_as_growing_it():
+    for m, t in ((1, 0), (1, 1), (1, 3), (2, 2), (3, 2)):
+        graph = kochNetwork.koch_network(m, t)
+        g = grown_koch_network(m, t)
+        assert graph.number_of_nodes() == kochNetwork.number_of_nodes(m, t)
+        assert graph.number_of_edges() == kochNetwork.number_of_edges(m, t)
+        assert graph.number_of_nodes() == g.number_of_nodes()
+        assert graph.number_of_edges() == g.number_of_edges()
+
+        h = graph.to_networkx()
+        assert nx.is_isomorphic(h, g)
+        assert nx.diameter(h) == 2 * t + 1
+
+
+def test_chunks_give_the_same_network(monkeypatch):
+    expected = kochNetwork.koch_network(2, 3).to_networkx()
+    monkeypatch.setattr(kochNetwork, "CHUNK_TRIANGLES", 7)
+    edges = np.concatenate(list(kochNetwork.koch_edges(2, 3)))
+    # The nodes of a subtree split in chunks are numbered in another order,
+    # with the same ids
+    assert (sorted(set(edges.ravel().tolist())) ==
+            list(range(kochNetwork.number_of_nodes(2, 3))))
+    assert nx.is_isomorphic(nx.Graph(edges.tolist()), expected)
+
+
+def test_written_networks(tmp_path):
+    expected = edge_set(kochNetwork.koch_network(1, 3).to_networkx())
+    for extension in ("npy", "dat"):
+        filename = str(tmp_path / "koch_network_m1_t3.{}".format(extension))
+        kochNetwork.write_koch_network(filename, 1, 3)
+
+        graph = read_network(filename)
+        assert graph.number_of_nodes() == kochNetwork.number_of_nodes(1, 3)
+        assert edge_set(graph.to_networkx()) == expected
+
+    assert np.load(str(tmp_path / "koch_network_m1_t3.npy")).dtype == np.int32
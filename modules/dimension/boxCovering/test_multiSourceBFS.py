@@ -0,0 +1,71 @@
+"""
+Checks the distances of the 64-source BFS against the shortest path lengths
+of networkx, with and without cutoff, for any number of sources.
+
+    python -m pytest dimension/boxCovering/test_multiSourceBFS.py
+"""
+
+import networkx as nx
+import numpy as np
+
+from .csrGraph import CSRGraph
+from .multiSourceBFS import (BLOCK_SIZE, UNREACHABLE, MultiSourceBFS,
+                             RowBlocks, distance_rows)
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.path_graph(70),
+        nx.barabasi_albert_graph(150, 2, seed=1),
+        # Disconnected, with isolated nodes
+        nx.gnp_random_graph(150, 0.012, seed=2)
+    ]
+
+
+def expected_rows(g, sources, cutoff=None):
+    nodes = list(g.nodes())
+    rows = np.empty((len(sources), len(nodes)), dtype=np.int32)
+    rows.fill(UNREACHABLE)
+    for k, source in enumerate(sources):
+        lengths = nx.single_source_shortest_path_length(g, nodes[source],
+                                                        cutoff)
+        for i, node in enumerate(nodes):
+            if node in lengths:
+                rows[k, i] = lengths[node]
+
+    return rows
+
+
+def test_distance_rows():
+    for g in graphs():
+        graph = CSRGraph.from_networkx(g)
+        n = graph.number_of_nodes()
+        for cutoff in (None, 1, 3):
+            assert (distance_rows(graph.offsets, graph.targets,
+                                  cutoff=cutoff) ==
+                    expected_rows(g, range(n), cutoff)).all()
+
+        sources = np.random.RandomState(3).permutation(n)[:BLOCK_SIZE + 7]
+        assert (distance_rows(graph.offsets, graph.targets, sources) ==
+                expected_rows(g, sources)).all()
+
+
+def test_single_blocks_and_row_blocks():
+    g = nx.barabasi_albert_graph(150, 2, seed=1)
+    graph = CSRGraph.from_networkx(g)
+    bfs = MultiSourceBFS(graph.offsets, graph.targets)
+
+    assert (bfs.run([5]) == expected_rows(g, [5])).all()
+    assert (bfs.run([7, 7, 2], 2) == expected_rows(g, [7, 7, 2], 2)).all()
+    try:
+        bfs.run(range(BLOCK_SIZE + 1))
+        assert False
+    except ValueError:
+        pass
+
+    order = np.random.RandomState(4).permutation(150)
+    expected = expected_rows(g, order, 2)
+    rows = RowBlocks(graph.offsets, graph.targets, order, 2)
+    for k, node in enumerate(order):
+        assert (rows(node) == expected[k]).all()
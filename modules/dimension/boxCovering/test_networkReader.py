@@ -0,0 +1,94 @@
+"""
+Checks that the readers give the nodes and edges networkx reads from the
+files of data/realNetworks (taken as simple undirected graphs) and from edge
+lists with comments, weights, self loops and repeated edges.
+
+    python -m pytest dimension/boxCovering/test_networkReader.py
+"""
+
+import glob
+import os
+
+import networkx as nx
+import numpy as np
+
+from . import networkReader
+from .networkReader import _label, read_edge_array, read_network
+
+REAL_NETWORKS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "..", "..", "data", "realNetworks")
+
+
+def simple(G):
+    G = nx.Graph(G.to_undirected() if G.is_directed() else G)
+    G.remove_edges_from(list(nx.selfloop_edges(G)))
+    return G
+
+
+def networkx_read(filename):
+    if filename.endswith(".gml"):
+        G = nx.read_gml(filename, label="id")
+    elif filename.endswith(".graphml"):
+        G = nx.relabel_nodes(nx.read_graphml(filename), _label)
+    else:
+        G = nx.read_edgelist(filename, nodetype=int, data=False)
+
+    return simple(G)
+
+
+def assert_same_graph(graph, G):
+    h = graph.to_networkx()
+    assert graph.number_of_nodes() == G.number_of_nodes()
+    assert graph.number_of_edges() == G.number_of_edges()
+    assert list(h.nodes()) == list(G.nodes())
+    assert (set(frozenset(edge) for edge in h.edges()) ==
+            set(frozenset(edge) for edge in G.edges()))
+
+
+def test_real_networks():
+    files = [filename for extension in ("gml", "graphml", "dat")
+             for filename in glob.glob(os.path.join(REAL_NETWORKS, "*",
+                                                    "*." + extension))]
+    assert files
+    for filename in files:
+        assert_same_graph(read_network(filename), networkx_read(filename))
+
+
+def test_small_blocks(monkeypatch):
+    monkeypatch.setattr(networkReader, "BLOCK_SIZE", 64)
+    for filename in (os.path.join(REAL_NETWORKS, "Dolphin social network",
+                                  "dolphins.gml"),
+                     os.path.join(REAL_NETWORKS, "Email network",
+                                  "email.dat")):
+        assert_same_graph(read_network(filename), networkx_read(filename))
+
+
+def test_edge_list_lines(tmp_path):
+    filename = str(tmp_path / "edges.dat")
+    with open(filename, "w") as file:
+        file.write("# comment\n"
+                   "5 7 0.5\n"
+                   "7 3\n"
+                   "\n"
+                   "% comment\n"
+                   "3 3\n"
+                   "3 5 1.0 x\n"
+                   "7 5\n")
+
+    graph = read_network(filename)
+    assert list(graph.nodes) == [5, 7, 3]
+    assert graph.number_of_edges() == 3
+    assert graph.name == "edges"
+
+
+def test_edge_array(tmp_path):
+    g = nx.barabasi_albert_graph(100, 2, seed=1)
+    filename = str(tmp_path / "ba.npy")
+    np.save(filename, np.array(list(g.edges()) + [(4, 4)], dtype=np.int32))
+
+    graph = read_edge_array(filename)
+    assert isinstance(graph.nodes, range)
+    G = nx.Graph()
+    G.add_nodes_from(range(100))
+    G.add_edges_from(g.edges())
+    assert_same_graph(graph, G)
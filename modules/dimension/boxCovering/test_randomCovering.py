@@ -0,0 +1,85 @@
+"""
+Checks the random covering against the original one, which removed the
+burned nodes from a copy of the graph: its boxes grow through the unburned
+nodes only, the labels are the boxes of the subgraphs, and the number of
+boxes has the same distribution.
+
+    python -m pytest dimension/boxCovering/test_randomCovering.py
+"""
+
+import random
+from copy import deepcopy
+
+import networkx as nx
+import numpy as np
+
+from .boundedBFS import index_graph
+from .randomCovering import random_box_covering
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.barabasi_albert_graph(150, 2, seed=1),
+        # Disconnected
+        nx.gnp_random_graph(150, 0.015, seed=3)
+    ]
+
+
+def original_random_box_covering(G, rb):
+    H = deepcopy(G)
+    unburned_nodes = list(G.nodes())
+    boxes = {}
+    adj = H.adj
+    while unburned_nodes:
+        center_node = random.choice(unburned_nodes)
+        nodes_visited = [center_node]
+        search_queue = [center_node]
+        d = 1
+        while search_queue and d <= rb:
+            next_depth = []
+            extend = next_depth.extend
+            for n in search_queue:
+                l = [i for i in iter(adj[n].keys()) if i not in nodes_visited]
+                extend(l)
+                nodes_visited.extend(l)
+            search_queue = next_depth
+            d += 1
+        H.remove_nodes_from(nodes_visited)
+        boxes[center_node] = set(nodes_visited)
+        unburned_nodes = list(set(unburned_nodes) - set(nodes_visited))
+    return boxes
+
+
+def test_boxes_grow_through_unburned_nodes():
+    for g in graphs():
+        for rb in (1, 2):
+            random.seed(4)
+            boxes = random_box_covering(g, rb)
+            random.seed(4)
+            labels = random_box_covering(g, rb, subgraphs=False)
+            nodes, neighbors = index_graph(g)
+            assert len(set(labels.tolist())) == len(boxes)
+
+            # The boxes, in the order they were burned
+            unburned = g.copy()
+            for box_id, (center, box) in enumerate(boxes.items()):
+                assert (set(nodes[i] for i in np.flatnonzero(labels == box_id))
+                        == set(box.nodes()))
+                lengths = nx.single_source_shortest_path_length(unburned,
+                                                                center, rb)
+                assert set(lengths) == set(box.nodes())
+                unburned.remove_nodes_from(box.nodes())
+
+            assert unburned.number_of_nodes() == 0
+
+
+def test_same_number_of_boxes_as_original():
+    g = nx.barabasi_albert_graph(150, 2, seed=1)
+    for rb in (1, 2):
+        random.seed(5)
+        new = [len(random_box_covering(g, rb)) for i in range(300)]
+        original = [len(original_random_box_covering(g, rb))
+                    for i in range(300)]
+        error = np.sqrt((np.var(new) + np.var(original)) / 300)
+        assert abs(np.mean(new) - np.mean(original)) < 4 * error
@@ -7,10 +7,12 @@ import os
 import time
 import math
 
-import pyximport
-pyximport.install()
+import networkit as nk
+import numpy as np
 
-from .boxCovering.cythonGreedyColoring import *
+from .boxCovering import distanceMatrix
+from .boxCovering.bitsetGreedyColoring import number_of_boxes
+from .boxCountStatistics import RunningBoxCounts
 
 
 def fractal_dimension(g, iterations=1000, debug=True):
@@ -26,6 +28,9 @@ def fractal_dimension(g, iterations=1000, debug=True):
     length, this method repeat the box covering several times (10.000 by
     default) and calculate the average value.
 
+    The distances between all the nodes are computed once (and cached until
+    the graph changes), so every iteration only draws a new node order.
+
     Parameters
     ------------
     g: A networkit graph
@@ -37,7 +42,8 @@ def fractal_dimension(g, iterations=1000, debug=True):
     -----------
     A float value representing the fractal dimension of the network.
     """
-    diameter = int(nk.distance.Diameter.exactDiameter(g))
+    distances = distanceMatrix.distance_matrix(g)
+    diameter = distanceMatrix.diameter(distances)
     num_nodes = g.numberOfNodes()
     results = np.empty((iterations, diameter+1), dtype=int)
 
@@ -45,7 +51,7 @@ def fractal_dimension(g, iterations=1000, debug=True):
 
     for i in range(iterations):
         if diameter > 0:
-            result = number_of_boxes(g)
+            result = number_of_boxes(g, diameter, distances)
         else:
             result = [num_nodes]
         results[i, :] = result[:]
@@ -55,12 +61,72 @@ def fractal_dimension(g, iterations=1000, debug=True):
         filename = g.getName() + "_covering_" + datetime + ".csv"
         np.savetxt(filename, results, fmt='%i')
 
-    boxes_length = np.arange(1, diameter+2)
-    mean_nodes_per_box = results.mean(axis=0)
+    return fit_dimension(results.mean(axis=0))
+
+
+def fractal_dimension_adaptive(g, tolerance=0.01, max_iterations=1000,
+                               min_iterations=20, batch_size=10,
+                               box_tolerance=None, z=1.96):
+    """
+    This method computes the fractal dimension like fractal_dimension, but
+    instead of running a fixed number of box coverings it stops as soon as
+    the confidence interval of the dimension is narrower than the tolerance
+    given, or when max_iterations coverings have been run.
+
+    Parameters
+    ------------
+    g: A networkit graph
+    tolerance: Maximum half-width of the confidence interval of the dimension
+    max_iterations: Maximum number of box coverings
+    min_iterations: Minimum number of box coverings before checking
+    batch_size: Number of coverings run between two checks
+    box_tolerance: If given, the half-width of the interval of every Nb(lb)
+                   must also be smaller than box_tolerance times its mean
+    z: Normal quantile of the confidence intervals, 1.96 for 95%
+
+    Returns
+    -----------
+    A tuple (dimension, standard error of the dimension, iterations used)
+    """
+    distances = distanceMatrix.distance_matrix(g)
+    diameter = distanceMatrix.diameter(distances)
+
+    if diameter <= 0:
+        return 0.0, 0.0, 0
+
+    statistics = RunningBoxCounts(diameter+1)
+
+    while statistics.count < max_iterations:
+        size = min(batch_size, max_iterations - statistics.count)
+        for i in range(size):
+            statistics.add(number_of_boxes(g, diameter, distances))
+
+        if (statistics.count >= min_iterations and
+                statistics.converged(tolerance, box_tolerance, z)):
+            break
+
+    return (fit_dimension(statistics.mean()),
+            statistics.dimension_standard_error(), statistics.count)
+
+
+def fit_dimension(mean_number_of_boxes, box_lengths=None):
+    """
+    Fit a line to log(Nb) vs log(Lb), where Lb takes the values 1, 2, ... and
+    Nb the values received, and return the absolute value of its slope.
+
+    Parameters
+    ------------
+    mean_number_of_boxes: The average number of boxes found for each box
+                          length, starting at Lb = 1
+    box_lengths: Optionally, the box length of each value, when they are not
+                 1, 2, ...
+    """
+    if box_lengths is None:
+        box_lengths = np.arange(1, len(mean_number_of_boxes)+1)
 
     # Fit a line and calculate the slope
-    log_box_length = np.log(boxes_length)
-    log_mean_number_of_nodes = np.log(mean_nodes_per_box)
+    log_box_length = np.log(box_lengths)
+    log_mean_number_of_nodes = np.log(mean_number_of_boxes)
 
     slope, intercept = np.polyfit(log_box_length, log_mean_number_of_nodes, 1)
 
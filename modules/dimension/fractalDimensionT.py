@@ -2,18 +2,84 @@
 # Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
 # Tested in python-3.4.3
 
+import os
 import time
 import math
-from itertools import repeat
 import multiprocessing as mp
 
-import pyximport
-pyximport.install()
+import networkit as nk
+import numpy as np
 
-from .boxCovering.cythonGreedyColoring import *
+from .boxCovering import distanceMatrix
+from .boxCovering.bitsetGreedyColoring import number_of_boxes
+from .boxCountStatistics import RunningBoxCounts
+from .fractalDimension import fit_dimension
 
+# Number of colorings computed by a worker on each task
+CHUNK_SIZE = 25
 
-def fractal_dimension(g, iterations=1000, debug=True):
+# Distance matrix and settings of the current worker process
+_worker = {}
+
+
+def _init_worker(shared_distances, diameter, seed, keep_results):
+    _worker["distances"] = distanceMatrix.load(*shared_distances)
+    _worker["diameter"] = diameter
+    _worker["seed"] = seed
+    _worker["keep_results"] = keep_results
+
+
+def _run_chunk(chunk):
+    """
+    Run the colorings of one chunk of iterations. Each chunk uses its own
+    random stream, seeded with (seed, chunk index), so the results do not
+    depend on the number of workers or on the order the chunks are run.
+    """
+    index, size = chunk
+    random_state = np.random.RandomState([_worker["seed"], index])
+    distances = _worker["distances"]
+    diameter = _worker["diameter"]
+
+    results = np.empty((size, diameter+1), dtype=int)
+
+    for i in range(size):
+        results[i, :] = number_of_boxes(None, diameter, distances, random_state)
+
+    statistics = RunningBoxCounts(diameter+1)
+    statistics.add(results)
+
+    return index, statistics, results if _worker["keep_results"] else None
+
+
+def _share(g):
+    """
+    Returns the distance matrix of g, its diameter and the arguments needed
+    by the workers to memory-map it. If a temporary copy of the matrix had to
+    be written, the last value is its file name, otherwise it is None.
+    """
+    distances = distanceMatrix.distance_matrix(g)
+    diameter = distanceMatrix.diameter(distances)
+
+    shared_file = distanceMatrix.cached_filename(g)
+    if shared_file is None:
+        shared_distances = distanceMatrix.dump(distances)
+        temporary_file = shared_distances[0]
+    else:
+        shared_distances = (shared_file, distances.dtype.str, distances.shape)
+        temporary_file = None
+
+    return diameter, shared_distances, temporary_file
+
+
+def chunks(iterations, chunk_size=CHUNK_SIZE):
+    """
+    Split a number of iterations in tasks of (chunk index, chunk size).
+    """
+    return [(index, min(chunk_size, iterations - start))
+            for index, start in enumerate(range(0, iterations, chunk_size))]
+
+
+def fractal_dimension(g, iterations=1000, debug=True, workers=None, seed=None):
     """
     This method computes the fractal dimension (D) of a network performing a box
     covering and analysing the relation between the minimum number of boxes (Nb)
@@ -26,50 +92,131 @@ def fractal_dimension(g, iterations=1000, debug=True):
     length, this method repeat the box covering several times (10.000 by
     default) and calculate the average value.
 
+    The colorings are split in chunks and run on a pool of processes. The
+    distance matrix of the graph is computed once and shared with the
+    workers through a memory-mapped file, and only the sum of the box counts
+    of each chunk is sent back, so the memory used does not grow with the
+    number of iterations.
+
     Parameters
     ------------
     g: A networkit graph
     iterations: The number of times that the box covering algorithm will be run
     debug: If this variable is set to True the results of each iteration are
             saved into a file called results.csv
+    workers: Number of processes. All the available cores are used by default
+    seed: Seed of the random streams. Two runs with the same seed return the
+          same value regardless of the number of workers
 
     Returns
     -----------
     A float value representing the fractal dimension of the network.
     """
-    diameter = int(nk.distance.Diameter.exactDiameter(g))
     num_nodes = g.numberOfNodes()
-    # results = np.empty((iterations, diameter+1), dtype=int)
+    results_file = None
+    temporary_file = None
 
-    if diameter < 0:
-        results = [[num_nodes] for i in range(iterations)]
-    else:
-        diameter = int(nk.distance.Diameter.exactDiameter(g))
-        graphs = [nk.nxadapter.nk2nx(g) for x in  range(iterations)]
+    try:
+        if debug:
+            datetime = time.strftime("%d-%m-%Y_%H%M%S")
+            filename = g.getName() + "_covering_" + datetime + ".csv"
+            results_file = open(filename, 'wb')
 
-        pool = mp.Pool()
-        results = pool.starmap(number_of_boxes, zip(graphs, repeat(diameter)))
+        diameter, shared_distances, temporary_file = _share(g)
 
-        pool.close()
-        pool.join()
+        if diameter <= 0:
+            mean_number_of_boxes = [num_nodes]
+
+            if debug:
+                np.savetxt(results_file, [[num_nodes]] * iterations, fmt='%i')
+        else:
+            if seed is None:
+                seed = np.random.randint(2**31)
+
+            statistics = RunningBoxCounts(diameter+1)
+
+            pool = mp.Pool(workers, initializer=_init_worker,
+                           initargs=(shared_distances, diameter, seed, debug))
+            try:
+                for index, chunk_statistics, results in pool.imap_unordered(
+                        _run_chunk, chunks(iterations)):
+                    statistics.merge(chunk_statistics)
+
+                    if debug:
+                        np.savetxt(results_file, results, fmt='%i')
+            finally:
+                # Every chunk is done unless a worker failed
+                pool.terminate()
+                pool.join()
+
+            mean_number_of_boxes = statistics.mean()
+    finally:
+        if temporary_file is not None:
+            os.remove(temporary_file)
 
-        results = np.asarray(results)
+        if results_file is not None:
+            results_file.close()
 
-    if debug:
-        datetime = time.strftime("%d-%m-%Y_%H%M%S")
-        filename = g.getName() + "_covering_" + datetime + ".csv"
-        np.savetxt(filename, results, fmt='%i')
+    return fit_dimension(mean_number_of_boxes)
 
-    boxes_length = np.arange(1, diameter+2)
-    mean_nodes_per_box = results.mean(axis=0)
 
-    # Fit a line and calculate the slope
-    log_box_length = np.log(boxes_length)
-    log_mean_number_of_nodes = np.log(mean_nodes_per_box)
+def fractal_dimension_adaptive(g, tolerance=0.01, max_iterations=1000,
+                               min_iterations=20, box_tolerance=None, z=1.96,
+                               workers=None, seed=None):
+    """
+    Parallel version of fractalDimension.fractal_dimension_adaptive. The
+    chunks of colorings are merged in index order and the convergence is
+    checked after each one, so the result for a given seed does not depend
+    on the number of workers. The chunks still running when the tolerance is
+    met are discarded.
+
+    Parameters
+    ------------
+    g: A networkit graph
+    tolerance: Maximum half-width of the confidence interval of the dimension
+    max_iterations: Maximum number of box coverings
+    min_iterations: Minimum number of box coverings before checking
+    box_tolerance: If given, the half-width of the interval of every Nb(lb)
+                   must also be smaller than box_tolerance times its mean
+    z: Normal quantile of the confidence intervals, 1.96 for 95%
+    workers: Number of processes. All the available cores are used by default
+    seed: Seed of the random streams
+
+    Returns
+    -----------
+    A tuple (dimension, standard error of the dimension, iterations used)
+    """
+    diameter, shared_distances, temporary_file = _share(g)
+
+    if diameter <= 0:
+        if temporary_file is not None:
+            os.remove(temporary_file)
+        return 0.0, 0.0, 0
+
+    if seed is None:
+        seed = np.random.randint(2**31)
+
+    statistics = RunningBoxCounts(diameter+1)
+
+    pool = mp.Pool(workers, initializer=_init_worker,
+                   initargs=(shared_distances, diameter, seed, False))
+    try:
+        for index, chunk_statistics, results in pool.imap(
+                _run_chunk, chunks(max_iterations)):
+            statistics.merge(chunk_statistics)
+
+            if (statistics.count >= min_iterations and
+                    statistics.converged(tolerance, box_tolerance, z)):
+                break
+    finally:
+        pool.terminate()
+        pool.join()
 
-    slope, intercept = np.polyfit(log_box_length, log_mean_number_of_nodes, 1)
+        if temporary_file is not None:
+            os.remove(temporary_file)
 
-    return math.fabs(slope)
+    return (fit_dimension(statistics.mean()),
+            statistics.dimension_standard_error(), statistics.count)
 
 
 def main(n=100, iterations=100):
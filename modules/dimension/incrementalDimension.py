@@ -0,0 +1,253 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+
+import copy
+
+import numpy as np
+
+from .boxCovering.bitsetGreedyColoring import color_columns
+from .fractalDimension import fit_dimension
+
+
+class IncrementalFractalDimension(object):
+    """
+    Keeps the fractal dimension of a graph up to date while its nodes are
+    removed one by one.
+
+    This class keeps alive the all-pairs distance matrix and a set of greedy
+    colorings (one per iteration), each one with the random order its nodes
+    were colored in. When a node v is removed:
+
+    - Only the sources s that had a shortest path through v (that is,
+      d(s, v) + d(v, t) == d(s, t) for some t) run a new BFS.
+    - The greedy coloring chooses the color of a node from the distances to
+      the nodes before it in the order and their colors. So the colors of
+      the nodes before v and before the second node of every pair whose
+      distance changed are the ones a greedy coloring of the new graph in
+      the same order would choose, and only the nodes after the first of
+      those positions are colored again.
+    - If the diameter grows, the new box lengths are colored in the same
+      orders, from the current distances.
+
+    The colorings kept are then greedy colorings of the current graph in
+    random orders, like the ones of fractal_dimension, and not an
+    approximation of them (see fresh_number_of_boxes to compare them).
+
+    It is not faster than fractal_dimension from scratch: the first position
+    colored again is on average about the middle of every order, so a
+    removal costs about as much as a new estimate, and finding the sources
+    to search again takes time quadratic in the size of the component. The
+    attack sweeps of dimensionPlots and dimensionPlotsOBCA keep calling
+    fractal_dimension after every removal.
+
+    The graph received can be a networkit or a networkx graph. It is only read
+    when the object is created, so removing a node from it does not change
+    this object: call remove_node for that.
+    """
+
+    def __init__(self, g, iterations=100, random_state=None):
+        """
+        Parameters
+        ------------
+        g: A networkit or networkx graph
+        iterations: The number of colorings averaged to get the dimension
+        random_state: A numpy RandomState. The global numpy generator is used
+                      when it is None
+        """
+        self.random = np.random if random_state is None else random_state
+        self.iterations = iterations
+
+        self.nodes = list(g.nodes())
+        self.index = dict((node, i) for i, node in enumerate(self.nodes))
+        n = len(self.nodes)
+
+        self.adjacency = [set() for i in range(n)]
+        for u, v in g.edges():
+            if u != v:
+                self.adjacency[self.index[u]].add(self.index[v])
+                self.adjacency[self.index[v]].add(self.index[u])
+
+        self.alive = np.ones(n, dtype=bool)
+        # Any distance equal to n means that the nodes are not connected
+        self.unreachable = n
+        self.distances = np.empty((n, n), dtype=np.int32)
+        for source in range(n):
+            self.distances[source, :] = self._bfs(source)
+
+        self.diameter = self._diameter()
+        self._color_all()
+
+    def _bfs(self, source):
+        row = np.empty(len(self.nodes), dtype=np.int32)
+        row.fill(self.unreachable)
+        row[source] = 0
+
+        frontier = [source]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for u in frontier:
+                for w in self.adjacency[u]:
+                    if row[w] == self.unreachable:
+                        row[w] = depth
+                        next_frontier.append(w)
+            frontier = next_frontier
+
+        return row
+
+    def _diameter(self):
+        finite = self.distances[self.distances < self.unreachable]
+        return int(finite.max()) if finite.size else 0
+
+    def _box_lengths(self):
+        return np.arange(2, self.diameter+1)
+
+    def _color_all(self):
+        """
+        Compute all the colorings from scratch for the current graph.
+        """
+        alive = np.flatnonzero(self.alive)
+        self.orders = [self.random.permutation(alive)
+                       for k in range(self.iterations)]
+        self.colors = np.zeros((self.iterations, len(self.nodes), 0),
+                               dtype=np.int32)
+        self.num_colors = np.ones((self.iterations, 0), dtype=int)
+        self._add_columns(np.arange(2, self.diameter+1))
+
+    def _add_columns(self, box_lengths):
+        """
+        Append to every coloring the columns of the given box lengths.
+        """
+        if len(box_lengths) == 0:
+            return
+
+        colors = np.zeros((self.iterations, len(self.nodes), len(box_lengths)),
+                          dtype=np.int32)
+        for k, order in enumerate(self.orders):
+            colors[k, order, :] = color_columns(
+                self.distances.__getitem__, order, box_lengths, self.random)
+
+        self.colors = np.concatenate((self.colors, colors), axis=2)
+        self.num_colors = np.concatenate(
+            (self.num_colors, colors.max(axis=1) + 1), axis=1)
+
+    def remove_node(self, node):
+        """
+        Remove a node (given by its identifier in the original graph) and
+        repair the distances and colorings it affected.
+        """
+        v = self.index[node]
+        component = np.flatnonzero(self.distances[v] < self.unreachable)
+        others = component[component != v]
+
+        # Sources with a shortest path going through v
+        dv = self.distances[v, others]
+        through = (dv[:, np.newaxis] + dv[np.newaxis, :] ==
+                   self.distances[np.ix_(others, others)])
+        np.fill_diagonal(through, False)
+        affected = others[through.any(axis=1)]
+
+        for u in self.adjacency[v]:
+            self.adjacency[u].discard(v)
+        self.adjacency[v] = set()
+        self.alive[v] = False
+        self.distances[v, :] = self.unreachable
+        self.distances[:, v] = self.unreachable
+
+        # Pairs of nodes whose distance changed
+        sources, targets = [], []
+        for s in affected:
+            row = self._bfs(s)
+            changed = np.flatnonzero(self.distances[s, :] != row)
+            sources.append(np.repeat(s, len(changed)))
+            targets.append(changed)
+            self.distances[s, :] = row
+            self.distances[:, s] = row
+        changed = (np.concatenate(sources + [np.empty(0, dtype=int)]),
+                   np.concatenate(targets + [np.empty(0, dtype=int)]))
+
+        diameter = self._diameter()
+        if diameter < self.diameter:
+            # Box lengths larger than the diameter cover the graph with 1 box
+            self.diameter = diameter
+            columns = max(diameter - 1, 0)
+            self.colors = self.colors[:, :, :columns]
+            self.num_colors = self.num_colors[:, :columns]
+
+        self._repair(v, changed)
+
+        if diameter > self.diameter:
+            new_box_lengths = np.arange(max(self.diameter+1, 2), diameter+1)
+            self.diameter = diameter
+            self._add_columns(new_box_lengths)
+
+    def _repair(self, v, changed):
+        """
+        Take the removed node v out of every order and color again the nodes
+        from the first position whose color may change: the one of v or the
+        later node of a pair whose distance changed.
+        """
+        box_lengths = self._box_lengths()
+        sources, targets = changed
+
+        for k, order in enumerate(self.orders):
+            position = np.empty(len(self.nodes), dtype=int)
+            position[order] = np.arange(len(order))
+
+            first = position[v]
+            if len(sources):
+                first = min(first, np.maximum(position[sources],
+                                              position[targets]).min())
+
+            order = np.delete(order, position[v])
+            self.orders[k] = order
+            if len(box_lengths) == 0 or first >= len(order):
+                continue
+
+            colors = color_columns(self.distances.__getitem__, order,
+                                   box_lengths, self.random,
+                                   self.colors[k, order[:first], :])
+            self.colors[k, order, :] = colors
+            self.num_colors[k, :] = colors.max(axis=0) + 1
+
+    def fresh_number_of_boxes(self, random_state=None):
+        """
+        Returns the number of boxes (see number_of_boxes) of as many colorings
+        computed from scratch for the current graph, without changing the ones
+        kept. Both are averages of greedy colorings in random orders, so they
+        differ only by the sampling error.
+        """
+        fresh = copy.copy(self)
+        fresh.random = np.random if random_state is None else random_state
+        fresh._color_all()
+
+        return fresh.number_of_boxes()
+
+    def number_of_boxes(self):
+        """
+        Returns the average number of boxes found for every box length
+        between 1 and diameter+1.
+        """
+        alive = np.flatnonzero(self.alive)
+        boxes = [float(len(alive))]
+
+        if self.diameter >= 2:
+            colors = np.sort(self.colors[:, alive, :], axis=1)
+            distinct = 1 + (np.diff(colors, axis=1) != 0).sum(axis=1)
+            boxes.extend(distinct.mean(axis=0))
+
+        if self.diameter >= 1:
+            boxes.append(1.0)
+
+        return np.asarray(boxes)
+
+    def dimension(self):
+        """
+        Returns the fractal dimension of the graph in its current state.
+        """
+        if self.diameter <= 0:
+            return 0.0
+
+        return fit_dimension(self.number_of_boxes())
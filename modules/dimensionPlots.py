@@ -37,6 +37,7 @@ import operator
 import networkx as nx
 import networkit as nk
 import pylab
+import graphStore
 import dimension.fractalDimension as fd
 
 
@@ -163,5 +164,5 @@ if __name__ == "__main__":
     else:
         recalculate = False
 
-    g = nk.readGraph(infile, nk.Format.GML)
+    g = graphStore.load_networkit(infile)
     plot_functions(g, outfile, recalculate)
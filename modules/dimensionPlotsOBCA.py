@@ -3,6 +3,7 @@ import random
 import operator
 import networkx as nx
 import pylab
+import graphStore
 import dimension.fractalDimension as fd
 
 
@@ -178,10 +179,6 @@ if __name__ == "__main__":
     else:
         recalculate = False
 
-    import networkit as nk
-
-    gk = nk.readGraph(infile, nk.Format.GML)
-    g = nk.nk2nx(gk)
-    # g = nx.read_gml(infile)
+    g = graphStore.load_networkx(infile)
 
     plot_functions(g, outfile, recalculate)
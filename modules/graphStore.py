@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Binary cache of the networks stored as GML, GraphML or edge list files.
+
+The first time a file is loaded it is parsed and its graph is written to the
+cache folder (see the [cache] section of networkAnalysis.conf) as a raw int32
+array with the CSR offsets followed by the targets (see csrGraph.py), next to
+a small JSON file with the source path, its modification time and size. The
+next loads memory-map that array instead of parsing the text again, as long
+as the source file has not changed.
+
+    g = graphStore.load_networkit(real_networks_folder + "CElegans/celegans.gml")
+
+The folders of apconfig (get_real_networks_full_path and the others) still
+point at the source files, which are the keys of the cache: the readers the
+entry points used (nx.read_gml, nk.readGraph) parse the path they receive,
+so no folder could make them read the cache. The entry points call the
+loaders of this module instead of those readers, with the same paths.
+
+The files are read by networkReader.py, which builds the CSR arrays without
+an intermediate graph. The CSRGraph keeps the node ids of the file; those
+that are not 0..n-1 are stored in the JSON file. load_networkit numbers the
+nodes 0..n-1 in the order of the file, like networkit does when it reads a
+GML file.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import networkit as nk
+import networkx as nx
+import numpy as np
+
+from config import apconfig
+from dimension.boxCovering.csrGraph import CSRGraph
+from dimension.boxCovering.networkReader import read_network
+
+
+def _network_name(filename):
+    return os.path.basename(filename).split(".", 1)[0]
+
+
+def cache_files(filename):
+    """
+    Returns the paths of the array and the description of a network in the
+    cache. They are named after the file and a hash of its absolute path, so
+    files with the same name in different folders do not collide.
+    """
+    source = os.path.abspath(filename)
+    key = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(apconfig.get_cache_folder_path(),
+                        "{}-{}".format(_network_name(filename), key))
+
+    return base + ".npy", base + ".json"
+
+
+def _source_stamp(filename):
+    status = os.stat(filename)
+    return {
+        "source": os.path.abspath(filename),
+        "mtime": status.st_mtime_ns,
+        "size": status.st_size
+    }
+
+
+def write_atomically(path, write):
+    """
+    Writes a file through a temporary one in the same folder, which is then
+    renamed, so a reader never sees it half written.
+    """
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path),
+                                         suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            write(file)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def store(filename, graph):
+    """
+    Writes a CSRGraph to the cache as the graph of a file.
+    """
+    array_file, description_file = cache_files(filename)
+    os.makedirs(os.path.dirname(array_file), exist_ok=True)
+
+    description = _source_stamp(filename)
+    description["name"] = graph.name
+    description["num_nodes"] = graph.number_of_nodes()
+    if list(graph.nodes) != list(range(graph.number_of_nodes())):
+        description["nodes"] = list(graph.nodes)
+
+    data = np.concatenate((graph.offsets, graph.targets))
+    write_atomically(array_file, lambda file: np.save(file, data))
+    # The description goes last: without it the array is not used
+    write_atomically(description_file, lambda file: file.write(
+        json.dumps(description).encode("utf-8")))
+
+
+def cached(filename):
+    """
+    Returns the CSRGraph of a file memory-mapped from the cache, or None if
+    it is not in the cache or the file has changed since it was stored.
+    """
+    array_file, description_file = cache_files(filename)
+    if not (os.path.exists(array_file) and os.path.exists(description_file)):
+        return None
+
+    with open(description_file) as file:
+        description = json.load(file)
+    stamp = _source_stamp(filename)
+    if any(description[key] != value for key, value in stamp.items()):
+        return None
+
+    n = description["num_nodes"]
+    data = np.load(array_file, mmap_mode="r")
+    # The ids 0..n-1 stay implicit, instead of a tuple of n ints per load
+    nodes = description.get("nodes", range(n))
+
+    return CSRGraph(nodes, data[:n+1], data[n+1:], description["name"])
+
+
+def load(filename):
+    """
+    Returns the CSRGraph of a network file, parsing it only if it is not in
+    the cache (or the cache is disabled in the configuration).
+    """
+    if not apconfig.cache_enabled():
+        return read_network(filename)
+
+    graph = cached(filename)
+    if graph is None:
+        graph = read_network(filename)
+        store(filename, graph)
+
+    return graph
+
+
+def networkit_graph(graph, name=""):
+    """
+    Returns an undirected networkit graph with the edges of a CSRGraph, whose
+    nodes are numbered by position.
+    """
+    sources = np.repeat(np.arange(graph.number_of_nodes()), graph.degrees())
+
+    g = nk.Graph(graph.number_of_nodes())
+    for u, v in zip(sources.tolist(), graph.targets.tolist()):
+        if u < v:
+            g.addEdge(u, v)
+    g.setName(name)
+
+    return g
+
+
+def load_networkit(filename):
+    """
+    Returns an undirected networkit graph, named after the file.
+    """
+    return networkit_graph(load(filename), _network_name(filename))
+
+
+def load_networkx(filename):
+    """
+    Returns an undirected networkx graph, named after the file.
+    """
+    g = load(filename).to_networkx()
+    g.name = _network_name(filename)
+
+    return g
@@ -6,43 +6,318 @@ Created on Sat May 23 16:57:25 2015
 
 Module to test an algorithm with random networks.
 
+The networks of a parameter grid (see corpus_grid) are generated on a pool of
+processes and written to the random networks folder (see networkAnalysis.conf)
+as .npy arrays with one row per edge, which networkReader.read_network reads.
+Every network has its own seed, derived from the seed of the corpus and its
+name, so the result does not depend on the number of processes or the order
+of the jobs. A manifest (manifest.json in the same folder) keeps the
+parameters of the networks written, and a new run skips them.
+
+Up to SPARSE_THRESHOLD nodes the networkx generators are used. The larger
+networks are generated with numpy in time proportional to the number of
+edges (Batagelj and Brandes, Efficient generation of large random networks).
+
+    python randomNetworksGenerator.py
 """
 
+import hashlib
+import json
+import os
+import sys
+import time
+import multiprocessing as mp
+
 import networkx as nx
-from random import seed, randint
+import numpy as np
+
+import graphStore
+from config import apconfig
+
+# Number of nodes from which the sparse generators are used
+SPARSE_THRESHOLD = 10 ** 4
+
+
+def _pair_edges(indices):
+    """
+    Returns the edges (v, w), w < v, numbered 0, 1, ... in the order (1, 0),
+    (2, 0), (2, 1), (3, 0), ...
+    """
+    v = ((1 + np.sqrt(1 + 8 * indices.astype(np.float64))) // 2).astype(np.int64)
+    # Fix the rounding errors of the square root
+    v -= v * (v - 1) // 2 > indices
+    v += (v + 1) * v // 2 <= indices
+    return v, indices - v * (v - 1) // 2
+
+
+def erdos_renyi_edges(n, p, random_state):
+    """
+    Returns the arrays (sources, targets) of a G(n, p) graph. The gaps between
+    the pairs of nodes joined are geometric, so they are drawn in blocks
+    instead of flipping a coin per pair.
+    """
+    pairs = n * (n - 1) // 2
+    if p <= 0 or pairs == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    indices = []
+    last = -1
+    block = int(pairs * p * 1.05) + 100
+    while last < pairs:
+        gaps = random_state.geometric(p, block)
+        chosen = last + np.cumsum(gaps)
+        last = chosen[-1]
+        indices.append(chosen[chosen < pairs])
+
+    return _pair_edges(np.concatenate(indices))
+
+
+def barabasi_albert_edges(n, m, random_state):
+    """
+    Returns the arrays (sources, targets) of a preferential attachment graph
+    that starts, like networkx, with the node m linked to the nodes 0..m-1,
+    and where every next node adds m edges. The two ends of every edge are
+    kept in a list, and a new node is linked to the node at a random position
+    of the list before its own edges, which picks the nodes with probability
+    proportional to their degree. The positions are drawn at once and
+    resolved by following the chains of positions of the second ends.
+    The repeated edges are kept, and dropped by the readers.
+    """
+    edges = np.arange(max(n - m, 0) * m, dtype=np.int64)
+    sources = m + edges // m
+    # Position of the list copied by the second end of every edge
+    positions = (random_state.random_sample(len(edges)) *
+                 2 * m * (edges // m)).astype(np.int64)
+
+    targets = positions
+    pending = np.flatnonzero((targets % 2 == 1) & (targets // 2 >= m))
+    while len(pending):
+        # The odd positions hold the second end of an earlier edge
+        targets[pending] = positions[targets[pending] // 2]
+        pending = pending[(targets[pending] % 2 == 1) & (targets[pending] // 2 >= m)]
+
+    # The even positions hold the first end of their edge, and the second
+    # end of the edge i < m is the node i
+    targets = np.where(targets % 2 == 0, sources[targets // 2], targets // 2)
+    targets[:m] = edges[:m]
+
+    return sources, targets
+
+
+def watts_strogatz_edges(n, k, p, random_state):
+    """
+    Returns the arrays (sources, targets) of a Watts-Strogatz graph: a ring
+    where every node is linked to its k // 2 nearest neighbors on each side,
+    and then every edge is rewired with probability p to a random node. The
+    rewired edges that end in a loop or repeat another edge are drawn again.
+    """
+    sources = np.repeat(np.arange(n, dtype=np.int64), k // 2)
+    targets = (sources + np.tile(np.arange(1, k // 2 + 1), n)) % n
+
+    is_rewired = random_state.random_sample(len(sources)) < p
+    rewired = np.flatnonzero(is_rewired)
+    while len(rewired):
+        targets[rewired] = random_state.randint(0, n, len(rewired))
+
+        keys = np.minimum(sources, targets) * n + np.maximum(sources, targets)
+        # Equal edges together, the ones of the ring first
+        order = np.lexsort((is_rewired, keys))
+        repeated = order[1:][keys[order][1:] == keys[order][:-1]]
+        loops = rewired[sources[rewired] == targets[rewired]]
+        rewired = np.union1d(repeated, loops)
+
+    return sources, targets
+
+
+def _networkx_edges(graph):
+    edges = np.array(list(graph.edges()), dtype=np.int64).reshape(-1, 2)
+    return edges[:, 0], edges[:, 1]
+
+
+def erdos_renyi(n, p, random_state):
+    if n < SPARSE_THRESHOLD:
+        return _networkx_edges(nx.fast_gnp_random_graph(
+            n, p, random_state.randint(2 ** 31)))
+
+    return erdos_renyi_edges(n, p, random_state)
+
+
+def barabasi_albert(n, m, random_state):
+    if n < SPARSE_THRESHOLD:
+        return _networkx_edges(nx.barabasi_albert_graph(
+            n, m, random_state.randint(2 ** 31)))
+
+    return barabasi_albert_edges(n, m, random_state)
 
-directory = "../data/randomNetworks/"
 
+def watts_strogatz(n, k, p, random_state):
+    if n < SPARSE_THRESHOLD:
+        return _networkx_edges(nx.watts_strogatz_graph(
+            n, k, p, random_state.randint(2 ** 31)))
 
-def randomNum():
-    return randint(1, 10000)
+    return watts_strogatz_edges(n, k, p, random_state)
 
 
-def generateRandomNetworks(randomSeed=622527):
-    seed(randomSeed)
-    # Network size will be 10^1, 10 ^2, 10^3, 10^4
-    for exponent in range(1, 4): # 1 .. 4
-        n = 10 ** exponent
+models = {
+    "erdos_renyi": erdos_renyi,
+    "barabasi_albert": barabasi_albert,
+    "watts_strogatz": watts_strogatz
+}
 
-        for p in [0.1, 0.3, 0.5, 0.7, 0.9]:
+
+def _probability_name(p):
+    """
+    Returns p as it is written in the names of the networks of the data
+    folder, without the point (0.1 -> "01").
+    """
+    return str(p).replace(".", "")
+
+
+def corpus_grid(sizes=(10, 100, 1000), probabilities=(0.1, 0.3, 0.5, 0.7, 0.9),
+                fractions=(0.1, 0.3, 0.5, 0.7, 0.9)):
+    """
+    Returns the list of networks (name, model, parameters) of the corpus: for
+    every size n and probability p, an Erdos-Renyi network, a Barabasi-Albert
+    network with m = round(n * p), and the Watts-Strogatz networks with
+    k = round(n * fraction) for every fraction. The names are the ones of the
+    networks of the data folder (erdos_renyi_n100_p01, ...).
+    """
+    grid = []
+    for n in sizes:
+        for p in probabilities:
             m = round(n * p)
+            grid.append(("erdos_renyi_n{}_p{}".format(n, _probability_name(p)),
+                         "erdos_renyi", {"n": n, "p": p}))
+            grid.append(("barabasi_albert_n{}_m{}".format(n, m),
+                         "barabasi_albert", {"n": n, "m": m}))
+
+            for fraction in fractions:
+                k = round(n * fraction)
+                name = "watts_strogatz_n{}_k{}_p{}".format(
+                    n, k, _probability_name(p))
+                grid.append((name, "watts_strogatz", {"n": n, "k": k, "p": p}))
+
+    return grid
+
+
+def network_seed(corpus_seed, name):
+    """
+    Returns the seed of a network, derived from the seed of the corpus and
+    the name of the network.
+    """
+    key = "{}/{}".format(corpus_seed, name).encode("utf-8")
+    return int(hashlib.sha1(key).hexdigest()[:8], 16)
+
+
+def _expected_edges(network):
+    name, model, parameters = network
+    n = parameters["n"]
+    if model == "erdos_renyi":
+        return parameters["p"] * n * (n - 1) / 2
+    if model == "barabasi_albert":
+        return n * parameters["m"]
+
+    return n * parameters["k"] / 2
+
+
+def network_file(folder, name):
+    return os.path.join(folder, name + ".npy")
+
+
+def generate_network(job):
+    """
+    Generates a network and writes its edges. When the last node is isolated
+    a loop is added on it, so the number of nodes read back is still n (the
+    loops are dropped by the readers).
+
+    Returns
+    -----------
+    A tuple (name, description of the network for the manifest)
+    """
+    (name, model, parameters), seed, folder = job
+    start = time.time()
+    random_state = np.random.RandomState(seed)
+    sources, targets = models[model](random_state=random_state, **parameters)
+
+    n = parameters["n"]
+    edges = np.column_stack((sources, targets))
+    if n and (not len(edges) or edges.max() < n - 1):
+        edges = np.concatenate((edges, [[n - 1, n - 1]]))
+
+    dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+    graphStore.write_atomically(network_file(folder, name),
+                                lambda file: np.save(file, edges.astype(dtype)))
+
+    description = dict(parameters)
+    description.update({
+        "model": model,
+        "seed": seed,
+        "file": name + ".npy",
+        "seconds": time.time() - start
+    })
+
+    return name, description
+
+
+def manifest_file(folder):
+    return os.path.join(folder, "manifest.json")
+
+
+def read_manifest(folder):
+    if not os.path.exists(manifest_file(folder)):
+        return {}
+
+    with open(manifest_file(folder)) as file:
+        return json.load(file)
+
+
+def generate_random_networks(grid=None, corpus_seed=622527, folder=None,
+                             workers=None):
+    """
+    Generates the networks of a grid that are not in the manifest yet, the
+    largest ones first.
+
+    Parameters
+    -----------
+    grid: List of networks (name, model, parameters). corpus_grid() by default
+    corpus_seed: The seed every network seed is derived from
+    folder: Where the networks are written. The random networks folder of the
+            configuration by default
+    workers: Number of processes. All the available cores are used by default
+    """
+    if grid is None:
+        grid = corpus_grid()
+    if folder is None:
+        folder = apconfig.get_random_networks_full_path()
+    os.makedirs(folder, exist_ok=True)
+
+    manifest = read_manifest(folder)
+    pending = [network for network in grid if network[0] not in manifest]
+    pending.sort(key=_expected_edges, reverse=True)
+    jobs = [(network, network_seed(corpus_seed, network[0]), folder)
+            for network in pending]
+
+    pool = mp.Pool(workers)
+    try:
+        for name, description in pool.imap_unordered(generate_network, jobs):
+            manifest[name] = description
+            graphStore.write_atomically(manifest_file(folder), lambda file: file.write(
+                json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8")))
+            print("Generated:", name, "{:.1f}s".format(description["seconds"]))
+    finally:
+        pool.terminate()
+        pool.join()
 
-            # Generate erdos Renyi networks
-            graph = nx.erdos_renyi_graph(n, p, randomNum())
-            graphName = "erdos_renyi_n{}_p{}.graph6".format(n, p)
-            nx.write_graph6(graph, directory + graphName)
+    return manifest
 
-            # Generate Barabasi Albert networks
-            graph = nx.barabasi_albert_graph(n, m, randomNum())
-            graphName = "barabasi_albert_n{}_m{}.graph6".format(n, m)
-            nx.write_graph6(graph, directory + graphName)
 
-            for k in [0.1, 0.3, 0.5, 0.7, 0.9]:
-                k = round(n * k)
-                # Generate Watts Strogatz networks
-                graph = nx.watts_strogatz_graph(n, k, p, randomNum())
-                graphName = "watts_strogatz_n{}_k{}_p{}.graph6".format(n, k, p)
-                nx.write_graph6(graph, directory + graphName)
+def main(args):
+    """
+    args: Optionally, the sizes of the networks to generate
+    """
+    sizes = [int(n) for n in args] or [10, 100, 1000]
+    generate_random_networks(corpus_grid(sizes))
 
 
-generateRandomNetworks()
\ No newline at end of file
+if __name__ == "__main__":
+    main(sys.argv[1:])
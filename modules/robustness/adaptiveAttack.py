@@ -0,0 +1,275 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Removal orders of adaptive (recalculated) attacks.
+
+In an adaptive attack the node removed at each step is the one with the
+highest centrality in the graph left by the previous removals. Computing
+that order by running the centrality again after each removal is what makes
+the simultaneous analyses of robustness.py and robustness2.py slow. The
+methods in this module return the same order directly, so the curves can be
+computed like the ones of a fixed ranking.
+
+Ties are broken as in the full recalculation: among the nodes with the same
+value the first one in g.nodes() is removed first (sorted() is stable and the
+networkit rankings list tied nodes by id).
+"""
+
+import heapq
+import math
+import random
+
+
+def _index_graph(g):
+    nodes = list(g.nodes())
+    index = dict((node, i) for i, node in enumerate(nodes))
+
+    neighbors = [set() for i in range(len(nodes))]
+    for u, v in g.edges():
+        if u != v:
+            neighbors[index[u]].add(index[v])
+            neighbors[index[v]].add(index[u])
+
+    return nodes, neighbors
+
+
+def adaptive_degree_order(g, count=None):
+    """
+    Returns the nodes of g in the order removed by an adaptive degree attack:
+    each node removed has the highest degree in the graph left by the
+    previous removals.
+
+    The degrees are kept in a lazy max-heap: when a node is removed only its
+    neighbors change their degree, so a new entry is pushed for each of them
+    and the old entries are discarded when they reach the top. The whole
+    order takes O((n + m) log n).
+
+    Parameters
+    -----------
+    g: A networkit or networkx graph. It is not modified
+    count: Number of nodes to return. All of them by default
+
+    Returns
+    -----------
+    A list of nodes
+    """
+    nodes, neighbors = _index_graph(g)
+    n = len(nodes)
+    if count is None:
+        count = n
+
+    degree = [len(adjacent) for adjacent in neighbors]
+    removed = [False] * n
+
+    # Entries (-degree, position): the largest degree, then the first node
+    heap = [(-degree[u], u) for u in range(n)]
+    heapq.heapify(heap)
+
+    order = []
+    while len(order) < count and heap:
+        d, u = heapq.heappop(heap)
+        if removed[u] or -d != degree[u]:
+            # Stale entry
+            continue
+
+        removed[u] = True
+        order.append(nodes[u])
+
+        for w in neighbors[u]:
+            neighbors[w].discard(u)
+            degree[w] -= 1
+            heapq.heappush(heap, (-degree[w], w))
+
+    return order
+
+
+def betweenness_samples(num_nodes, epsilon=0.05, delta=0.1):
+    """
+    Number of pivots needed so that, with probability at least 1 - delta,
+    every betweenness estimated by sampling is within epsilon of the exact
+    one (both normalized to [0, 1]). It follows from the Hoeffding bound and
+    the union bound over the nodes: k = ln(2n / delta) / (2 epsilon^2).
+    """
+    return int(math.ceil(math.log(2.0 * num_nodes / delta) / (2 * epsilon ** 2)))
+
+
+def betweenness_error(num_nodes, samples, delta=0.1):
+    """
+    Error bound epsilon guaranteed by a number of pivots with probability at
+    least 1 - delta. The inverse of betweenness_samples.
+    """
+    return math.sqrt(math.log(2.0 * num_nodes / delta) / (2 * samples))
+
+
+def betweenness_accuracy(num_nodes, samples, delta=0.1):
+    """
+    Description of how the adaptive betweenness is computed, written with the
+    results so the runs can be compared: "exact", or the number of pivots and
+    the error bound they guarantee.
+    """
+    if samples is None:
+        return "exact"
+
+    return "samples={} epsilon={:.4f} delta={}".format(
+        samples, betweenness_error(num_nodes, samples, delta), delta)
+
+
+def _dependencies(neighbors, source, scores, scale):
+    """
+    Adds to scores the dependencies of source on the nodes of its component
+    (one step of the Brandes algorithm), multiplied by scale.
+    """
+    sigma = {source: 1.0}
+    distance = {source: 0}
+    predecessors = {source: []}
+    stack = []
+
+    queue = [source]
+    head = 0
+    while head < len(queue):
+        v = queue[head]
+        head += 1
+        stack.append(v)
+        for w in neighbors[v]:
+            if w not in distance:
+                distance[w] = distance[v] + 1
+                sigma[w] = 0.0
+                predecessors[w] = []
+                queue.append(w)
+            if distance[w] == distance[v] + 1:
+                sigma[w] += sigma[v]
+                predecessors[w].append(v)
+
+    delta = dict.fromkeys(stack, 0.0)
+    while stack:
+        w = stack.pop()
+        coefficient = (1 + delta[w]) / sigma[w]
+        for v in predecessors[w]:
+            delta[v] += sigma[v] * coefficient
+        if w != source:
+            scores[w] += delta[w] * scale
+
+
+def _component(neighbors, source):
+    seen = set([source])
+    queue = [source]
+    for v in queue:
+        for w in neighbors[v]:
+            if w not in seen:
+                seen.add(w)
+                queue.append(w)
+    return sorted(queue)
+
+
+def adaptive_betweenness_order(g, count=None, samples=None, random_state=None):
+    """
+    Returns the nodes of g in the order removed by an adaptive betweenness
+    attack: each node removed has the highest betweenness in the graph left
+    by the previous removals.
+
+    The betweenness of a node only depends on the shortest paths inside its
+    component, so after each removal only the component that contained the
+    removed node (now possibly split in several) is computed again; the
+    scores of the other components are kept. As the attack breaks the graph
+    in small components this is much cheaper than running Brandes on the
+    whole graph after every removal.
+
+    If samples is given, the betweenness of a component larger than samples
+    is estimated from that number of random pivots, scaled by the size of the
+    component (see betweenness_samples and betweenness_error for the error
+    bound). Smaller components are always computed exactly.
+
+    Parameters
+    -----------
+    g: A networkit or networkx graph. It is not modified
+    count: Number of nodes to return. All of them by default
+    samples: Number of pivots per component, or None for exact betweenness
+    random_state: A random.Random instance used to choose the pivots
+
+    Returns
+    -----------
+    A list of nodes
+    """
+    if random_state is None:
+        random_state = random.Random()
+
+    nodes = list(g.nodes())
+    index = dict((node, i) for i, node in enumerate(nodes))
+    n = len(nodes)
+    if count is None:
+        count = n
+
+    # Ordered dictionaries keep the neighbors in the order of the graph, so
+    # the sums are done in the same order as in a full recalculation
+    neighbors = [dict() for i in range(n)]
+    for node in nodes:
+        u = index[node]
+        for neighbor in g.neighbors(node):
+            if neighbor != node:
+                neighbors[u][index[neighbor]] = None
+
+    scores = [0.0] * n
+    removed = [False] * n
+
+    # Lazy max-heap of (-score, position, version). An entry is stale when
+    # the score of its node has been computed again after it was pushed
+    heap = []
+    version = [0] * n
+
+    def update(component):
+        for u in component:
+            scores[u] = 0.0
+
+        if samples is None or len(component) <= samples:
+            pivots, scale = component, 1.0
+        else:
+            pivots = sorted(random_state.sample(component, samples))
+            scale = len(component) / samples
+
+        for s in pivots:
+            _dependencies(neighbors, s, scores, scale)
+
+        for u in component:
+            version[u] += 1
+            heapq.heappush(heap, (-scores[u], u, version[u]))
+
+    done = [False] * n
+    for u in range(n):
+        if not done[u]:
+            component = _component(neighbors, u)
+            for w in component:
+                done[w] = True
+            update(component)
+
+    order = []
+    while len(order) < count and heap:
+        score, u, pushed = heapq.heappop(heap)
+        if removed[u] or pushed != version[u]:
+            # Stale entry
+            continue
+
+        removed[u] = True
+        order.append(nodes[u])
+
+        adjacent = list(neighbors[u])
+        for w in adjacent:
+            del neighbors[w][u]
+        neighbors[u] = dict()
+
+        done = set()
+        for w in adjacent:
+            if w not in done:
+                component = _component(neighbors, w)
+                done.update(component)
+                update(component)
+
+    return order
+
+
+# Strategies whose adaptive order can be computed without recalculating the
+# centrality of every node after each removal
+adaptive_orders = {
+    "Degree": adaptive_degree_order,
+    "Betweenness": adaptive_betweenness_order
+}
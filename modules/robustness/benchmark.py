@@ -0,0 +1,309 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Benchmark of the robustness analyses on networks of growing size.
+
+Every strategy is run with a fixed removal order and recalculating it after
+each removal (adaptive) through robustness.calculate (for both comparative
+measures), robustness2.robustness_analysis and
+robustness2.robustness_analysis_apl. The networks are files of the data
+folder and Barabasi-Albert networks generated with a fixed seed (see
+randomNetworksGenerator.py), measured from the smallest to the largest.
+
+Every analysis runs in a new process with a time limit. The total time, the
+time per removal step and the robustness index R are written to a JSON file.
+When an analysis does not finish in time on a network it is not run on the
+larger ones.
+
+The results can be compared with the ones of an earlier run (the baseline):
+a different R, an analysis that fails or does not finish, or a time above the
+baseline by more than the tolerance, is a regression (from the modules
+folder):
+
+    python -m robustness.benchmark results.json "realNetworks/*/*.gml" --synthetic 1000,100000
+    python -m robustness.benchmark new.json "realNetworks/*/*.gml" --baseline results.json
+"""
+
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+import multiprocessing as mp
+
+import networkx as nx
+import numpy as np
+
+import graphStore
+import randomNetworksGenerator
+from config import apconfig
+from dimension.boxCovering.csrGraph import CSRGraph
+from . import robustness, robustness2
+
+# Relative increase of the time over the baseline allowed
+TOLERANCE = 0.25
+
+# Absolute increase of the time allowed on top of the tolerance (seconds)
+SLACK = 0.1
+
+# Seconds given to every analysis on every network
+MAX_SECONDS = 600
+
+# Seed of the random generators of every analysis
+SEED = 622527
+
+# Edges added by every node of the synthetic networks
+SYNTHETIC_M = 3
+
+# Names of the synthetic networks (see networks)
+SYNTHETIC_NAME = re.compile(r"^barabasi_albert_n(\d+)_m(\d+)$")
+
+classifiers = {
+    "Degree": nx.degree_centrality,
+    "Betweenness": nx.betweenness_centrality,
+    "Closeness": nx.closeness_centrality,
+    "Random": robustness2.random_ranking
+}
+
+
+def _networkit(graph, name):
+    return graphStore.networkit_graph(graph, name)
+
+
+def _networkx(graph, name):
+    return graph.to_networkx()
+
+
+def _calculate(measure, strategy, adaptive):
+    def run(g):
+        return robustness.calculate(g, strategy, measure, not adaptive)[2]
+
+    return _networkit, run
+
+
+def _robustness2(analysis, strategy, adaptive):
+    def run(g):
+        return analysis(g, classifiers[strategy], adaptive)[2]
+
+    return _networkx, run
+
+
+def analyses():
+    """
+    Returns a dictionary {name: (build, run)} with every analysis measured,
+    where build(CSRGraph, name) returns the graph the analysis receives and
+    run(graph) returns R.
+    """
+    cases = {}
+    for adaptive in (False, True):
+        mode = "adaptive" if adaptive else "sequential"
+
+        for measure in sorted(robustness.comparative_measures):
+            for strategy in sorted(robustness.centrality):
+                name = "calculate/{}/{}/{}".format(measure, strategy, mode)
+                cases[name] = _calculate(measure, strategy, adaptive)
+
+        for analysis in (robustness2.robustness_analysis,
+                         robustness2.robustness_analysis_apl):
+            for strategy in sorted(classifiers):
+                name = "{}/{}/{}".format(analysis.__name__, strategy, mode)
+                cases[name] = _robustness2(analysis, strategy, adaptive)
+
+    return cases
+
+
+def networks(patterns, synthetic_sizes=()):
+    """
+    Returns the networks matching some glob patterns, relative to the data
+    folder or absolute, and the Barabasi-Albert networks of the sizes given,
+    as a list of names sorted by number of nodes. The files of the relative
+    patterns are named by their path in the data folder, and the ones of the
+    absolute patterns by their absolute path.
+    """
+    data_folder = apconfig.getBaseFolder() + apconfig.getDataFolder()
+
+    names = set()
+    for pattern in patterns:
+        if os.path.isabs(pattern):
+            names.update(glob.glob(pattern))
+        else:
+            names.update(os.path.relpath(filename, data_folder) for filename
+                         in glob.glob(os.path.join(data_folder, pattern)))
+
+    names = list(names)
+    names += ["barabasi_albert_n{}_m{}".format(n, SYNTHETIC_M)
+              for n in synthetic_sizes]
+
+    return sorted(names, key=lambda name: load(name).number_of_nodes())
+
+
+def load(name):
+    """
+    Returns the CSRGraph of a network given by networks.
+    """
+    # An absolute name is kept by join
+    filename = os.path.join(apconfig.getBaseFolder() + apconfig.getDataFolder(),
+                            name)
+    if os.path.exists(filename):
+        return graphStore.load(filename)
+
+    match = SYNTHETIC_NAME.match(name)
+    if match is None:
+        raise ValueError("{} is neither a network file nor the name of a "
+                         "synthetic network".format(filename))
+
+    n, m = int(match.group(1)), int(match.group(2))
+    random_state = np.random.RandomState(
+        randomNetworksGenerator.network_seed(SEED, name))
+    sources, targets = randomNetworksGenerator.barabasi_albert(
+        n, m, random_state)
+
+    return CSRGraph.from_edges(range(n), sources, targets, name)
+
+
+def measure(job):
+    """
+    Runs an analysis on a network, in a process of its own (see run). The
+    time to build the graph it receives is not measured.
+
+    Returns
+    -----------
+    A dictionary with the measures, or {"error": error} if it failed
+    """
+    name, case = job
+    graph = load(name)
+    build, analysis = analyses()[case]
+    g = build(graph, os.path.basename(name).split(".", 1)[0])
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+    start = time.time()
+    try:
+        r = analysis(g)
+    except Exception as error:
+        return {"error": repr(error)}
+    seconds = time.time() - start
+
+    steps = max(graph.number_of_nodes() - 2, 1)
+    return {
+        "seconds": seconds,
+        "seconds_per_step": seconds / steps,
+        "steps": steps,
+        "r": r
+    }
+
+
+def run(names, cases=None, max_seconds=MAX_SECONDS):
+    """
+    Measures every analysis on every network, one after another.
+
+    Returns
+    -----------
+    A dictionary {network: {"nodes", "edges", "analyses": {case: measures}}}
+    """
+    if cases is None:
+        cases = sorted(analyses().keys())
+
+    context = mp.get_context("spawn")
+    results = {}
+    timed_out = {}
+    for name in names:
+        graph = load(name)
+        results[name] = {
+            "nodes": graph.number_of_nodes(),
+            "edges": graph.number_of_edges(),
+            "analyses": {}
+        }
+
+        for case in cases:
+            if case in timed_out:
+                measures = {"skipped": "timed out on " + timed_out[case]}
+            else:
+                pool = context.Pool(1)
+                try:
+                    measures = pool.apply_async(measure, [(name, case)]).get(
+                        max_seconds)
+                except mp.TimeoutError:
+                    measures = {"timeout": max_seconds}
+                    timed_out[case] = name
+                finally:
+                    pool.terminate()
+                    pool.join()
+
+            results[name]["analyses"][case] = measures
+            print(name, case, measures.get("seconds", measures))
+
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Returns a list with a description of every regression of the results
+    with respect to the baseline. Only the networks and analyses run in both
+    are compared.
+    """
+    regressions = []
+    for network, result in sorted(results.items()):
+        if network not in baseline:
+            continue
+
+        for case, new in sorted(result["analyses"].items()):
+            old = baseline[network]["analyses"].get(case)
+            if old is None or "seconds" not in old or "skipped" in new:
+                continue
+
+            name = "{} {}".format(network, case)
+            if "seconds" not in new:
+                regressions.append("{}: {} instead of finishing".format(
+                    name, new))
+                continue
+
+            if abs(new["r"] - old["r"]) > 1e-9:
+                regressions.append("{}: R {} instead of {}".format(
+                    name, new["r"], old["r"]))
+            if new["seconds"] > old["seconds"] * (1 + tolerance) + SLACK:
+                regressions.append("{}: {:.2f} seconds instead of {:.2f}".format(
+                    name, new["seconds"], old["seconds"]))
+
+    return regressions
+
+
+def main(args):
+    """
+    args: The results file, glob patterns of networks and optionally
+          --synthetic <n,n,...>, --cases <case,case,...> (prefixes of the
+          names of the analyses), --max-seconds <s> and --baseline <file>
+    """
+    options = {}
+    for option in ("--synthetic", "--cases", "--max-seconds", "--baseline"):
+        if option in args:
+            i = args.index(option)
+            options[option] = args[i + 1]
+            args = args[:i] + args[i + 2:]
+
+    sizes = [int(n) for n in options.get("--synthetic", "").split(",") if n]
+    cases = sorted(analyses().keys())
+    if "--cases" in options:
+        prefixes = tuple(options["--cases"].split(","))
+        cases = [case for case in cases if case.startswith(prefixes)]
+
+    results_file, patterns = args[0], args[1:]
+    results = run(networks(patterns, sizes), cases,
+                  float(options.get("--max-seconds", MAX_SECONDS)))
+    graphStore.write_atomically(results_file, lambda file: file.write(
+        json.dumps(results, indent=1, sort_keys=True).encode("utf-8")))
+
+    if "--baseline" in options:
+        with open(options["--baseline"]) as file:
+            regressions = compare(results, json.load(file))
+        if regressions:
+            print("\n".join(["REGRESSIONS:"] + regressions))
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,244 @@
+#!/usr/bin/python
+# Author: Hernán David Carvajal <carvajal.hernandavid at gmail.com>
+# Tested in python-3.4.3
+"""
+Average shortest path length of a network while its nodes are removed.
+
+The graphs analysed are unweighted, so the distances are computed with BFS
+instead of Dijkstra. The sum of the distances between the nodes of every
+connected component is kept, and removing a node only recomputes the
+component it belonged to: the other components are not touched. If the node
+removed has a single neighbor no shortest path goes through it, so one BFS
+from it is enough to update the sum of its component.
+
+The sums of large components can be estimated from a few random pivots
+instead of a BFS from every node (see PathLengths).
+"""
+
+import math
+import random
+
+import numpy as np
+
+from dimension.boxCovering.multiSourceBFS import (BLOCK_SIZE, MultiSourceBFS,
+                                                  csr_arrays)
+
+# Components with at least this number of nodes are searched from 64 nodes at
+# once (see multiSourceBFS.py) instead of one BFS per node
+BATCHED_SIZE = 32
+
+
+class PathLengths(object):
+    """
+    Sums of the distances between the nodes of each connected component of a
+    graph, updated as its nodes are removed.
+
+    The graph received can be a networkit or a networkx graph. It is only read
+    when the object is created, so removing a node from it does not change
+    this object: call remove_node for that.
+    """
+
+    def __init__(self, g, epsilon=None, z=1.96, min_pivots=10,
+                 random_state=None):
+        """
+        Parameters
+        ------------
+        g: A networkit or networkx graph
+        epsilon: If given, the average path length of each component is
+                 estimated from random pivots, adding pivots until the
+                 half-width of its confidence interval is smaller than
+                 epsilon (in hops). Exact sums are computed by default
+        z: Normal quantile of the confidence interval, 1.96 for 95%
+        min_pivots: Minimum number of pivots before checking the interval
+        random_state: A random.Random instance used to choose the pivots
+        """
+        self.epsilon = epsilon
+        self.z = z
+        self.min_pivots = min_pivots
+        self.random = random.Random() if random_state is None else random_state
+
+        self.nodes = list(g.nodes())
+        self.index = dict((node, i) for i, node in enumerate(self.nodes))
+        n = len(self.nodes)
+
+        self.neighbors = [set() for i in range(n)]
+        for u, v in g.edges():
+            if u != v:
+                self.neighbors[self.index[u]].add(self.index[v])
+                self.neighbors[self.index[v]].add(self.index[u])
+
+        self.num_nodes = n
+        # component of each node, and size and sum of distances of each one
+        self.component = [None] * n
+        self.sizes = {}
+        self.sums = {}
+        self.total = 0.0
+        # Sum over the components of their average path length
+        self.averages = 0.0
+        self._next_label = 0
+
+        for u in range(n):
+            if self.component[u] is None:
+                self._add_component(self._reachable(u))
+
+    def _bfs(self, source):
+        """
+        Returns the nodes reachable from source and the sum of their
+        distances to it.
+        """
+        distance = {source: 0}
+        frontier = [source]
+        total = 0
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for u in frontier:
+                for w in self.neighbors[u]:
+                    if w not in distance:
+                        distance[w] = depth
+                        next_frontier.append(w)
+            total += depth * len(next_frontier)
+            frontier = next_frontier
+
+        return distance, total
+
+    def _reachable(self, source):
+        return list(self._bfs(source)[0])
+
+    def _add_component(self, members):
+        label = self._next_label
+        self._next_label += 1
+
+        for u in members:
+            self.component[u] = label
+        self.sizes[label] = len(members)
+        self.sums[label] = self._component_sum(members)
+        self.total += self.sums[label]
+        self.averages += self._average(label)
+
+    def _remove_component(self, label):
+        self.averages -= self._average(label)
+        self.total -= self.sums.pop(label)
+        del self.sizes[label]
+
+    def _average(self, label):
+        size = self.sizes[label]
+        if size < 2:
+            return 0.0
+        return self.sums[label] / (size * (size - 1))
+
+    def _distance_sums(self, members, sources):
+        """
+        Yields the sum of the distances from every source to the rest of the
+        component, given by members. The searches of large components are
+        run in blocks of BLOCK_SIZE sources.
+        """
+        if len(members) < BATCHED_SIZE:
+            for u in sources:
+                yield self._bfs(u)[1]
+            return
+
+        local = dict((u, i) for i, u in enumerate(members))
+        offsets, targets = csr_arrays([[local[w] for w in self.neighbors[u]]
+                                       for u in members])
+        bfs = MultiSourceBFS(offsets, targets)
+        for start in range(0, len(sources), BLOCK_SIZE):
+            block = [local[u] for u in sources[start:start+BLOCK_SIZE]]
+            for total in bfs.run(block).sum(axis=1, dtype=np.int64).tolist():
+                yield total
+
+    def _component_sum(self, members):
+        """
+        Sum of the distances between all the ordered pairs of nodes of a
+        component. When sampling, the pivots are taken without replacement
+        and the mean distance from each one to the rest of the component is
+        averaged until the confidence interval is narrow enough; the sum is
+        then k (k - 1) times that average. If all the nodes end up being
+        pivots the sum is exact.
+        """
+        k = len(members)
+        if k < 2:
+            return 0.0
+
+        if self.epsilon is None:
+            return float(sum(self._distance_sums(members, members)))
+
+        pivots = list(members)
+        self.random.shuffle(pivots)
+
+        total = 0.0
+        squares = 0.0
+        sums = self._distance_sums(members, pivots)
+        for p, distance_sum in enumerate(sums, 1):
+            mean_distance = distance_sum / (k - 1)
+            total += mean_distance
+            squares += mean_distance ** 2
+
+            if p >= self.min_pivots and p < k:
+                mean = total / p
+                variance = max(squares / p - mean ** 2, 0.0) * p / (p - 1)
+                # Finite population correction: pivots are not repeated
+                correction = (k - p) / (k - 1)
+                if self.z * math.sqrt(variance * correction / p) <= self.epsilon:
+                    return mean * k * (k - 1)
+
+        return total * (k - 1)
+
+    def remove_node(self, node):
+        """
+        Remove a node (given by its identifier in the original graph) and
+        update the sums of the component it belonged to.
+        """
+        v = self.index[node]
+        label = self.component[v]
+        adjacent = list(self.neighbors[v])
+
+        if len(adjacent) <= 1:
+            # No shortest path between two other nodes goes through v
+            removed = 2 * self._bfs(v)[1]
+            self.averages -= self._average(label)
+            self.total -= removed
+            self.sums[label] -= removed
+            self.sizes[label] -= 1
+            if self.sizes[label] == 0:
+                del self.sums[label]
+                del self.sizes[label]
+            else:
+                self.averages += self._average(label)
+        else:
+            self._remove_component(label)
+
+        for w in adjacent:
+            self.neighbors[w].discard(v)
+        self.neighbors[v] = set()
+        self.component[v] = None
+        self.num_nodes -= 1
+
+        if len(adjacent) > 1:
+            for w in adjacent:
+                if self.component[w] == label:
+                    self._add_component(self._reachable(w))
+
+    def average_shortest_path_length(self):
+        """
+        Sum of the distances between all the connected pairs of nodes divided
+        by the number of ordered pairs of nodes, n (n - 1). This is the value
+        of robustness.average_shortest_path_length.
+        """
+        n = self.num_nodes
+        if n < 2:
+            return 0.0
+
+        return self.total / (n * (n - 1))
+
+    def average_component_path_length(self):
+        """
+        Mean over the connected components of their average shortest path
+        length (0 for isolated nodes). This is the value used by
+        robustness2.robustness_analysis_apl.
+        """
+        if not self.sizes:
+            return 0.0
+
+        return self.averages / len(self.sizes)
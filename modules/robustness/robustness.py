@@ -4,6 +4,7 @@
 
 
 import operator
+import multiprocessing as mp
 import random as rnd
 import networkit as nk
 import pylab
@@ -11,6 +12,9 @@ import matplotlib
 import numpy as np
 import time
 
+import graphStore
+from . import adaptiveAttack, pathLength, percolation
+
 centrality = {
     "Degree": nk.centrality.DegreeCentrality,
     "Closeness": nk.centrality.Closeness,
@@ -22,22 +26,12 @@ centrality = {
 
 def average_shortest_path_length(g):
     """
-    TODO - Specify that this method also works with disconnected networks but
-    i'm not sure if it does in the proper way
-
+    Sum of the distances between all the connected pairs of nodes divided by
+    the number of ordered pairs of nodes. The pairs of nodes in different
+    components count as pairs but add no distance, so the value is smaller
+    than the average over the connected pairs in disconnected networks.
     """
-    import sys
-    n = g.numberOfNodes()
-    avg = 0.0
-
-    if n == 0:
-        return 0.0
-
-    for node in g.nodes():
-        dijkstra = nk.graph.Dijkstra(g, node).run()
-        avg += sum(filter(lambda a: a != sys.float_info.max, dijkstra.getDistances()))
-
-    return avg / (n*(n-1))
+    return pathLength.PathLengths(g).average_shortest_path_length()
 
 
 def largest_component_size(g):
@@ -73,7 +67,8 @@ def remove_node(network, node):
     network.removeNode(node)
 
 
-def calculate(g, strategy="Degree", measure="component_size", sequential=True):
+def calculate(g, strategy="Degree", measure="component_size", sequential=True,
+              epsilon=None, samples=None):
     """
     This method calculates the robustness index of the network by removing the
     nodes from the network and comparing the size of the largest component in
@@ -84,6 +79,11 @@ def calculate(g, strategy="Degree", measure="component_size", sequential=True):
     g:          networkx graph
     sequential: when false the ranking is updated each time a node is removed.
     strategy:   The strategy used to remove the nodes
+    epsilon:    If given, the average path length of large components is
+                estimated by sampling with this error (see pathLength.py)
+    samples:    If given, the betweenness of the simultaneous Betweenness
+                analysis is estimated from this number of pivots (see
+                adaptiveAttack.adaptive_betweenness_order)
 
     Return
     ----------
@@ -92,28 +92,80 @@ def calculate(g, strategy="Degree", measure="component_size", sequential=True):
                           (i.e. component size or avg path length) given a
                           fraction of the network removed
     robustness_index: The robustness index value
+
+    When the ranking is not updated (sequential) and the measure is the size
+    of the largest component, the removal order is known in advance and the
+    curve is computed by reverse percolation (see percolation.py).
+
+    For the strategies in adaptiveAttack.adaptive_orders (Degree, and
+    Betweenness when samples is given) the order of the simultaneous analysis
+    is also computed in advance, without ranking all the nodes again after
+    each removal. The exact Betweenness is ranked again by networkit.
+
+    The average path length is updated after each removal by recomputing
+    only the component of the node removed (see pathLength.py).
     """
     vertices_removed = []
     comparative_measure_values = []
 
-    base_value = base_values[measure](g)
     n = len(g.nodes())
     r = 0.0
 
-    rank = ranking(g, strategy)
+    # The exact betweenness is ranked again by networkit after each removal,
+    # which runs in C++ and is faster than the order of adaptiveAttack
+    adaptive_order = strategy in adaptiveAttack.adaptive_orders and not (
+        strategy == "Betweenness" and samples is None)
+
+    fixed_order = sequential
+    if not sequential and adaptive_order:
+        if strategy == "Betweenness":
+            rank = adaptiveAttack.adaptive_betweenness_order(g, max(n-2, 0),
+                                                             samples)
+        else:
+            rank = adaptiveAttack.adaptive_orders[strategy](g, max(n-2, 0))
+        fixed_order = True
+    else:
+        rank = ranking(g, strategy)
+
+    if measure == "component" and fixed_order:
+        sizes = percolation.largest_component_sizes(g, rank[:max(n-2, 0)])
+        base_value = sizes[0]
+
+        vertices_removed.append(0)
+        comparative_measure_values.append(sizes[0]/base_value)
+
+        for i in range(1, n-1):
+            r += sizes[i] / n
+            vertices_removed.append(i / n)
+            comparative_measure_values.append(sizes[i] / base_value)
+
+        return vertices_removed, comparative_measure_values, (r / n)
+
+    base_value = base_values[measure](g)
+
+    path_lengths = None
+    if measure == "path_length":
+        path_lengths = pathLength.PathLengths(g, epsilon)
+        comparative_measure = path_lengths.average_shortest_path_length
+    else:
+        comparative_measure = lambda: comparative_measures[measure](g)
+
     vertices_removed.append(0)
-    comparative_measure_values.append(comparative_measures[measure](g)/base_value)
+    comparative_measure_values.append(comparative_measure()/base_value)
 
     for i in range(1, n-1):
-        remove_node(g, rank.pop(0))
-        comparative_value = comparative_measures[measure](g)
+        node = rank.pop(0)
+        remove_node(g, node)
+        if path_lengths is not None:
+            path_lengths.remove_node(node)
+        comparative_value = comparative_measure()
         r += comparative_value / n
 
         # print("vr: {}, cs: {}".format(i/n, largest_component_size(g)/n))
         vertices_removed.append(i / n)
         comparative_measure_values.append(comparative_value / base_value)
 
-        if not sequential:
+        if not fixed_order:
             rank = ranking(g, strategy)
 
     return vertices_removed, comparative_measure_values, (r / n)
@@ -148,14 +200,108 @@ def ranking(g, measure="Degree", reverse=False):
     return [x[0] for x in results]
 
 
-def plot_robustness_analysis(g, debug=True):
+# Relative cost of ranking the nodes once with each strategy. It is only used
+# to start the slowest analyses first
+ranking_costs = {
+    "Betweenness": 4,
+    "Closeness": 3,
+    "Eigenvector": 2,
+    "Degree": 1,
+    "Random": 0
+}
+
+# Graph analysed by the current worker process
+_worker = {}
+
+
+def _init_worker(upper_node_id, nodes, edges, samples):
+    """
+    Build the graph once in each worker. Every analysis works on a copy.
+    """
+    g = nk.Graph(upper_node_id)
+    for u, v in edges:
+        g.addEdge(u, v)
+    for u in set(range(upper_node_id)).difference(nodes):
+        g.removeNode(u)
+
+    rnd.seed()
+    _worker["graph"] = g
+    _worker["samples"] = samples
+
+
+def _run_analysis(analysis):
+    name, sequential, strategy = analysis
+    return analysis, calculate(nk.Graph(_worker["graph"]), strategy, name,
+                               sequential, samples=_worker["samples"])
+
+
+def _expected_cost(analysis):
+    name, sequential, strategy = analysis
+    cost = ranking_costs[strategy]
+
+    if not sequential:
+        # The ranking is updated after each removal
+        cost *= 10
+    if name == "path_length":
+        cost += 5
+
+    return cost
+
+
+def run_robustness_analyses(g, workers=None, samples=None):
+    """
+    Run the analyses of every strategy, measure and mode (sequential or
+    simultaneous) on a pool of processes. The graph is sent once to each
+    worker, and the analyses expected to take longer are started first so
+    the last ones to finish are short.
+
+    Params
+    ---------
+    g:       Networkit graph. It is not modified
+    workers: Number of processes. All the available cores are used by default
+    samples: Number of pivots of the simultaneous Betweenness analyses (see
+             calculate). The exact betweenness is used by default
+
+    Returns
+    ---------
+    A dictionary (measure, sequential, strategy) -> result of calculate
+    """
+    analyses = [(name, sequential_analysis, strategy)
+                for name in comparative_measures.keys()
+                for sequential_analysis in [True, False]
+                for strategy in centrality.keys()]
+    analyses.sort(key=_expected_cost, reverse=True)
+
+    nodes = g.nodes()
+    upper_node_id = max(nodes) + 1 if nodes else 0
+
+    results = {}
+    pool = mp.Pool(workers, initializer=_init_worker,
+                   initargs=(upper_node_id, nodes, g.edges(), samples))
+    try:
+        for analysis, result in pool.imap_unordered(_run_analysis, analyses):
+            results[analysis] = result
+    finally:
+        pool.close()
+        pool.join()
+
+    return results
+
+
+def plot_robustness_analysis(g, debug=True, workers=None, samples=None):
     """
-    Compute the robustness analysis on a network and plot the results
+    Compute the robustness analysis on a network and plot the results. The
+    analyses are run in parallel (see run_robustness_analyses) and plotted
+    in the same order as they would be computed one after another.
 
     Params
     ---------
     g: Networkit graph
+    workers: Number of processes. All the available cores are used by default
+    samples: Number of pivots of the simultaneous Betweenness analyses. How
+             the betweenness was computed is written in its label
     """
+    results = run_robustness_analyses(g, workers, samples)
 
     params = {
         'lines.markersize' : 2,
@@ -204,12 +350,17 @@ def plot_robustness_analysis(g, debug=True):
             print(method_name)#, file=file_results)
 
             for strategy in centrality.keys():
-                vertices_removed, component_size, r_index = calculate(nk.Graph(g), strategy, name, sequential_analysis)
-                label = "%s \n($R = %4.3f$)" % (strategy, r_index)
+                vertices_removed, component_size, r_index = results[(name, sequential_analysis, strategy)]
+                # How the simultaneous betweenness was computed
+                accuracy = ""
+                if strategy == "Betweenness" and not sequential_analysis:
+                    accuracy = " " + adaptiveAttack.betweenness_accuracy(
+                        g.numberOfNodes(), samples)
+                label = "%s%s \n($R = %4.3f$)" % (strategy, accuracy, r_index)
                 analysis_plot.plot(vertices_removed, component_size, label=label, c=next(color), alpha=0.6, linewidth=2.0)
 
                 if debug:
-                    print("{} {}".format(strategy, r_index))#, file=file_results)
+                    print("{}{} {}".format(strategy, accuracy, r_index))#, file=file_results)
 
                 lgd = analysis_plot.legend(loc="center left", shadow=False, bbox_to_anchor=(1.0, 0.5))
             index += 1
@@ -224,7 +375,7 @@ def plot_robustness_analysis(g, debug=True):
 
 if __name__ == "__main__":
 # def test():
-    graph = nk.readGraph("football.gml", nk.Format.GML)
+    graph = graphStore.load_networkit("football.gml")
 
     # erg = nk.generators.ErdosRenyiGenerator(2, 0.3, False)
     # graph = erg.generate()
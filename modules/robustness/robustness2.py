@@ -18,9 +18,9 @@ DESCRIPTION
       Code tested on Python 3.4
 
 PARAMETERS
-       This script should be called as:
+       This script should be called from the modules folder as:
 
-       > robustness.py infile outfile.png apl recalculate
+       > python -m robustness.robustness2 infile outfile.png apl recalculate [samples]
 
        infile:       The gml file where the network is stored
        outfile:      The name of the file where the data will be saved. The png
@@ -30,9 +30,13 @@ PARAMETERS
                      component is used.
        recalculate:  Indicate if the centrality measures should be updated
                      each time a node is removed.
+       samples:      Optional. Number of pivots used to estimate the
+                     betweenness when it is recalculated. The exact
+                     betweenness is used if it is not given. The error bound
+                     is written in the header of the csv file.
 
        example:
-            > python robustness2.py karate.gml karate.png apl False
+            > python -m robustness.robustness2 karate.gml karate.png apl False
 
 AUTHOR
       Hernán D. Carvajal
@@ -44,25 +48,67 @@ import pylab
 import random
 import sys
 
+import graphStore
+from . import adaptiveAttack, pathLength, percolation
+
+# Classifiers whose recalculated removal order can be computed in advance.
+# They receive the graph, the number of nodes and the betweenness samples
+adaptive_orders = {
+    nx.degree_centrality:
+        lambda g, count, samples: adaptiveAttack.adaptive_degree_order(g, count),
+    nx.betweenness_centrality: adaptiveAttack.adaptive_betweenness_order
+}
+
+
+def removal_order(g, node_classifier, recalculate, count, samples=None):
+    """
+    Returns the first count nodes in the order they are removed, or None if
+    the order depends on recalculating the classifier after each removal.
+    samples is the number of pivots used to estimate the betweenness when it
+    is recalculated (None for the exact betweenness).
+    """
+    if recalculate:
+        if node_classifier in adaptive_orders:
+            return adaptive_orders[node_classifier](g, count, samples)
+        return None
 
-def robustness_analysis(g, node_classifier, recalculate=False):
     m = node_classifier(g)
     l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
+    return [node for node, value in l[:count]]
+
+
+def robustness_analysis(g, node_classifier, recalculate=False, samples=None):
     x = []
     y = []
 
+    n = len(g.nodes())
+    order = removal_order(g, node_classifier, recalculate, max(n-2, 0), samples)
+
+    if order is not None:
+        # The removal order is fixed: compute the whole curve by adding the
+        # nodes back in reverse order (see percolation.py)
+        sizes = percolation.largest_component_sizes(g, order)
+
+        x.append(0)
+        y.append(sizes[0] * 1. / n)
+        r = 0.0
+        for i in range(1, n-1):
+            x.append(i * 1. / n)
+            r += sizes[i] * 1. / n
+            y.append(sizes[i] * 1. / n)
+        return x, y, r / n
+
+    m = node_classifier(g)
+    l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
     largest_component = max(nx.connected_components(g), key=len)
 
-    n = len(g.nodes())
     x.append(0)
     y.append(len(largest_component) * 1. / n)
     r = 0.0
     for i in range(1, n-1):
         g.remove_node(l.pop(0)[0])
-        if recalculate:
-            m = node_classifier(g)
-            l = sorted(m.items(), key=operator.itemgetter(1),
-                       reverse=True)
+        m = node_classifier(g)
+        l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
         largest_component = max(nx.connected_components(g), key=len)
         x.append(i * 1. / n)
         r += len(largest_component) * 1. / n
@@ -70,42 +116,42 @@ def robustness_analysis(g, node_classifier, recalculate=False):
     return x, y, r / n
 
 
-def robustness_analysis_apl(g, node_classifier, recalculate=False):
-    m = node_classifier(g)
-    l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
+def robustness_analysis_apl(g, node_classifier, recalculate=False,
+                            samples=None, epsilon=None):
     x = []
     y = []
 
-    average_path_length = 0.0
-    number_of_components = 0
     n = len(g.nodes())
 
-    for sg in nx.connected_component_subgraphs(g):
-        average_path_length += nx.average_shortest_path_length(sg)
-        number_of_components += 1
+    order = removal_order(g, node_classifier, recalculate, max(n-2, 0), samples)
+    if order is None:
+        m = node_classifier(g)
+        order = [node for node, value in
+                 sorted(m.items(), key=operator.itemgetter(1), reverse=True)]
+    else:
+        recalculate = False
 
-    average_path_length = average_path_length / number_of_components
+    # Only the component of each node removed is computed again, see
+    # pathLength.py. epsilon enables the sampled estimation of large ones
+    path_lengths = pathLength.PathLengths(g, epsilon)
+
+    average_path_length = path_lengths.average_component_path_length()
     initial_apl = average_path_length
 
     x.append(0)
     y.append(average_path_length * 1. / initial_apl)
     r = 0.0
     for i in range(1, n-1):
-        g.remove_node(l.pop(0)[0])
+        node = order.pop(0)
+        g.remove_node(node)
+        path_lengths.remove_node(node)
         if recalculate:
             m = node_classifier(g)
-            l = sorted(m.items(), key=operator.itemgetter(1),
-                       reverse=True)
-
-        average_path_length = 0.0
-        number_of_components = 0
+            order = [node for node, value in
+                     sorted(m.items(), key=operator.itemgetter(1),
+                            reverse=True)]
 
-        for sg in nx.connected_component_subgraphs(g):
-            if len(sg.nodes()) > 1:
-                average_path_length += nx.average_shortest_path_length(sg)
-            number_of_components += 1
-
-        average_path_length = average_path_length / number_of_components
+        average_path_length = path_lengths.average_component_path_length()
 
         x.append(i * 1. / n)
         r += average_path_length * 1. / initial_apl
@@ -126,8 +172,8 @@ def main(argv):
     Entry point.
     """
 
-    if len(argv) != 4:
-        print("python robustness.py <infile> <outfile> <measure>[component ¡ apl] <recalculate>")
+    if len(argv) not in (4, 5):
+        print("python robustness.py <infile> <outfile> <measure>[component ¡ apl] <recalculate> [samples]")
         sys.exit(0)
 
     infile = argv[0]
@@ -145,9 +191,12 @@ def main(argv):
     else:
         recalculate = False
 
-    g = nx.read_gml(infile).to_undirected()
+    samples = int(argv[4]) if len(argv) == 5 else None
+
+    g = graphStore.load_networkx(infile)
     x1, y1, vd = analysis_method(g.copy(), nx.degree_centrality, recalculate)
-    x2, y2, vb = analysis_method(g.copy(), nx.betweenness_centrality, recalculate)
+    x2, y2, vb = analysis_method(g.copy(), nx.betweenness_centrality,
+                                 recalculate, samples)
     x3, y3, vc = analysis_method(g.copy(), nx.closeness_centrality, recalculate)
     x5, y5, vr = analysis_method(g.copy(), random_ranking)
 
@@ -179,7 +228,12 @@ def main(argv):
 
     matrix = np.matrix([x1, y1, y2, y3, y5])
     filename = outfile.rsplit(".", 1)[0] + ".csv"
-    header = " , degree, betweeness, closeness, random"
+    # Record how the recalculated betweenness was computed
+    betweenness = "betweeness"
+    if recalculate:
+        betweenness += " ({})".format(
+            adaptiveAttack.betweenness_accuracy(len(g), samples))
+    header = " , degree, {}, closeness, random".format(betweenness)
     separator = ", "
 
     np.savetxt(filename, matrix.transpose(), fmt="%2.5f", delimiter=separator,
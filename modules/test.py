@@ -1,10 +1,11 @@
 import time
 import os
 import glob
-import networkit as nk
 import dimension.fractalDimension as fd
 import robustness.robustness as robustness
+from dimension.boxCovering import covering
 from config import apconfig
+import graphStore
 
 real_networks_folder = apconfig.get_real_networks_full_path()
 random_networks_folder = apconfig.get_random_networks_full_path()
@@ -18,21 +19,36 @@ networks = {
     "barabasi": real_networks_folder + 'barabasi_n300_m8.gml'
 }
 
+
+def box_covering(graph, max_box_length=6):
+    """
+    Number of boxes found by every box covering method for the box lengths
+    from 1 to max_box_length.
+    """
+    return dict((method, [covering.cover_number_of_boxes(graph, method, lb=lb)
+                          for lb in range(1, max_box_length+1)])
+                for method in sorted(covering.methods.keys()))
+
+
 methods = {
     "fractalDimension": fd.fractal_dimension,
-    # "robustness": robustness.plot_robustness_analysis
+    # "robustness": robustness.plot_robustness_analysis,
+    # "boxCovering": box_covering
 }
 
+# The methods above receive the networkit graph of the file, except these
+# ones. The graph is loaded once (see graphStore.py), before the iterations
+graph_loaders = {
+    "boxCovering": graphStore.load
+}
 
-def test(filename, measure, iterations=1, results_file=None):
-    g = nk.readGraph(filename, nk.Format.GML)
-    g.setName(os.path.basename(filename).split(".", 1)[0])
 
-    if g.isDirected():
-        g = g.toUndirected()
+def test(filename, measure, iterations=1, results_file=None,
+         load=graphStore.load_networkit):
+    g = load(filename)
 
     for i in range(iterations):
-        print(measure(nk.nk2nx(g)), file=results_file)
+        print(measure(g), file=results_file)
 
 
 def test_real_networks():
@@ -54,7 +70,8 @@ def test_real_networks():
             results_file_name = network_name + "_" + method_name + "_" + current_time + ".results"
 
             with open(results_file_name, 'a') as file:
-                test(network, method, results_file=file)
+                test(network, method, results_file=file,
+                     load=graph_loaders.get(method_name, graphStore.load_networkit))
 
         os.chdir(current_folder)
 
@@ -78,7 +95,8 @@ def test_random_networks():
             results_file_name = network_name + "_" + method_name + "_" + current_time + ".results"
 
             with open(results_file_name, 'a') as file:
-                test(network, method, results_file=file)
+                test(network, method, results_file=file,
+                     load=graph_loaders.get(method_name, graphStore.load_networkit))
 
     os.chdir(current_folder)
 
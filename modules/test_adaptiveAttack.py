@@ -0,0 +1,59 @@
+"""
+Checks the removal orders of adaptiveAttack against the original adaptive
+attacks, which compute the centrality of every node again after each
+removal and remove the first node of the sorted ranking.
+
+    python -m pytest test_adaptiveAttack.py
+"""
+
+import operator
+
+import networkx as nx
+
+from robustness import adaptiveAttack
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.les_miserables_graph(),
+        nx.barabasi_albert_graph(60, 2, seed=1),
+        # Disconnected
+        nx.gnp_random_graph(60, 0.04, seed=2)
+    ]
+
+
+def recalculated_order(g, node_classifier, count):
+    g = g.copy()
+    order = []
+    for i in range(count):
+        m = node_classifier(g)
+        l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
+        order.append(l[0][0])
+        g.remove_node(l[0][0])
+    return order
+
+
+def test_adaptive_degree_order():
+    for g in graphs():
+        count = g.number_of_nodes() - 2
+        assert (adaptiveAttack.adaptive_degree_order(g, count) ==
+                recalculated_order(g, nx.degree_centrality, count))
+
+
+def test_adaptive_betweenness_order():
+    for g in graphs():
+        count = g.number_of_nodes() - 2
+        expected = recalculated_order(g, nx.betweenness_centrality, count)
+        assert adaptiveAttack.adaptive_betweenness_order(g, count) == expected
+
+        # Components up to the number of samples are computed exactly
+        assert adaptiveAttack.adaptive_betweenness_order(
+            g, count, samples=g.number_of_nodes()) == expected
+
+
+def test_betweenness_error_is_inverse_of_samples():
+    for epsilon in (0.01, 0.05, 0.1):
+        samples = adaptiveAttack.betweenness_samples(1000, epsilon)
+        assert adaptiveAttack.betweenness_error(1000, samples) <= epsilon
+        assert adaptiveAttack.betweenness_error(1000, samples - 1) > epsilon
@@ -0,0 +1,84 @@
+"""
+Checks that the batch runner writes, for every network and seed, the result
+of running the measure on the network directly, and that a new run only
+repeats the jobs that failed.
+
+    python -m pytest test_batchRunner.py
+"""
+
+import os
+
+import networkx as nx
+
+import batchRunner
+import graphStore
+import test
+from config import apconfig
+
+
+def number_of_edges(graph):
+    if graph.number_of_nodes() > 100:
+        raise ValueError("Too large")
+    return graph.number_of_edges()
+
+
+def use_folders(monkeypatch, folder):
+    monkeypatch.setattr(apconfig, "getBaseFolder", lambda: str(folder) + "/")
+    monkeypatch.setattr(apconfig, "getDataFolder", lambda: "data/")
+    monkeypatch.setattr(apconfig, "get_results_folder_path",
+                        lambda: str(folder / "results"))
+    monkeypatch.setattr(apconfig, "cache_enabled", lambda: False)
+    monkeypatch.setitem(test.methods, "numberOfEdges", number_of_edges)
+    monkeypatch.setitem(test.graph_loaders, "numberOfEdges", graphStore.load)
+
+
+def write_networks(folder):
+    os.makedirs(str(folder / "data" / "randomNetworks"))
+    networks = {
+        "randomNetworks/small.gml": nx.gnp_random_graph(30, 0.1, seed=1),
+        "randomNetworks/medium.gml": nx.gnp_random_graph(80, 0.05, seed=2),
+        "randomNetworks/large.gml": nx.gnp_random_graph(150, 0.02, seed=3)
+    }
+    for key, g in networks.items():
+        nx.write_gml(g, str(folder / "data" / key))
+
+    return networks
+
+
+def test_results_of_the_measure(monkeypatch, tmp_path):
+    use_folders(monkeypatch, tmp_path)
+    networks = write_networks(tmp_path)
+
+    failed = batchRunner.run(["randomNetworks/*.gml"], ["numberOfEdges"],
+                             seeds=(1, 2), workers=2)
+    assert sorted(batchRunner.job_key(*job) for job, error in failed) == [
+        "randomNetworks/large.gml/numberOfEdges/1",
+        "randomNetworks/large.gml/numberOfEdges/2"]
+
+    manifest = batchRunner.read_manifest()
+    assert len(manifest) == 4
+    for key, g in networks.items():
+        network = str(tmp_path / "data" / key)
+        for seed in (1, 2):
+            job = (network, "numberOfEdges", seed)
+            if g.number_of_nodes() > 100:
+                assert batchRunner.job_key(*job) not in manifest
+                continue
+
+            description = manifest[batchRunner.job_key(*job)]
+            assert description["results"] == batchRunner.results_file(*job)
+            with open(description["results"]) as file:
+                assert file.read() == "{}\n".format(g.number_of_edges())
+
+
+def test_new_run_repeats_the_failed_jobs(monkeypatch, tmp_path, capsys):
+    use_folders(monkeypatch, tmp_path)
+    write_networks(tmp_path)
+    batchRunner.run(["randomNetworks/*.gml"], ["numberOfEdges"], workers=2)
+    capsys.readouterr()
+
+    failed = batchRunner.run(["randomNetworks/*.gml"], ["numberOfEdges"],
+                             workers=2)
+    assert "3 jobs, 2 already finished" in capsys.readouterr().out
+    assert [batchRunner.job_key(*job) for job, error in failed] == [
+        "randomNetworks/large.gml/numberOfEdges/0"]
@@ -0,0 +1,88 @@
+"""
+Checks the running statistics used by the early-stopping fractal dimension
+against numpy, and that the standard error of the dimension is the spread
+of the dimensions fitted to independent batches of box coverings.
+
+    python -m pytest test_boxCountStatistics.py
+"""
+
+import networkx as nx
+import numpy as np
+
+from dimension.boxCountStatistics import RunningBoxCounts
+from dimension.boxCovering import distanceMatrix
+from dimension.boxCovering.bitsetGreedyColoring import number_of_boxes
+from dimension.boxCovering.csrGraph import CSRGraph
+from dimension.boxCovering.multiSourceBFS import distance_rows
+from dimension.fractalDimension import fit_dimension
+
+
+def box_counts(g, coverings, seed):
+    graph = CSRGraph.from_networkx(g)
+    distances = distance_rows(graph.offsets, graph.targets)
+    diameter = distanceMatrix.diameter(distances)
+    distances = distanceMatrix.narrow_distances(distances, diameter)
+    random_state = np.random.RandomState(seed)
+
+    return np.array([number_of_boxes(None, diameter, distances, random_state)
+                     for i in range(coverings)])
+
+
+def test_statistics_match_numpy():
+    rows = box_counts(nx.karate_club_graph(), 50, 1)
+    statistics = RunningBoxCounts(rows.shape[1])
+    statistics.add(rows[:20])
+    other = RunningBoxCounts(rows.shape[1])
+    for row in rows[20:]:
+        other.add(row)
+    statistics.merge(other)
+
+    assert statistics.count == 50
+    assert np.allclose(statistics.mean(), rows.mean(axis=0))
+    assert np.allclose(statistics.covariance(), np.cov(rows.T))
+    assert np.allclose(statistics.standard_error(),
+                       rows.std(axis=0, ddof=1) / np.sqrt(50))
+
+
+def test_dimension_standard_error_is_the_delta_method():
+    rows = box_counts(nx.les_miserables_graph(), 50, 2)
+    statistics = RunningBoxCounts(rows.shape[1])
+    statistics.add(rows)
+
+    # Gradient of the slope with respect to the mean counts
+    mean = statistics.mean()
+    gradient = np.empty(len(mean))
+    for i in range(len(mean)):
+        step = np.zeros(len(mean))
+        step[i] = 1e-6 * mean[i]
+        gradient[i] = (fit_dimension(mean - step) -
+                       fit_dimension(mean + step)) / (2 * step[i])
+    expected = np.sqrt(gradient.dot(np.cov(rows.T)).dot(gradient) / 50)
+    assert np.isclose(statistics.dimension_standard_error(), expected)
+
+
+def test_dimension_standard_error_is_the_spread_of_batches():
+    rows = box_counts(nx.karate_club_graph(), 1200, 3)
+    dimensions = []
+    errors = []
+    for batch in rows.reshape(40, 30, -1):
+        statistics = RunningBoxCounts(rows.shape[1])
+        statistics.add(batch)
+        dimensions.append(fit_dimension(statistics.mean()))
+        errors.append(statistics.dimension_standard_error())
+
+    assert 0.7 < np.std(dimensions, ddof=1) / np.mean(errors) < 1.4
+
+
+def test_converged():
+    statistics = RunningBoxCounts(3)
+    statistics.add([10, 5, 2])
+    assert not statistics.converged(1.0)
+    statistics.add([10, 5, 2])
+    assert statistics.converged(1e-9, 1e-9)
+
+    statistics.add([12, 3, 1])
+    assert not statistics.converged(1e-3)
+    error = 1.96 * statistics.dimension_standard_error()
+    assert statistics.converged(error * 1.01)
+    assert not statistics.converged(error * 1.01, box_tolerance=0.01)
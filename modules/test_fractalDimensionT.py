@@ -0,0 +1,80 @@
+"""
+Checks that the colorings run by the workers of fractalDimensionT give the
+same box counts as running them one after another in a single process, and
+that they follow the rule of the original greedy coloring
+(dimension/boxCovering/test.py).
+
+    python -m pytest test_fractalDimensionT.py
+"""
+
+import os
+
+import networkx as nx
+import numpy as np
+
+from dimension import fractalDimensionT
+from dimension.boxCountStatistics import RunningBoxCounts
+from dimension.boxCovering import distanceMatrix
+from dimension.boxCovering.bitsetGreedyColoring import (greedy_coloring,
+                                                        number_of_boxes)
+from dimension.boxCovering.csrGraph import CSRGraph
+from dimension.boxCovering.multiSourceBFS import distance_rows
+from dimension.boxCovering.test import choose_color
+
+
+def _distances(g):
+    graph = CSRGraph.from_networkx(g)
+    distances = distance_rows(graph.offsets, graph.targets)
+    return distanceMatrix.narrow_distances(distances,
+                                           distanceMatrix.diameter(distances))
+
+
+def test_chunks_match_serial_colorings():
+    distances = _distances(nx.karate_club_graph())
+    diameter = distanceMatrix.diameter(distances)
+    seed = 7
+
+    shared_distances = distanceMatrix.dump(distances)
+    try:
+        fractalDimensionT._init_worker(shared_distances, diameter, seed, True)
+        results = [fractalDimensionT._run_chunk(chunk)
+                   for chunk in fractalDimensionT.chunks(60, 25)]
+    finally:
+        os.remove(shared_distances[0])
+
+    statistics = RunningBoxCounts(diameter+1)
+    rows = []
+    for index, chunk_statistics, chunk_rows in results:
+        random_state = np.random.RandomState([seed, index])
+        expected = [number_of_boxes(None, diameter, distances, random_state)
+                    for i in range(len(chunk_rows))]
+        assert chunk_rows.tolist() == expected
+
+        statistics.merge(chunk_statistics)
+        rows.extend(expected)
+
+    assert statistics.count == 60
+    assert np.allclose(statistics.mean(), np.mean(rows, axis=0))
+
+
+def test_coloring_follows_original_rule():
+    distances = _distances(nx.les_miserables_graph())
+    diameter = distanceMatrix.diameter(distances)
+
+    for seed in range(5):
+        order = np.random.RandomState(seed).permutation(len(distances))
+        c = greedy_coloring(None, diameter, distances,
+                            np.random.RandomState(seed))
+
+        for k, i in enumerate(order[1:], 1):
+            for lb in range(2, diameter+1):
+                previous = order[:k]
+                far = distances[i, previous] >= lb
+                not_valid_colors = set(c[previous[far], lb].tolist())
+                valid_colors = set(c[previous[~far], lb].tolist())
+
+                if valid_colors - not_valid_colors:
+                    assert c[i, lb] in valid_colors - not_valid_colors
+                else:
+                    assert c[i, lb] == choose_color(not_valid_colors,
+                                                    valid_colors)
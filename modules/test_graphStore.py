@@ -0,0 +1,79 @@
+"""
+Checks that the graphs loaded from the cache of graphStore are the ones
+parsed from the files, that the node ids 0..n-1 stay a range, and that a
+file changed after it was cached is parsed again.
+
+    python -m pytest test_graphStore.py
+"""
+
+import networkx as nx
+
+import graphStore
+from config import apconfig
+
+
+GML = """graph [
+  node [ id 10 label "a" ]
+  node [ id 30 label "b" ]
+  node [ id 20 label "c" ]
+  node [ id 40 label "d" ]
+  edge [ source 10 target 30 ]
+  edge [ source 30 target 20 ]
+  edge [ source 20 target 10 ]
+  edge [ source 40 target 10 ]
+]
+"""
+
+
+def edge_set(G):
+    return set(frozenset(edge) for edge in G.edges())
+
+
+def use_cache_folder(monkeypatch, folder):
+    monkeypatch.setattr(apconfig, "get_cache_folder_path", lambda: str(folder))
+    monkeypatch.setattr(apconfig, "cache_enabled", lambda: True)
+
+
+def test_cached_graph_is_the_parsed_one(monkeypatch, tmp_path):
+    use_cache_folder(monkeypatch, tmp_path / "cache")
+    g = nx.barabasi_albert_graph(200, 3, seed=1)
+    filename = str(tmp_path / "ba.gml")
+    nx.write_gml(g, filename)
+
+    assert graphStore.cached(filename) is None
+    parsed = graphStore.load(filename)
+    graph = graphStore.cached(filename)
+    assert graph is not None
+    assert isinstance(graph.nodes, range)
+    assert graph.offsets.tolist() == parsed.offsets.tolist()
+    assert graph.targets.tolist() == parsed.targets.tolist()
+
+    h = graphStore.load_networkx(filename)
+    assert h.name == "ba"
+    assert list(h.nodes()) == list(g.nodes())
+    assert edge_set(h) == edge_set(g)
+
+
+def test_node_ids_of_the_file(monkeypatch, tmp_path):
+    use_cache_folder(monkeypatch, tmp_path / "cache")
+    filename = str(tmp_path / "ids.gml")
+    with open(filename, "w") as file:
+        file.write(GML)
+
+    graphStore.load(filename)
+    graph = graphStore.cached(filename)
+    assert list(graph.nodes) == [10, 30, 20, 40]
+    assert edge_set(graph.to_networkx()) == edge_set(
+        nx.read_gml(filename, label="id"))
+
+
+def test_changed_file_is_parsed_again(monkeypatch, tmp_path):
+    use_cache_folder(monkeypatch, tmp_path / "cache")
+    filename = str(tmp_path / "path.gml")
+    nx.write_gml(nx.path_graph(5), filename)
+    assert graphStore.load(filename).number_of_edges() == 4
+
+    nx.write_gml(nx.path_graph(12), filename)
+    assert graphStore.cached(filename) is None
+    assert graphStore.load(filename).number_of_edges() == 11
+    assert graphStore.cached(filename).number_of_edges() == 11
@@ -0,0 +1,44 @@
+"""
+Checks that IncrementalFractalDimension keeps, after every removal, the
+distances of the graph left and greedy colorings of it, as if they were
+computed from scratch.
+
+    python -m pytest test_incrementalDimension.py
+"""
+
+import networkx as nx
+import numpy as np
+
+from dimension.incrementalDimension import IncrementalFractalDimension
+
+
+def test_removals_keep_distances_and_colorings():
+    g = nx.les_miserables_graph()
+    tracker = IncrementalFractalDimension(g, iterations=10,
+                                          random_state=np.random.RandomState(3))
+    order = sorted(g.nodes(), key=g.degree, reverse=True)[:15]
+
+    for node in order:
+        g.remove_node(node)
+        tracker.remove_node(node)
+
+        alive = np.flatnonzero(tracker.alive)
+        assert [tracker.nodes[i] for i in alive] == list(g.nodes())
+
+        lengths = dict(nx.all_pairs_shortest_path_length(g))
+        for i in alive:
+            for j in alive:
+                expected = lengths[tracker.nodes[i]].get(tracker.nodes[j],
+                                                         tracker.unreachable)
+                assert tracker.distances[i, j] == expected
+
+        # No box holds two nodes at distance lb or more
+        distances = tracker.distances[np.ix_(alive, alive)]
+        for k in range(tracker.iterations):
+            for column, lb in enumerate(tracker._box_lengths()):
+                colors = tracker.colors[k, alive, column]
+                same_box = colors[:, np.newaxis] == colors[np.newaxis, :]
+                assert not (same_box & (distances >= lb)).any()
+
+        fresh = tracker.fresh_number_of_boxes(np.random.RandomState(5))
+        assert len(fresh) == len(tracker.number_of_boxes())
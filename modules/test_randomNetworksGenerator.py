@@ -0,0 +1,115 @@
+"""
+Checks the sparse generators of randomNetworksGenerator (simple graphs of the
+right size, and the ring of networkx when nothing is rewired), and that the
+corpus is named and seeded like the networks of the data folder.
+
+    python -m pytest test_randomNetworksGenerator.py
+"""
+
+import glob
+import os
+
+import networkx as nx
+import numpy as np
+
+import randomNetworksGenerator as rng
+from dimension.boxCovering.networkReader import read_network
+
+RANDOM_NETWORKS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..", "data", "randomNetworks")
+
+
+def edge_keys(n, sources, targets):
+    return np.minimum(sources, targets) * n + np.maximum(sources, targets)
+
+
+def assert_simple(n, sources, targets):
+    assert len(sources) == len(targets)
+    assert ((0 <= sources) & (sources < n)).all()
+    assert ((0 <= targets) & (targets < n)).all()
+    assert (sources != targets).all()
+    keys = edge_keys(n, sources, targets)
+    assert len(np.unique(keys)) == len(keys)
+
+
+def test_pair_edges():
+    pairs = [(v, w) for v in range(1, 300) for w in range(v)]
+    v, w = rng._pair_edges(np.arange(len(pairs)))
+    assert list(zip(v.tolist(), w.tolist())) == pairs
+
+    # Around the first index of large nodes, where the square root rounds
+    for node in (10 ** 6, 10 ** 7 + 1, 3 * 10 ** 8):
+        first = node * (node - 1) // 2
+        v, w = rng._pair_edges(np.array([first - 1, first, first + node - 1]))
+        assert v.tolist() == [node - 1, node, node]
+        assert w.tolist() == [node - 2, 0, node - 1]
+
+
+def test_erdos_renyi_edges():
+    random_state = np.random.RandomState(1)
+    n, p = 3000, 0.002
+    sources, targets = rng.erdos_renyi_edges(n, p, random_state)
+    assert_simple(n, sources, targets)
+    assert (targets < sources).all()
+    expected = p * n * (n - 1) / 2
+    assert abs(len(sources) - expected) < 5 * np.sqrt(expected)
+
+    sources, targets = rng.erdos_renyi_edges(40, 1.0, random_state)
+    assert len(sources) == 40 * 39 // 2
+    assert_simple(40, sources, targets)
+    assert len(rng.erdos_renyi_edges(40, 0.0, random_state)[0]) == 0
+    assert len(rng.erdos_renyi_edges(1, 0.5, random_state)[0]) == 0
+
+
+def test_barabasi_albert_edges():
+    n, m = 20000, 2
+    sources, targets = rng.barabasi_albert_edges(n, m, np.random.RandomState(2))
+    assert len(sources) == (n - m) * m
+    assert sources.tolist() == [m + i // m for i in range(len(sources))]
+    assert targets[:m].tolist() == list(range(m))
+    assert ((0 <= targets) & (targets < sources)).all()
+
+    # Almost no repeated edges, and the oldest nodes get the largest degrees
+    keys = edge_keys(n, sources, targets)
+    assert len(np.unique(keys)) > 0.99 * len(keys)
+    degrees = np.bincount(np.concatenate((sources, targets)), minlength=n)
+    assert degrees[:n // 100].mean() > 3 * degrees.mean()
+    assert degrees.max() > 10 * m
+
+
+def test_watts_strogatz_edges():
+    for n, k, p in ((1000, 10, 0.2), (500, 4, 1.0), (100, 30, 0.5)):
+        sources, targets = rng.watts_strogatz_edges(n, k, p,
+                                                    np.random.RandomState(3))
+        assert len(sources) == n * (k // 2)
+        assert_simple(n, sources, targets)
+
+    sources, targets = rng.watts_strogatz_edges(50, 6, 0.0,
+                                                np.random.RandomState(3))
+    ring = nx.watts_strogatz_graph(50, 6, 0.0)
+    assert (set(edge_keys(50, sources, targets).tolist()) ==
+            set(edge_keys(50, *rng._networkx_edges(ring)).tolist()))
+
+
+def test_corpus_names_and_seeds(tmp_path):
+    grid = rng.corpus_grid()
+    names = set(name for name, model, parameters in grid)
+    assert len(names) == len(grid)
+    files = glob.glob(os.path.join(RANDOM_NETWORKS, "*.gml"))
+    assert files
+    for filename in files:
+        assert os.path.basename(filename)[:-len(".gml")] in names
+
+    network = ("erdos_renyi_n100_p01", "erdos_renyi", {"n": 100, "p": 0.01})
+    seed = rng.network_seed(622527, network[0])
+    written = []
+    for folder in ("first", "second"):
+        os.makedirs(str(tmp_path / folder))
+        name, description = rng.generate_network((network, seed,
+                                                  str(tmp_path / folder)))
+        written.append(np.load(rng.network_file(str(tmp_path / folder), name)))
+        graph = read_network(rng.network_file(str(tmp_path / folder), name))
+        # A loop keeps the last node when it is isolated
+        assert graph.number_of_nodes() == 100
+
+    assert written[0].tolist() == written[1].tolist()
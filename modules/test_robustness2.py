@@ -0,0 +1,163 @@
+"""
+Checks the curves of robustness2 against the original analyses, which
+remove the nodes from a networkx graph and compute the components (and
+their average path lengths) again after every removal.
+
+    python -m pytest test_robustness2.py
+"""
+
+import operator
+import random
+
+import networkx as nx
+
+from robustness import percolation, robustness2
+
+
+def graphs():
+    return [
+        nx.karate_club_graph(),
+        nx.les_miserables_graph(),
+        nx.barabasi_albert_graph(60, 2, seed=1),
+        # Disconnected
+        nx.gnp_random_graph(60, 0.04, seed=2)
+    ]
+
+
+def original_robustness_analysis(g, node_classifier, recalculate=False):
+    m = node_classifier(g)
+    l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
+    x = []
+    y = []
+
+    largest_component = max(nx.connected_components(g), key=len)
+
+    n = len(g.nodes())
+    x.append(0)
+    y.append(len(largest_component) * 1. / n)
+    r = 0.0
+    for i in range(1, n-1):
+        g.remove_node(l.pop(0)[0])
+        if recalculate:
+            m = node_classifier(g)
+            l = sorted(m.items(), key=operator.itemgetter(1),
+                       reverse=True)
+        largest_component = max(nx.connected_components(g), key=len)
+        x.append(i * 1. / n)
+        r += len(largest_component) * 1. / n
+        y.append(len(largest_component) * 1. / n)
+    return x, y, r / n
+
+
+def original_robustness_analysis_apl(g, node_classifier, recalculate=False):
+    m = node_classifier(g)
+    l = sorted(m.items(), key=operator.itemgetter(1), reverse=True)
+    x = []
+    y = []
+
+    average_path_length = 0.0
+    number_of_components = 0
+    n = len(g.nodes())
+
+    for c in nx.connected_components(g):
+        average_path_length += nx.average_shortest_path_length(g.subgraph(c))
+        number_of_components += 1
+
+    average_path_length = average_path_length / number_of_components
+    initial_apl = average_path_length
+
+    x.append(0)
+    y.append(average_path_length * 1. / initial_apl)
+    r = 0.0
+    for i in range(1, n-1):
+        g.remove_node(l.pop(0)[0])
+        if recalculate:
+            m = node_classifier(g)
+            l = sorted(m.items(), key=operator.itemgetter(1),
+                       reverse=True)
+
+        average_path_length = 0.0
+        number_of_components = 0
+
+        for c in nx.connected_components(g):
+            if len(c) > 1:
+                average_path_length += nx.average_shortest_path_length(
+                    g.subgraph(c))
+            number_of_components += 1
+
+        average_path_length = average_path_length / number_of_components
+
+        x.append(i * 1. / n)
+        r += average_path_length * 1. / initial_apl
+        y.append(average_path_length * 1. / initial_apl)
+    return x, y, r / n
+
+
+def assert_close_curves(new, original):
+    assert new[0] == original[0]
+    assert len(new[1]) == len(original[1])
+    for a, b in zip(new[1], original[1]):
+        assert abs(a - b) < 1e-9
+    assert abs(new[2] - original[2]) < 1e-9
+
+
+def assert_same_curves(new, original):
+    assert new[0] == original[0]
+    assert new[1] == original[1]
+    assert abs(new[2] - original[2]) < 1e-12
+
+
+def test_largest_component_sizes():
+    rnd = random.Random(3)
+    for g in graphs():
+        order = list(g.nodes())
+        rnd.shuffle(order)
+        order = order[:len(order) - 5]
+
+        sizes = percolation.largest_component_sizes(g, order)
+
+        h = g.copy()
+        expected = [len(max(nx.connected_components(h), key=len))]
+        for node in order:
+            h.remove_node(node)
+            expected.append(len(max(nx.connected_components(h), key=len)))
+        assert sizes == expected
+
+
+def test_fixed_order_curves():
+    for g in graphs():
+        for classifier in (nx.degree_centrality, nx.closeness_centrality,
+                           nx.betweenness_centrality):
+            assert_same_curves(
+                robustness2.robustness_analysis(g.copy(), classifier),
+                original_robustness_analysis(g.copy(), classifier))
+
+
+def test_recalculated_degree_curves():
+    for g in graphs():
+        assert_same_curves(
+            robustness2.robustness_analysis(g.copy(), nx.degree_centrality,
+                                            True),
+            original_robustness_analysis(g.copy(), nx.degree_centrality,
+                                         True))
+
+
+def test_recalculated_betweenness_curves():
+    for g in graphs():
+        assert_same_curves(
+            robustness2.robustness_analysis(g.copy(),
+                                            nx.betweenness_centrality, True),
+            original_robustness_analysis(g.copy(),
+                                         nx.betweenness_centrality, True))
+
+
+def test_average_path_length_curves():
+    for g in graphs():
+        for classifier, recalculate in ((nx.degree_centrality, False),
+                                        (nx.closeness_centrality, False),
+                                        (nx.degree_centrality, True)):
+            assert_close_curves(
+                robustness2.robustness_analysis_apl(g.copy(), classifier,
+                                                    recalculate),
+                original_robustness_analysis_apl(g.copy(), classifier,
+                                                 recalculate))